@@ -1,4 +1,6 @@
 HOST_VANTAGE = "https://www.alphavantage.co"
 api_key = "Vantage Api Key"
+calls_per_minute = 5
+calls_per_day = 25
 
 stripe_key = 'Stripe Api Key'
@@ -0,0 +1,136 @@
+"""
+app_api_async.py
+
+This module provides asyncio counterparts of the Alpha Vantage data classes, so independent requests can
+overlap instead of running one after another.
+
+Every method of the wrapped data class is exposed as a coroutine with the same name and arguments. The calls
+run on a thread pool the size of the client's connection pool and share its keep-alive connections and
+caches.
+
+Classes:
+    AsyncApiData: Wraps any data class instance (e.g., Methods) and exposes its methods as coroutines.
+    AsyncApiDataStocks: The asyncio counterpart of ApiStocksMethods.
+    AsyncApiDataCrypto: The asyncio counterpart of ApiCryptoMethods.
+
+Functions:
+    run_in_thread: Run any blocking call as a coroutine on the shared thread pool.
+    gather: Wait for several coroutines at once.
+    run_all: Run several coroutines concurrently from synchronous code and return their results.
+
+Example:
+    stocks = AsyncApiDataStocks()
+    df_rsi, df_monthly = run_all(stocks.rsi(symbol="IBM", interval="weekly", timep=60),
+                                 stocks.monthly_report(company="IBM"))
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from app_api_stock_methods import ApiStocksMethods
+from app_api_crypto_methods import ApiCryptoMethods
+
+MAX_WORKERS = 10
+
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="alpha-vantage")
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """
+    Run a blocking call on the shared thread pool.
+
+    Args:
+        func (callable): The blocking function to call.
+        *args: Positional arguments of the call.
+        **kwargs: Keyword arguments of the call.
+
+    Returns:
+        object: The result of the call.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def gather(*coroutines, return_exceptions=False):
+    """
+    Wait for several coroutines at once.
+
+    Args:
+        *coroutines: The coroutines to run concurrently.
+        return_exceptions (bool): Return exceptions as results instead of raising the first one
+        (default is False).
+
+    Returns:
+        list: The results in the order of the coroutines.
+    """
+    return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+
+
+def run_all(*coroutines, return_exceptions=False):
+    """
+    Run several coroutines concurrently from synchronous code, e.g. a Tk button handler.
+
+    Args:
+        *coroutines: The coroutines to run concurrently.
+        return_exceptions (bool): Return exceptions as results instead of raising the first one
+        (default is False).
+
+    Returns:
+        list: The results in the order of the coroutines.
+    """
+    return asyncio.run(gather(*coroutines, return_exceptions=return_exceptions))
+
+
+class AsyncApiData:
+    def __init__(self, sync):
+        """
+        Initialize a new instance of the AsyncApiData class.
+
+        Args:
+            sync (object): The data class instance whose methods are exposed as coroutines.
+
+        Usage:
+            async_method = AsyncApiData(Methods())
+            report = await async_method.weekly_report(company="IBM")
+        """
+        self.sync = sync
+
+    def __getattr__(self, name):
+        attribute = getattr(self.sync, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def coroutine(*args, **kwargs):
+            return await run_in_thread(attribute, *args, **kwargs)
+        return coroutine
+
+
+class AsyncApiDataStocks(AsyncApiData):
+    def __init__(self, sync=None):
+        """
+        Initialize a new instance of the AsyncApiDataStocks class.
+
+        Args:
+            sync (ApiStocksMethods, optional): The instance to wrap (default is a new ApiStocksMethods).
+
+        Usage:
+            stocks = AsyncApiDataStocks()
+            weekly = await stocks.weekly_data_company("IBM")
+        """
+        super().__init__(ApiStocksMethods() if sync is None else sync)
+
+
+class AsyncApiDataCrypto(AsyncApiData):
+    def __init__(self, sync=None):
+        """
+        Initialize a new instance of the AsyncApiDataCrypto class.
+
+        Args:
+            sync (ApiCryptoMethods, optional): The instance to wrap (default is a new ApiCryptoMethods).
+
+        Usage:
+            crypto = AsyncApiDataCrypto()
+            daily = await crypto.daily_data_crypto("BTC", "USD")
+        """
+        super().__init__(ApiCryptoMethods() if sync is None else sync)
@@ -0,0 +1,374 @@
+"""
+app_api_cache.py
+
+This module provides the response caches that sit between the app and Alpha Vantage.
+
+Classes:
+    CachedResponse: A minimal stand-in for requests.Response that is returned when data comes from a cache.
+    HistoryCache: A SQLite backed store of raw OHLCV responses with a freshness policy per time frame, and of the
+    saved state of incremental indicators.
+    ResponseCache: A process-wide in-memory LRU cache bounded by bytes, with a TTL per API function.
+
+Functions:
+    is_error_payload: Check whether a response is an Alpha Vantage error or throttling message.
+
+Usage:
+    The shared `history_cache` and `response_cache` instances are used by AlphaVantageClient, which answers
+    a request from memory first, then from disk, and only then from the network.
+
+Example:
+    response = response_cache.get(payload)
+    if response is None and history_cache.handles(payload):
+        stored = history_cache.lookup(payload)
+    print(response_cache.stats())
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+file_handler = logging.FileHandler("app.log")
+logger.addHandler(file_handler)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(funcName)s -%(message)s - Nr.%(lineno)d")
+file_handler.setFormatter(formatter)
+
+logger.setLevel(logging.INFO)
+
+CACHE_DIR = "cache"
+CACHE_FILE = "history.sqlite3"
+
+# Seconds a response stays fresh. Month scoped intraday data of a closed month never expires.
+FRESHNESS = {"TIME_SERIES_INTRADAY": 5 * 60,
+             "TIME_SERIES_DAILY": 15 * 60,
+             "TIME_SERIES_WEEKLY": 60 * 60,
+             "TIME_SERIES_MONTHLY": 6 * 60 * 60,
+             "DIGITAL_CURRENCY_DAILY": 15 * 60,
+             "DIGITAL_CURRENCY_WEEKLY": 60 * 60,
+             "DIGITAL_CURRENCY_MONTHLY": 6 * 60 * 60}
+
+# Seconds a response stays in memory, per API function.
+MEMORY_TTL = {**FRESHNESS,
+              "GLOBAL_QUOTE": 60,
+              "CURRENCY_EXCHANGE_RATE": 60,
+              "TOP_GAINERS_LOSERS": 5 * 60,
+              "MARKET_STATUS": 5 * 60,
+              "SYMBOL_SEARCH": 24 * 60 * 60}
+MEMORY_TTL_DEFAULT = 15 * 60
+MEMORY_MAX_BYTES = 256 * 1024 * 1024
+
+INTRADAY_INTERVALS = {"1min", "5min", "15min", "30min", "60min"}
+ERROR_KEYS = (b'"Note"', b'"Information"', b'"Error Message"')
+
+
+def is_error_payload(content):
+    """
+    Check whether a request was answered with a JSON error or throttling message.
+
+    Args:
+        content (bytes): The raw body of the response.
+
+    Returns:
+        bool: True if the body is an Alpha Vantage error message instead of data.
+    """
+    head = content[:300].lstrip()
+    return head.startswith(b"{") and any(key in head for key in ERROR_KEYS)
+
+
+class CachedResponse:
+    def __init__(self, content, status_code=200):
+        """
+        Initialize a response object for data served from the cache.
+
+        Args:
+            content (bytes): The raw body of the original response.
+            status_code (int): The HTTP status code to report (default is 200).
+        """
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+
+class HistoryCache:
+    def __init__(self, path=None, freshness=None):
+        """
+        Initialize a new instance of the HistoryCache class.
+
+        Args:
+            path (str, optional): The SQLite file of the cache (default is cache/history.sqlite3).
+            freshness (dict, optional): Seconds a response of each API function stays fresh
+            (default is FRESHNESS).
+
+        Usage:
+            cache = HistoryCache()
+        """
+        self.path = path or os.path.join(CACHE_DIR, CACHE_FILE)
+        self.freshness = FRESHNESS if freshness is None else freshness
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                         "function TEXT NOT NULL, "
+                         "symbol TEXT NOT NULL, "
+                         "interval TEXT NOT NULL, "
+                         "month TEXT NOT NULL, "
+                         "market TEXT NOT NULL, "
+                         "fetched_at REAL NOT NULL, "
+                         "content BLOB NOT NULL, "
+                         "PRIMARY KEY (function, symbol, interval, month, market))")
+            conn.execute("CREATE TABLE IF NOT EXISTS indicator_states ("
+                         "symbol TEXT NOT NULL, "
+                         "interval TEXT NOT NULL, "
+                         "indicator TEXT NOT NULL, "
+                         "saved_at REAL NOT NULL, "
+                         "state TEXT NOT NULL, "
+                         "PRIMARY KEY (symbol, interval, indicator))")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def key(params):
+        """
+        Build the cache key of a request.
+
+        Args:
+            params (dict): The query parameters of the request.
+
+        Returns:
+            tuple: (function, symbol, interval, month, market), missing values are empty strings.
+        """
+        return tuple(str(params.get(name) or "") for name in ("function", "symbol", "interval", "month", "market"))
+
+    def handles(self, params):
+        """
+        Check whether responses of this request are kept in the cache.
+
+        Args:
+            params (dict): The query parameters of the request.
+
+        Returns:
+            bool: True if the API function has a freshness policy.
+        """
+        return params.get("function") in self.freshness
+
+    def is_fresh(self, key, fetched_at, now=None):
+        """
+        Check whether a stored response can still be used.
+
+        Args:
+            key (tuple): The cache key of the response.
+            fetched_at (float): The epoch time the response was downloaded.
+            now (float, optional): The current epoch time (default is time.time()).
+
+        Returns:
+            bool: True if the response is still fresh.
+        """
+        function, symbol, interval, month, market = key
+        if month and month < datetime.now().strftime("%Y-%m"):
+            return True
+        now = time.time() if now is None else now
+        return now - fetched_at < self.freshness.get(function, 0)
+
+    def lookup(self, params, fresh_only=True):
+        """
+        Read a stored response.
+
+        Args:
+            params (dict): The query parameters of the request.
+            fresh_only (bool): Ignore responses that are past their freshness policy (default is True).
+
+        Returns:
+            tuple or None: (content, fetched_at) of the stored response, or None if nothing usable is stored.
+        """
+        key = self.key(params)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT content, fetched_at FROM responses WHERE function = ? AND symbol = ? "
+                               "AND interval = ? AND month = ? AND market = ?", key).fetchone()
+        if row is None:
+            return None
+        content, fetched_at = row
+        if fresh_only and not self.is_fresh(key, fetched_at):
+            return None
+        return bytes(content), fetched_at
+
+    def store(self, params, content):
+        """
+        Save a response in the cache.
+
+        Args:
+            params (dict): The query parameters of the request.
+            content (bytes): The raw body of the response.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (*self.key(params), time.time(), sqlite3.Binary(content)))
+
+    def store_state(self, symbol, interval, indicator, state):
+        """
+        Save the state of an incremental indicator.
+
+        Args:
+            symbol (str): The symbol of the price series.
+            interval (str): The interval of the price series (e.g., "weekly").
+            indicator (str): Identifies the indicator and its parameters.
+            state (str): The serialized state.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO indicator_states VALUES (?, ?, ?, ?, ?)",
+                         (symbol, interval, indicator, time.time(), state))
+
+    def lookup_state(self, symbol, interval, indicator):
+        """
+        Read the saved state of an incremental indicator.
+
+        Args:
+            symbol (str): The symbol of the price series.
+            interval (str): The interval of the price series (e.g., "weekly").
+            indicator (str): Identifies the indicator and its parameters.
+
+        Returns:
+            str or None: The serialized state, or None if nothing is stored.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT state FROM indicator_states WHERE symbol = ? AND interval = ? "
+                               "AND indicator = ?", (symbol, interval, indicator)).fetchone()
+        return None if row is None else row[0]
+
+    def clear(self, function=None):
+        """
+        Remove stored responses.
+
+        Args:
+            function (str, optional): Only remove responses of this API function (default is None, remove all).
+        """
+        with closing(self._connect()) as conn, conn:
+            if function is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute("DELETE FROM responses WHERE function = ?", (function,))
+
+
+class ResponseCache:
+    def __init__(self, max_bytes=MEMORY_MAX_BYTES, ttl=None, default_ttl=MEMORY_TTL_DEFAULT):
+        """
+        Initialize a new instance of the ResponseCache class.
+
+        Args:
+            max_bytes (int): The memory budget of the stored response bodies (default is 256 MB).
+            ttl (dict, optional): Seconds a response of each API function stays in memory (default is MEMORY_TTL).
+            default_ttl (int): Seconds for API functions missing from ttl (default is 15 minutes).
+
+        Usage:
+            cache = ResponseCache(max_bytes=64 * 1024 * 1024)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = MEMORY_TTL if ttl is None else ttl
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(params):
+        """
+        Build the cache key of a request.
+
+        The API key and unset parameters are left out. The month parameter only matters for intraday intervals,
+        so it is left out for daily, weekly and monthly requests.
+
+        Args:
+            params (dict): The query parameters of the request.
+
+        Returns:
+            tuple: The sorted (name, value) pairs of the request.
+        """
+        intraday = params.get("interval") is None or params.get("interval") in INTRADAY_INTERVALS
+        return tuple(sorted((name, str(value)) for name, value in params.items()
+                            if value is not None and name != "apikey" and (name != "month" or intraday)))
+
+    def get(self, params):
+        """
+        Read a response from memory.
+
+        Args:
+            params (dict): The query parameters of the request.
+
+        Returns:
+            CachedResponse or None: The stored response, or None if it is missing or expired.
+        """
+        key = self.key(params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, params, response):
+        """
+        Save a response in memory, evicting the least recently used responses over the memory budget.
+
+        Args:
+            params (dict): The query parameters of the request.
+            response (CachedResponse): The response to store.
+        """
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        key = self.key(params)
+        expires = time.time() + self.ttl.get(params.get("function"), self.default_ttl)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (expires, response)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        expires, response = self.entries.pop(key)
+        self.size -= len(response.content)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Report the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, stored entries and stored bytes.
+        """
+        with self.lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "entries": len(self.entries),
+                    "bytes": self.size}
+
+
+history_cache = HistoryCache()
+response_cache = ResponseCache()
+
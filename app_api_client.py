@@ -0,0 +1,210 @@
+"""
+app_api_client.py
+
+This module defines the HTTP client that every Alpha Vantage request goes through.
+
+Classes:
+    AlphaVantageClient: A client that owns a pooled requests.Session with keep-alive connections, retries with
+    exponential backoff, connect/read timeouts and gzip compression, and answers requests from the response
+    caches when it can. Network calls wait for the shared rate limiter, and identical requests that are in
+    flight at the same time share one download. A stale full intraday or daily history is refreshed with a
+    compact request whose rows are merged into the stored history.
+
+Functions:
+    response_problem: Describe why a response holds no data, e.g. a rate limit or an HTTP error.
+
+Usage:
+    ApiDataStocks and ApiDataCrypto use the shared `alpha_vantage` instance, so all windows reuse the same
+    open connections.
+
+Example:
+    r = alpha_vantage.get("/query", params={"apikey": api_key, "function": "GLOBAL_QUOTE", "symbol": "IBM"})
+    if r.status_code in range(200, 400):
+        print(r.content)
+"""
+
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from api_info import HOST_VANTAGE
+from app_api_cache import CachedResponse, HistoryCache, ResponseCache, history_cache, response_cache, is_error_payload
+from app_api_csv import merge_api_csv
+from app_api_ratelimit import rate_limiter, single_flight
+
+logger = logging.getLogger(__name__)
+file_handler = logging.FileHandler("app.log")
+logger.addHandler(file_handler)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(funcName)s -%(message)s - Nr.%(lineno)d")
+file_handler.setFormatter(formatter)
+
+logger.setLevel(logging.INFO)
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+QUOTA_MESSAGE = b'{"Note": "The API call budget set in api_info.py is used up."}'
+# The functions that honour outputsize=compact, the weekly and monthly ones always return the full history.
+COMPACT_FUNCTIONS = ("TIME_SERIES_INTRADAY", "TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED")
+
+
+class AlphaVantageClient:
+    def __init__(self, host=HOST_VANTAGE, retries=3, backoff=0.5, connect_timeout=5, read_timeout=30,
+                 pool_size=10):
+        """
+        Initialize a new instance of the AlphaVantageClient class.
+
+        Args:
+            host (str): The base URL of the API (default is HOST_VANTAGE).
+            retries (int): How many times a failed request is repeated, every repeat of a request that reached the
+            server takes a call from the rate limiter (default is 3).
+            backoff (float): The backoff factor in seconds, the waits are backoff * 2 ** (retry - 1)
+            (default is 0.5).
+            connect_timeout (float): Seconds to wait for a connection (default is 5).
+            read_timeout (float): Seconds to wait for the response (default is 30).
+            pool_size (int): How many connections are kept open (default is 10).
+
+        Usage:
+            client = AlphaVantageClient(retries=5, read_timeout=60)
+        """
+        self.host = host
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.local = threading.local()
+        # urllib3 only repeats requests that failed to connect or to read, the status retries go through _fetch,
+        # which takes a call from the rate limiter for each of them.
+        retry = Retry(total=retries, backoff_factor=backoff, allowed_methods=frozenset({"GET"}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate",
+                                     "Connection": "keep-alive"})
+
+    def send(self, endpoint, params):
+        """
+        Send a GET request over the pooled session.
+
+        Args:
+            endpoint (str): The path of the request (e.g., "/query").
+            params (dict): The query parameters of the request.
+
+        Returns:
+            requests.Response: The response of the request.
+        """
+        return self.session.get(self.host + endpoint, params=params, timeout=self.timeout)
+
+    def get(self, endpoint, params):
+        """
+        Answer a GET request from memory, then from the history cache, and only then from the network.
+
+        Args:
+            endpoint (str): The path of the request (e.g., "/query").
+            params (dict): The query parameters of the request.
+
+        Returns:
+            requests.Response or CachedResponse: The response of the request.
+        """
+        stored = response_cache.get(params)
+        if stored is None:
+            stored = single_flight.do(ResponseCache.key(params), lambda: self._load(endpoint, params))
+        self.local.response = stored
+        return stored
+
+    def take_response(self):
+        """
+        Return the last response get() returned on the calling thread and forget it.
+
+        The data methods turn a failed response into None or an empty DataFrame, this keeps the reason, e.g. for
+        the error messages of the bulk reports.
+
+        Returns:
+            requests.Response or CachedResponse or None: The response, None if get() was not called since.
+        """
+        response = getattr(self.local, "response", None)
+        self.local.response = None
+        return response
+
+    def _load(self, endpoint, params):
+        stored = None
+        if history_cache.handles(params):
+            stored = history_cache.lookup(params, fresh_only=False)
+            if stored is not None and history_cache.is_fresh(HistoryCache.key(params), stored[1]):
+                logger.info(f"Cached {params.get('function')} data used for {params.get('symbol')}")
+                return self._keep(params, stored[0], history=False)
+        if stored is not None and params.get("outputsize") == "full" and params.get("function") in COMPACT_FUNCTIONS:
+            r = self._fetch(endpoint, {**params, "outputsize": "compact"})
+            if r.status_code not in range(200, 400) or is_error_payload(r.content):
+                return r
+            merged = merge_api_csv(stored[0], r.content)
+            if merged is not None:
+                logger.info(f"{params.get('function')} history of {params.get('symbol')} refreshed with "
+                            f"{len(r.content)} bytes instead of a full download")
+                return self._keep(params, merged)
+            logger.info(f"Gap in the {params.get('function')} history of {params.get('symbol')}, full refresh")
+        r = self._fetch(endpoint, params)
+        if r.status_code not in range(200, 400) or is_error_payload(r.content):
+            return r
+        self._keep(params, r.content)
+        return r
+
+    def _fetch(self, endpoint, params):
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            if not rate_limiter.acquire():
+                return CachedResponse(QUOTA_MESSAGE, status_code=429)
+            r = self.send(endpoint, params)
+            if r.status_code not in RETRY_STATUS:
+                break
+            if r.status_code == 429:
+                rate_limiter.throttled()
+            logger.warning(f"{params.get('function')} request answered with status {r.status_code} "
+                           f"(attempt {attempt + 1} of {self.retries + 1})")
+        if r.status_code in range(200, 400) and is_error_payload(r.content):
+            if b'"Error Message"' not in r.content[:300]:
+                rate_limiter.throttled()
+            logger.error(f"{params.get('function')} request refused: {r.content[:200].decode('utf-8', 'replace')}")
+        return r
+
+    @staticmethod
+    def _keep(params, content, history=True):
+        if history and history_cache.handles(params):
+            history_cache.store(params, content)
+        r = CachedResponse(content)
+        response_cache.put(params, r)
+        return r
+
+    def close(self):
+        self.session.close()
+
+
+def response_problem(response):
+    """
+    Describe why a response holds no data.
+
+    Args:
+        response (requests.Response or CachedResponse or None): The response of a request.
+
+    Returns:
+        str or None: "Rate limit: ...", "HTTP <status>" or "API error: ...", None if the response holds data or
+        is None.
+    """
+    if response is None:
+        return None
+    if response.status_code == 429:
+        return "Rate limit: " + ("API call budget used up" if response.content == QUOTA_MESSAGE else "HTTP 429")
+    if response.status_code not in range(200, 400):
+        return f"HTTP {response.status_code}"
+    if is_error_payload(response.content):
+        message = response.content[:300].decode("utf-8", "replace")
+        if b'"Error Message"' in response.content[:300]:
+            return f"API error: {message}"
+        return f"Rate limit: {message}"
+    return None
+
+
+alpha_vantage = AlphaVantageClient()
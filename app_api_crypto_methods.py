@@ -18,6 +18,7 @@ Example:
 
 import pandas as pd
 from app_api_crypto_requests import ApiDataCrypto
+from app_api_csv import date_slice
 
 
 class ApiCryptoMethods(ApiDataCrypto):
@@ -32,7 +33,7 @@ class ApiCryptoMethods(ApiDataCrypto):
         """
         super().__init__()
 
-    def daily_crypto_report(self, crypto, currency="USD", date=None):
+    def daily_crypto_report(self, crypto, currency="USD", date=None, start=None, end=None):
         """
         Generate a daily cryptocurrency report.
 
@@ -41,6 +42,9 @@ class ApiCryptoMethods(ApiDataCrypto):
             currency (str): The currency in which to display prices (default is "USD").
             date (str, optional): The specific date for the report in the "YYYY-MM-DD, YYYY-MM or YYYY" format.
             (default is None).
+            start (str, optional): The first date of the report in the "YYYY-MM-DD, YYYY-MM or YYYY"
+            format (default is None).
+            end (str, optional): The last date of the report in the same format (default is None).
 
         Returns:
             pandas.DataFrame: A DataFrame containing daily cryptocurrency data.
@@ -52,11 +56,10 @@ class ApiCryptoMethods(ApiDataCrypto):
         else:
             duomenys.drop(["open (USD)", "high (USD)", "low (USD)", "close (USD)"], axis=1, inplace=True)
         if date is not None:
-            return duomenys[duomenys.index.str.startswith(date)]
-        else:
-            return duomenys
+            duomenys = date_slice(duomenys, date, date)
+        return date_slice(duomenys, start, end)
 
-    def weekly_crypto_report(self, crypto, currency="USD", date=None):
+    def weekly_crypto_report(self, crypto, currency="USD", date=None, start=None, end=None):
         """
         Generate a weekly cryptocurrency report.
 
@@ -64,6 +67,9 @@ class ApiCryptoMethods(ApiDataCrypto):
             crypto (str): The cryptocurrency symbol (e.g., "BTC").
             currency (str): The currency in which to display prices (default is "USD").
             date (str, optional): The specific date for the report in the "YYYY-MM or YYYY" format (default is None).
+            start (str, optional): The first date of the report in the "YYYY-MM-DD, YYYY-MM or YYYY"
+            format (default is None).
+            end (str, optional): The last date of the report in the same format (default is None).
 
         Returns:
             pandas.DataFrame: A DataFrame containing weekly cryptocurrency data.
@@ -74,11 +80,10 @@ class ApiCryptoMethods(ApiDataCrypto):
         else:
             duomenys.drop(["open (USD)", "high (USD)", "low (USD)", "close (USD)"], axis=1, inplace=True)
         if date is not None:
-            return duomenys[duomenys.index.str.startswith(date)]
-        else:
-            return duomenys
+            duomenys = date_slice(duomenys, date, date)
+        return date_slice(duomenys, start, end)
 
-    def monthly_crypto_report(self, crypto, currency="USD", date=None):
+    def monthly_crypto_report(self, crypto, currency="USD", date=None, start=None, end=None):
         """
         Generate a monthly cryptocurrency report.
 
@@ -86,6 +91,9 @@ class ApiCryptoMethods(ApiDataCrypto):
             crypto (str): The cryptocurrency symbol (e.g., "BTC").
             currency (str): The currency in which to display prices (default is "USD").
             date (str, optional): The specific date for the report in the "YYYY-MM or YYYY" format (default is None).
+            start (str, optional): The first date of the report in the "YYYY-MM-DD, YYYY-MM or YYYY"
+            format (default is None).
+            end (str, optional): The last date of the report in the same format (default is None).
 
         Returns:
             pandas.DataFrame: A DataFrame containing monthly cryptocurrency data.
@@ -96,6 +104,5 @@ class ApiCryptoMethods(ApiDataCrypto):
         else:
             duomenys.drop(["open (USD)", "high (USD)", "low (USD)", "close (USD)"], axis=1, inplace=True)
         if date is not None:
-            return duomenys[duomenys.index.str.startswith(date)]
-        else:
-            return duomenys
+            duomenys = date_slice(duomenys, date, date)
+        return date_slice(duomenys, start, end)
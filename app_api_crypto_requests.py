@@ -17,14 +17,12 @@ Example:
     monthly_crypto_data = api_crypto.monthly_data_crypto("BTC", "USD")
 """
 
-import requests
-import os
 import json
 import logging
 import pandas as pd
-from api_info import HOST_VANTAGE, api_key
-
-HOST_VANTAGE = HOST_VANTAGE
+from api_info import api_key
+from app_api_client import alpha_vantage
+from app_api_csv import read_api_csv
 
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', None)
@@ -46,10 +44,14 @@ class ApiDataCrypto:
 
         This class provides methods for accessing cryptocurrency data through various API functions.
 
+        Set float32 to True to keep the price columns as float32.
+
         Usage:
             api_crypto = ApiDataCrypto()
         """
         self.apikey_aplha = api_key
+        self.float32 = False
+        self.client = alpha_vantage
 
     def exchange_rate(self, currency_from, currency_to):
         """
@@ -68,7 +70,7 @@ class ApiDataCrypto:
                    "from_currency": currency_from,
                    "to_currency": currency_to
                    }
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
             exchan = json.loads(r.text)
             logger.info(f"Exchange rate data retrieved. Status code {r.status_code}")
@@ -94,13 +96,9 @@ class ApiDataCrypto:
                    "market": currency,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            cdata_daily = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            cdata_daily = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Daily cryptocurrency data retrieved. Status code {r.status_code}")
             return cdata_daily
         else:
@@ -124,13 +122,9 @@ class ApiDataCrypto:
                    "market": currency,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            cdata_weekly = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            cdata_weekly = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Weekly cryptocurrency data retrieved. Status code {r.status_code}")
             return cdata_weekly
         else:
@@ -154,13 +148,9 @@ class ApiDataCrypto:
                    "market": currency,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            cdata_monthly = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            cdata_monthly = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Monthly cryptocurrency data retrieved. Status code {r.status_code}")
             return cdata_monthly
         else:
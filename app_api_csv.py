@@ -0,0 +1,277 @@
+"""
+app_api_csv.py
+
+This module parses the CSV responses of Alpha Vantage straight from memory.
+
+The response bytes are handed to pandas through an in-memory buffer, so no temporary file is written and
+concurrent requests can not overwrite each other. Every API function has an explicit dtype schema and its
+timestamp column is parsed to datetime64. The last PARSED_KEPT parsed bodies are kept by their content hash, so
+the same cached response is parsed only once however often a chart is redrawn.
+
+Functions:
+    read_api_csv: Parse the body of a CSV response into a DataFrame.
+    date_period: The first and the past-the-end timestamp of a "YYYY", "YYYY-MM" or "YYYY-MM-DD" period.
+    date_prefix_mask: Select the rows of a datetime column that fall in a "YYYY", "YYYY-MM" or "YYYY-MM-DD" period.
+    date_bounds, date_slice: Select the rows of a sorted time-indexed frame between two dates by binary search.
+    date_range: Split a "YYYY", "YYYY-MM" or "start/end" date entry into start and end dates.
+    merge_api_csv: Merge the newest rows of a compact response into a stored full response.
+
+Example:
+    r = alpha_vantage.get("/query", params=payload)
+    df = read_api_csv(r.content, "TIME_SERIES_WEEKLY")
+    df_2023 = df[date_prefix_mask(df["timestamp"], "2023")]
+    df_range = date_slice(df.set_index("timestamp"), start="2019-06", end="2023")
+"""
+
+import hashlib
+import io
+import logging
+import re
+import threading
+import numpy as np
+import pandas as pd
+from collections import defaultdict, OrderedDict
+from app_api_cache import is_error_payload
+
+logger = logging.getLogger(__name__)
+file_handler = logging.FileHandler("app.log")
+logger.addHandler(file_handler)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(funcName)s -%(message)s - Nr.%(lineno)d")
+file_handler.setFormatter(formatter)
+
+logger.setLevel(logging.INFO)
+
+OHLCV = {"timestamp": "str", "open": "float64", "high": "float64", "low": "float64", "close": "float64",
+         "volume": "int64"}
+
+# Columns missing from a schema are read as float64, the timestamp column is parsed to datetime64.
+SCHEMAS = {"TIME_SERIES_INTRADAY": OHLCV,
+           "TIME_SERIES_DAILY": OHLCV,
+           "TIME_SERIES_WEEKLY": OHLCV,
+           "TIME_SERIES_MONTHLY": OHLCV,
+           "DIGITAL_CURRENCY_DAILY": {"timestamp": "str"},
+           "DIGITAL_CURRENCY_WEEKLY": {"timestamp": "str"},
+           "DIGITAL_CURRENCY_MONTHLY": {"timestamp": "str"},
+           "SMA": {"time": "str"},
+           "EMA": {"time": "str"},
+           "RSI": {"time": "str"},
+           "STOCH": {"time": "str"},
+           "ADX": {"time": "str"},
+           "CCI": {"time": "str"},
+           "AROON": {"time": "str"},
+           "BBANDS": {"time": "str"},
+           "AD": {"time": "str"},
+           "OBV": {"time": "str"},
+           "GLOBAL_QUOTE": {"symbol": "str", "volume": "int64", "latestDay": "str", "changePercent": "str"},
+           "SYMBOL_SEARCH": {"symbol": "str", "name": "str", "type": "str", "region": "str", "marketOpen": "str",
+                             "marketClose": "str", "timezone": "str", "currency": "str"}}
+
+TIME_COLUMNS = ("timestamp", "time")
+
+PARSED_KEPT = 32
+_parsed = OrderedDict()
+_parsed_lock = threading.Lock()
+
+
+def read_api_csv(content, function, float32=False):
+    """
+    Parse the body of a CSV response into a DataFrame.
+
+    Args:
+        content (bytes): The raw body of the response.
+        function (str): The Alpha Vantage function of the request (e.g., "TIME_SERIES_WEEKLY").
+        float32 (bool): Store the price columns as float32 to halve their memory (default is False).
+
+    Returns:
+        pandas.DataFrame: The parsed data, or an empty DataFrame if the API answered with an error message.
+    """
+    if is_error_payload(content):
+        logger.warning(f"{function} data not parsed. API message: {content[:200].decode('utf-8', 'replace')}")
+        return pd.DataFrame()
+    key = (hashlib.blake2b(content, digest_size=16).digest(), function, float32)
+    with _parsed_lock:
+        if key in _parsed:
+            _parsed.move_to_end(key)
+            # Callers may modify their frame, the kept one stays untouched.
+            return _parsed[key].copy()
+    df = _parse(content, function, float32)
+    with _parsed_lock:
+        _parsed[key] = df
+        while len(_parsed) > PARSED_KEPT:
+            _parsed.popitem(last=False)
+    return df.copy()
+
+
+def _parse(content, function, float32):
+    float_type = "float32" if float32 else "float64"
+    schema = {column: float_type if dtype == "float64" else dtype for column, dtype in SCHEMAS[function].items()}
+    dtypes = defaultdict(lambda: float_type, schema)
+    df = pd.read_csv(io.BytesIO(content), dtype=dtypes)
+    for column in TIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], format="ISO8601")
+    return df
+
+
+def date_period(prefix):
+    """
+    The first and the past-the-end timestamp of a period written as a date prefix.
+
+    Args:
+        prefix (str): The period in the "YYYY", "YYYY-MM" or "YYYY-MM-DD" format.
+
+    Returns:
+        tuple: (start, stop) pandas.Timestamps, stop is the first moment after the period.
+
+    Raises:
+        ValueError: If the prefix is not a valid date.
+    """
+    start = pd.Timestamp(prefix)
+    parts = prefix.count("-")
+    if parts == 0:
+        return start, pd.Timestamp(start.year + 1, 1, 1)
+    if parts == 1:
+        return start, pd.Timestamp(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, start + pd.Timedelta(days=1)
+
+
+def date_prefix_mask(values, prefix):
+    """
+    Select the dates that fall in the period written as a date prefix.
+
+    Args:
+        values (pandas.Series or pandas.DatetimeIndex): The datetime values to check.
+        prefix (str): The period in the "YYYY", "YYYY-MM" or "YYYY-MM-DD" format.
+
+    Returns:
+        numpy.ndarray or pandas.Series: A boolean mask of the values inside the period.
+
+    Raises:
+        ValueError: If the prefix is not a valid date.
+    """
+    start, stop = date_period(prefix)
+    return (values >= start) & (values < stop)
+
+
+def date_bounds(values, start=None, end=None):
+    """
+    Find the rows between two dates of sorted datetime values by binary search.
+
+    A date prefix covers its whole period, so start="2009-01", end="2012" selects January 2009 to December 2012.
+
+    Args:
+        values (pandas.DatetimeIndex or pandas.Series): Datetime values sorted oldest or newest first.
+        start (str or pandas.Timestamp, optional): The first date, a "YYYY", "YYYY-MM" or "YYYY-MM-DD" prefix or
+        a timestamp (default is None, from the oldest value).
+        end (str or pandas.Timestamp, optional): The last date, in the same formats (default is None, up to the
+        newest value).
+
+    Returns:
+        tuple: (first, stop) positions of the selected rows in values.
+
+    Raises:
+        ValueError: If a date is not valid.
+    """
+    values = np.asarray(values, dtype="datetime64[ns]")
+    length = len(values)
+    newest_first = length > 1 and values[0] > values[-1]
+    if newest_first:
+        values = values[::-1]
+    first, stop = 0, length
+    if start is not None:
+        start = date_period(start)[0] if isinstance(start, str) else pd.Timestamp(start)
+        first = int(values.searchsorted(start.to_datetime64()))
+    if end is not None:
+        if isinstance(end, str):
+            stop = int(values.searchsorted(date_period(end)[1].to_datetime64()))
+        else:
+            stop = int(values.searchsorted(pd.Timestamp(end).to_datetime64(), side="right"))
+    stop = max(first, stop)
+    if newest_first:
+        return length - stop, length - first
+    return first, stop
+
+
+def date_slice(frame, start=None, end=None, column=None):
+    """
+    Select the rows of a time-indexed frame between two dates.
+
+    Sorted frames, like every report and indicator of the API, are sliced by binary search and the result is a
+    view of the rows instead of a filtered copy. Unsorted frames are searched through a sorted order.
+
+    Args:
+        frame (pandas.DataFrame): A frame indexed by datetime, or with a datetime column.
+        start (str or pandas.Timestamp, optional): The first date, see date_bounds (default is None).
+        end (str or pandas.Timestamp, optional): The last date, see date_bounds (default is None).
+        column (str, optional): The datetime column, e.g. "time" for indicators (default is None, the index).
+
+    Returns:
+        pandas.DataFrame: The rows from start to end, in the order of the frame.
+
+    Raises:
+        ValueError: If a date is not valid.
+    """
+    if start is None and end is None:
+        return frame
+    values = frame.index if column is None else frame[column]
+    if not (values.is_monotonic_increasing or values.is_monotonic_decreasing):
+        values = np.asarray(values, dtype="datetime64[ns]")
+        order = values.argsort(kind="stable")
+        first, stop = date_bounds(values[order], start, end)
+        rows = order[first:stop]
+        rows.sort()
+        return frame.iloc[rows]
+    first, stop = date_bounds(values, start, end)
+    return frame.iloc[first:stop]
+
+
+def date_range(text):
+    """
+    Split the date entry of a form into the start and end dates of date_bounds.
+
+    Args:
+        text (str): A "YYYY" or "YYYY-MM" period, a "YYYY-MM/YYYY-MM" range, or None or "" for all dates.
+
+    Returns:
+        tuple: (start, end) date prefixes, (None, None) for all dates.
+
+    Raises:
+        ValueError: If the entry is not a period or a range of periods.
+    """
+    if not text:
+        return None, None
+    dates = text.split("/")
+    if len(dates) > 2 or not all(re.fullmatch(r"\d{4}(?:-\d{2})?", date) for date in dates):
+        raise ValueError(f"{text} is not a date or a date range")
+    return dates[0], dates[-1]
+
+
+def merge_api_csv(stored, fresh):
+    """
+    Merge the rows of a compact response into a stored full response of the same request.
+
+    The compact response holds the latest bars, so every fresh row is kept and the stored rows are kept only if
+    they are older than the oldest fresh row. Stored rows in the fresh range are dropped even if the fresh
+    response has no row with their timestamp (e.g. a running week whose bar moved to a later day). The result is
+    sorted newest first like the API output.
+
+    Args:
+        stored (bytes): The raw body of the stored full response.
+        fresh (bytes): The raw body of the compact response.
+
+    Returns:
+        bytes or None: The merged body, or None if the responses do not overlap or have different columns,
+        in which case the full history has to be downloaded again.
+    """
+    stored_lines = [line for line in stored.splitlines() if line.strip()]
+    fresh_lines = [line for line in fresh.splitlines() if line.strip()]
+    if len(stored_lines) < 2 or len(fresh_lines) < 2 or stored_lines[0].strip() != fresh_lines[0].strip():
+        return None
+    fresh_oldest = min(line.split(b",", 1)[0] for line in fresh_lines[1:])
+    stored_newest = max(line.split(b",", 1)[0] for line in stored_lines[1:])
+    if fresh_oldest > stored_newest:
+        return None
+    rows = fresh_lines[1:] + [line for line in stored_lines[1:] if line.split(b",", 1)[0] < fresh_oldest]
+    merged = [stored_lines[0]] + sorted(rows, key=lambda line: line.split(b",", 1)[0], reverse=True)
+    return b"\r\n".join(merged) + b"\r\n"
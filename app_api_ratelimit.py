@@ -0,0 +1,232 @@
+"""
+app_api_ratelimit.py
+
+This module keeps the app inside the Alpha Vantage request quota and removes duplicate requests.
+
+Classes:
+    TokenBucket: A thread-safe token bucket that refills at a constant rate.
+    RateLimiter: A calls-per-minute and calls-per-day budget shared by every API call.
+    SingleFlight: Lets identical requests that are in flight at the same time share one network call.
+
+Usage:
+    AlphaVantageClient asks the shared `rate_limiter` for a token before every network call and runs its
+    downloads through the shared `single_flight` instance. The budgets come from api_info.py.
+
+Example:
+    if rate_limiter.acquire():
+        r = session.get(url, params=payload)
+    else:
+        print("Quota used up")
+"""
+
+import time
+import logging
+import threading
+from api_info import calls_per_minute, calls_per_day
+
+logger = logging.getLogger(__name__)
+file_handler = logging.FileHandler("app.log")
+logger.addHandler(file_handler)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(funcName)s -%(message)s - Nr.%(lineno)d")
+file_handler.setFormatter(formatter)
+
+logger.setLevel(logging.INFO)
+
+MAX_WAIT = 60
+
+
+class TokenBucket:
+    def __init__(self, capacity, period):
+        """
+        Initialize a new instance of the TokenBucket class.
+
+        Args:
+            capacity (int): The most tokens the bucket holds, which is also the burst size.
+            period (float): Seconds it takes to refill an empty bucket.
+
+        Usage:
+            bucket = TokenBucket(capacity=5, period=60)
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """
+        Report how long it takes until a token is available.
+
+        Returns:
+            float: Seconds until the next token, 0 if one is available now.
+        """
+        with self.lock:
+            self._refill()
+            return max(0.0, (1 - self.tokens) / self.rate)
+
+    def try_take(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def reserve(self, max_wait):
+        """
+        Take a token now and report how long the caller has to wait before using it.
+
+        The bucket may go into debt, so the callers that reserve after this one wait behind it. The caller sleeps
+        without holding the lock of the bucket.
+
+        Args:
+            max_wait (float): The longest wait that is accepted, in seconds.
+
+        Returns:
+            float or None: Seconds until the token may be used, 0 if at once, None if the wait would be longer than
+            max_wait and no token was taken.
+        """
+        with self.lock:
+            self._refill()
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+    def drain(self):
+        """
+        Empty the bucket, e.g. after the server reported that the quota is used up.
+        """
+        with self.lock:
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+
+
+class RateLimiter:
+    def __init__(self, per_minute=calls_per_minute, per_day=calls_per_day, max_wait=MAX_WAIT):
+        """
+        Initialize a new instance of the RateLimiter class.
+
+        Args:
+            per_minute (int): Calls allowed per minute (default is calls_per_minute from api_info.py).
+            per_day (int): Calls allowed per day (default is calls_per_day from api_info.py).
+            max_wait (float): The longest a call waits for the per-minute budget, in seconds (default is 60).
+
+        Usage:
+            limiter = RateLimiter(per_minute=75, per_day=100000)
+        """
+        self.minute = TokenBucket(per_minute, 60)
+        self.day = TokenBucket(per_day, 24 * 60 * 60)
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait for the per-minute budget and take one call from both budgets.
+
+        The call is reserved under the lock and the wait happens after it is released, so a caller that waits
+        does not hold up the others, and a caller is refused at once when the daily budget is used up.
+
+        Returns:
+            bool: True if the call may be sent, False if the daily budget is used up or the wait
+            would be longer than max_wait.
+        """
+        with self.lock:
+            if self.day.wait_time() > 0:
+                logger.error("Daily API call budget is used up")
+                return False
+            wait = self.minute.reserve(self.max_wait)
+            if wait is None:
+                logger.error(f"API call budget frees up in {self.minute.wait_time():.0f} s, which is longer than "
+                             f"{self.max_wait} s")
+                return False
+            self.day.try_take()
+        if wait > 0:
+            logger.info(f"Waiting {wait:.1f} s for the per-minute API call budget")
+            time.sleep(wait)
+        return True
+
+    def configure(self, per_minute=None, per_day=None):
+        """
+        Replace the budgets, e.g. to lift them for benchmarks against a replay adapter.
+
+        Args:
+            per_minute (int, optional): Calls allowed per minute (default is None, keep the current budget).
+            per_day (int, optional): Calls allowed per day (default is None, keep the current budget).
+        """
+        with self.lock:
+            if per_minute is not None:
+                self.minute = TokenBucket(per_minute, 60)
+            if per_day is not None:
+                self.day = TokenBucket(per_day, 24 * 60 * 60)
+
+    def throttled(self):
+        """
+        Empty the per-minute budget after the server answered with a throttling message.
+        """
+        self.minute.drain()
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Initialize a new instance of the SingleFlight class.
+
+        Usage:
+            flights = SingleFlight()
+            result = flights.do(key, download)
+        """
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Run a call, or wait for the identical call that is already running and share its result.
+
+        Args:
+            key (hashable): Identifies identical calls.
+            func (callable): The call to run if none with this key is in flight.
+
+        Returns:
+            object: The result of the call.
+
+        Raises:
+            Exception: The exception raised by the call.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self.calls[key] = call
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = func()
+            except Exception as error:
+                call["error"] = error
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call["done"].set()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+
+rate_limiter = RateLimiter()
+single_flight = SingleFlight()
@@ -0,0 +1,444 @@
+"""
+app_api_replay.py
+
+This module provides a network-free stand-in for Alpha Vantage, for offline runs, regression checks and
+benchmarks of the data layer.
+
+The stand-in is a requests transport adapter that is mounted on the session of AlphaVantageClient. It answers
+every API function the app uses from recorded fixture files. If there is no recording, it builds a deterministic
+response in the API's CSV or JSON format. Latency and throttling messages can be injected. A recording adapter
+saves live responses as fixtures.
+
+Classes:
+    ReplayAdapter: Answers requests from fixtures or synthetic data, with optional latency and throttling.
+    RecordAdapter: Sends requests to the live API and saves every successful response as a fixture.
+
+Functions:
+    fixture_path: The fixture file of a request.
+    synthetic_response: Build a deterministic response in the API format.
+    use_replay: Mount a ReplayAdapter on a client.
+    use_recording: Mount a RecordAdapter on a client.
+
+Example:
+    adapter = use_replay(alpha_vantage, latency=0.2, per_minute=5)
+    rate_limiter.configure(per_minute=10000, per_day=1000000)
+    response_cache.clear()
+    weekly = ApiStocksMethods().weekly_report("IBM")
+    print(adapter.calls)
+"""
+
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlsplit, parse_qsl
+import numpy as np
+import pandas as pd
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from app_api_cache import ResponseCache, is_error_payload
+
+logger = logging.getLogger(__name__)
+file_handler = logging.FileHandler("app.log")
+logger.addHandler(file_handler)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(funcName)s -%(message)s - Nr.%(lineno)d")
+file_handler.setFormatter(formatter)
+
+logger.setLevel(logging.INFO)
+
+FIXTURE_DIR = os.path.join("fixtures", "alpha_vantage")
+JSON_FUNCTIONS = {"CURRENCY_EXCHANGE_RATE", "TOP_GAINERS_LOSERS", "MARKET_STATUS"}
+THROTTLE_MESSAGE = (b'{"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per '
+                    b'minute and 100 calls per day."}')
+INVALID_MESSAGE = b'{"Error Message": "Invalid API call. Please retry or visit the documentation."}'
+
+# Bars of a full synthetic series, compact responses hold the newest COMPACT_BARS.
+FULL_BARS = {"daily": 5000, "weekly": 1300, "monthly": 300}
+CRYPTO_BARS = {"DIGITAL_CURRENCY_DAILY": 1000, "DIGITAL_CURRENCY_WEEKLY": 500, "DIGITAL_CURRENCY_MONTHLY": 120}
+COMPACT_BARS = 100
+FREQUENCIES = {"daily": pd.offsets.BDay(), "weekly": pd.offsets.Week(weekday=4), "monthly": pd.offsets.BMonthEnd()}
+SERIES_INTERVALS = {"TIME_SERIES_DAILY": "daily", "TIME_SERIES_WEEKLY": "weekly", "TIME_SERIES_MONTHLY": "monthly"}
+
+
+def fixture_path(params, directory=FIXTURE_DIR):
+    """
+    Build the fixture file name of a request.
+
+    Args:
+        params (dict): The query parameters of the request, the API key is ignored.
+        directory (str): The fixture directory (default is fixtures/alpha_vantage).
+
+    Returns:
+        str: The path of the fixture, e.g. fixtures/alpha_vantage/TIME_SERIES_WEEKLY-IBM-1a2b3c4d5e.csv.
+    """
+    key = ResponseCache.key(params)
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:10]
+    function = params.get("function", "UNKNOWN")
+    name = params.get("symbol") or params.get("keywords") or params.get("from_currency") or "ALL"
+    extension = "json" if function in JSON_FUNCTIONS or params.get("datatype") != "csv" else "csv"
+    name = "".join(char if char.isalnum() else "_" for char in str(name))
+    return os.path.join(directory, f"{function}-{name}-{digest}.{extension}")
+
+
+def _random(*parts):
+    return np.random.RandomState(zlib.crc32("|".join(str(part) for part in parts).encode("utf-8")))
+
+
+def _bars(symbol, interval, anchor, month=None, bars=None):
+    """
+    Build a deterministic OHLCV random walk ending at the anchor day, ascending in time.
+    """
+    if interval in FREQUENCIES:
+        index = pd.date_range(end=anchor, periods=bars or FULL_BARS[interval], freq=FREQUENCIES[interval])
+    else:
+        minutes = int(interval.replace("min", ""))
+        start = pd.Timestamp(month) if month else anchor.replace(day=1)
+        days = pd.bdate_range(start, min(start + pd.offsets.MonthEnd(0), anchor))
+        steps = pd.timedelta_range("4h", periods=16 * 60 // minutes, freq=f"{minutes}min")
+        index = pd.DatetimeIndex([day + step for day in days for step in steps])
+    random = _random(symbol, interval, month)
+    close = 100 * np.exp(np.cumsum(random.normal(0, 0.01, len(index))))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(random.normal(0, 0.005, len(index))) * close
+    return pd.DataFrame({"open": open_,
+                         "high": np.maximum(open_, close) + spread,
+                         "low": np.minimum(open_, close) - spread,
+                         "close": close,
+                         "volume": random.randint(10_000, 1_000_000, len(index))}, index=index)
+
+
+def _time_format(interval):
+    return "%Y-%m-%d" if interval in FREQUENCIES else "%Y-%m-%d %H:%M:%S"
+
+
+def _to_csv(df, column, interval):
+    df = df.dropna().iloc[::-1].round(4)
+    df.index = df.index.strftime(_time_format(interval) if column == "timestamp" else "%Y-%m-%d %H:%M")
+    if interval in FREQUENCIES:
+        df.index = df.index.str.slice(0, 10)
+    return df.rename_axis(column).to_csv(lineterminator="\r\n").encode("utf-8")
+
+
+def _wilder(values, period):
+    return values.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def _indicator(function, bars, params):
+    period = int(params.get("time_period") or 14)
+    high, low, close, volume = bars["high"], bars["low"], bars["close"], bars["volume"]
+    if function == "SMA":
+        return pd.DataFrame({"SMA": close.rolling(period).mean()})
+    if function == "EMA":
+        return pd.DataFrame({"EMA": close.ewm(span=period, adjust=False).mean()})
+    if function == "RSI":
+        change = close.diff()
+        gain = _wilder(change.clip(lower=0), period)
+        loss = _wilder(-change.clip(upper=0), period)
+        return pd.DataFrame({"RSI": 100 - 100 / (1 + gain / loss)}).iloc[period:]
+    if function == "STOCH":
+        fastk = int(params.get("fastkperiod") or 5)
+        raw = 100 * (close - low.rolling(fastk).min()) / (high.rolling(fastk).max() - low.rolling(fastk).min())
+        slowk = raw.rolling(int(params.get("slowkperiod") or 3)).mean()
+        return pd.DataFrame({"SlowK": slowk, "SlowD": slowk.rolling(int(params.get("slowdperiod") or 3)).mean()})
+    if function == "ADX":
+        up, down = high.diff(), -low.diff()
+        true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(1)
+        atr = _wilder(true_range, period)
+        plus = 100 * _wilder(up.where((up > down) & (up > 0), 0.0), period) / atr
+        minus = 100 * _wilder(down.where((down > up) & (down > 0), 0.0), period) / atr
+        return pd.DataFrame({"ADX": _wilder(100 * (plus - minus).abs() / (plus + minus), period)}).iloc[2 * period:]
+    if function == "CCI":
+        typical = (high + low + close) / 3
+        mean = typical.rolling(period).mean()
+        deviation = typical.rolling(period).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+        return pd.DataFrame({"CCI": (typical - mean) / (0.015 * deviation)})
+    if function == "AROON":
+        since_high = high.rolling(period + 1).apply(lambda x: period - x.argmax(), raw=True)
+        since_low = low.rolling(period + 1).apply(lambda x: period - x.argmin(), raw=True)
+        return pd.DataFrame({"Aroon Down": 100 * (period - since_low) / period,
+                             "Aroon Up": 100 * (period - since_high) / period})
+    if function == "BBANDS":
+        middle = close.rolling(period).mean()
+        deviation = close.rolling(period).std(ddof=0)
+        return pd.DataFrame({"Real Upper Band": middle + float(params.get("nbdevup") or 2) * deviation,
+                             "Real Middle Band": middle,
+                             "Real Lower Band": middle - float(params.get("nbdevdn") or 2) * deviation})
+    if function == "AD":
+        multiplier = ((close - low) - (high - close)) / (high - low)
+        return pd.DataFrame({"Chaikin A/D": (multiplier * volume).cumsum()})
+    if function == "OBV":
+        return pd.DataFrame({"OBV": (np.sign(close.diff()).fillna(0) * volume).cumsum()})
+    return None
+
+
+def _crypto(function, symbol, market, anchor):
+    interval = function.rsplit("_", 1)[1].lower()
+    bars = _bars(symbol, interval, anchor, bars=CRYPTO_BARS[function])
+    bars.index = pd.date_range(end=anchor, periods=len(bars),
+                               freq={"daily": "D", "weekly": "W-SUN", "monthly": "M"}[interval])
+    rate = 1.0 if market == "USD" else 0.9
+    df = pd.DataFrame(index=bars.index)
+    for column in ("open", "high", "low", "close"):
+        df[f"{column} ({market})"] = bars[column] * 300 * rate
+    for column in ("open", "high", "low", "close"):
+        df[f"{column} (USD) "] = bars[column] * 300
+    df["volume"] = bars["volume"] / 1000
+    df["market cap (USD)"] = df["close (USD) "] * df["volume"]
+    content = _to_csv(df, "timestamp", "daily")
+    return content.replace(b"(USD) ", b"(USD)")
+
+
+def _json(function, params, anchor, random):
+    if function == "CURRENCY_EXCHANGE_RATE":
+        rate = round(float(random.uniform(0.00001, 2)), 8)
+        return {"Realtime Currency Exchange Rate": {"1. From_Currency Code": params.get("from_currency"),
+                                                    "2. From_Currency Name": params.get("from_currency"),
+                                                    "3. To_Currency Code": params.get("to_currency"),
+                                                    "4. To_Currency Name": params.get("to_currency"),
+                                                    "5. Exchange Rate": f"{rate:.8f}",
+                                                    "6. Last Refreshed": anchor.strftime("%Y-%m-%d %H:%M:%S"),
+                                                    "7. Time Zone": "UTC",
+                                                    "8. Bid Price": f"{rate * 0.999:.8f}",
+                                                    "9. Ask Price": f"{rate * 1.001:.8f}"}}
+    if function == "TOP_GAINERS_LOSERS":
+        def movers(sign):
+            rows = []
+            for number in range(20):
+                price = float(random.uniform(1, 300))
+                change = sign * float(random.uniform(0.01, 0.5)) * price
+                rows.append({"ticker": f"SYM{number}", "price": f"{price:.4f}", "change_amount": f"{change:.4f}",
+                             "change_percentage": f"{100 * change / price:.4f}%",
+                             "volume": str(random.randint(10_000, 10_000_000))})
+            return rows
+        return {"metadata": "Top gainers, losers, and most actively traded US tickers",
+                "last_updated": anchor.strftime("%Y-%m-%d 16:15:59 US/Eastern"),
+                "top_gainers": movers(1), "top_losers": movers(-1), "most_actively_traded": movers(1)}
+    if function == "MARKET_STATUS":
+        markets = [("Equity", "United States", "NASDAQ, NYSE, AMEX, BATS", "09:30", "16:15"),
+                   ("Equity", "United Kingdom", "London Stock Exchange", "08:00", "16:30"),
+                   ("Equity", "Japan", "Tokyo Stock Exchange", "09:00", "15:00"),
+                   ("Forex", "Global", "N/A", "00:00", "23:59"),
+                   ("Cryptocurrency", "Global", "N/A", "00:00", "23:59")]
+        return {"endpoint": "Global Market Open & Close Status",
+                "markets": [{"market_type": market_type, "region": region, "primary_exchanges": exchanges,
+                             "local_open": local_open, "local_close": local_close, "current_status": "open",
+                             "notes": ""} for market_type, region, exchanges, local_open, local_close in markets]}
+    return None
+
+
+def synthetic_response(params, anchor=None):
+    """
+    Build a deterministic response in the Alpha Vantage format.
+
+    The prices are a random walk seeded by the request, so the same request always gets the same answer.
+
+    Args:
+        params (dict): The query parameters of the request.
+        anchor (pandas.Timestamp, optional): The day of the newest bar (default is today).
+
+    Returns:
+        bytes: The body of the response, an "Error Message" payload for unknown functions.
+    """
+    anchor = pd.Timestamp.today().normalize() if anchor is None else pd.Timestamp(anchor)
+    function = params.get("function", "")
+    symbol = str(params.get("symbol") or "")
+    random = _random(*ResponseCache.key(params))
+    compact = params.get("outputsize") == "compact"
+    if function in SERIES_INTERVALS:
+        interval = SERIES_INTERVALS[function]
+        return _to_csv(_bars(symbol, interval, anchor).iloc[-COMPACT_BARS if compact else 0:], "timestamp", interval)
+    if function == "TIME_SERIES_INTRADAY":
+        interval = params.get("interval", "60min")
+        bars = _bars(symbol, interval, anchor, month=params.get("month"))
+        return _to_csv(bars.iloc[-COMPACT_BARS if compact else 0:], "timestamp", interval)
+    if function in CRYPTO_BARS:
+        return _crypto(function, symbol, params.get("market", "USD"), anchor)
+    if function == "GLOBAL_QUOTE":
+        bars = _bars(symbol, "daily", anchor, bars=2)
+        last, previous = bars.iloc[-1], bars.iloc[-2]
+        change = last["close"] - previous["close"]
+        return (f"symbol,open,high,low,price,volume,latestDay,previousClose,change,changePercent\r\n"
+                f"{symbol},{last['open']:.4f},{last['high']:.4f},{last['low']:.4f},{last['close']:.4f},"
+                f"{last['volume']},{bars.index[-1]:%Y-%m-%d},{previous['close']:.4f},{change:.4f},"
+                f"{100 * change / previous['close']:.4f}%\r\n").encode("utf-8")
+    if function == "SYMBOL_SEARCH":
+        keyword = str(params.get("keywords", "")).upper()
+        rows = [f"{keyword}{suffix},{keyword.title()} {kind},Equity,United States,09:30,16:00,UTC-04,USD,{score}"
+                for suffix, kind, score in (("", "Inc", "1.0000"), (".LON", "Plc", "0.8000"), ("X", "Holdings", "0.6000"))]
+        return ("symbol,name,type,region,marketOpen,marketClose,timezone,currency,matchScore\r\n"
+                + "\r\n".join(rows) + "\r\n").encode("utf-8")
+    if function in JSON_FUNCTIONS:
+        return json.dumps(_json(function, params, anchor, random), indent=4).encode("utf-8")
+    interval = params.get("interval", "daily")
+    bars = _bars(symbol, interval, anchor, month=params.get("month") if interval not in FREQUENCIES else None)
+    column = params.get("series_type") or "close"
+    if not str(params.get("time_period") or 14).isdigit():
+        return INVALID_MESSAGE
+    indicator = _indicator(function, bars.assign(close=bars[column]) if column in bars else bars, params)
+    if indicator is None:
+        return INVALID_MESSAGE
+    return _to_csv(indicator, "time", interval)
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, directory=FIXTURE_DIR, latency=0.0, jitter=0.0, per_minute=None, throttle_every=0,
+                 synthesize=True, anchor=None):
+        """
+        Initialize a new instance of the ReplayAdapter class.
+
+        Args:
+            directory (str): The fixture directory (default is fixtures/alpha_vantage).
+            latency (float): Seconds every response is delayed (default is 0).
+            jitter (float): Extra random delay of up to this many seconds (default is 0).
+            per_minute (int, optional): Answer with a throttling message above this many calls per minute
+            (default is None, no limit).
+            throttle_every (int): Answer every n-th call with a throttling message (default is 0, never).
+            synthesize (bool): Build synthetic data for requests without a fixture, otherwise answer 404
+            (default is True).
+            anchor (str, optional): The day of the newest synthetic bar (default is today).
+
+        Usage:
+            client.session.mount(HOST_VANTAGE, ReplayAdapter(latency=0.3, per_minute=5))
+        """
+        super().__init__()
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.per_minute = per_minute
+        self.throttle_every = throttle_every
+        self.synthesize = synthesize
+        self.anchor = anchor
+        self.calls = 0
+        self.recent = deque()
+        self.random = np.random.RandomState(0)
+        self.lock = threading.Lock()
+
+    def _throttled(self):
+        with self.lock:
+            self.calls += 1
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] >= 60:
+                self.recent.popleft()
+            self.recent.append(now)
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            throttled = ((self.throttle_every and self.calls % self.throttle_every == 0)
+                         or (self.per_minute is not None and len(self.recent) > self.per_minute))
+        return delay, throttled
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """
+        Answer a prepared request from a fixture or synthetic data.
+
+        Returns:
+            requests.Response: The response of the request.
+        """
+        params = dict(parse_qsl(urlsplit(request.url).query))
+        delay, throttled = self._throttled()
+        if delay:
+            time.sleep(delay)
+        status_code = 200
+        path = fixture_path(params, self.directory)
+        if throttled:
+            content = THROTTLE_MESSAGE
+        elif os.path.exists(path):
+            with open(path, "rb") as file:
+                content = file.read()
+        elif self.synthesize:
+            content = synthetic_response(params, self.anchor)
+        else:
+            status_code, content = 404, b""
+        response = Response()
+        response.status_code = status_code
+        response._content = content
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json" if path.endswith(".json")
+                                                else "application/x-download"})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordAdapter(HTTPAdapter):
+    def __init__(self, directory=FIXTURE_DIR, **kwargs):
+        """
+        Initialize a new instance of the RecordAdapter class.
+
+        Args:
+            directory (str): The fixture directory (default is fixtures/alpha_vantage).
+            **kwargs: Arguments of requests.adapters.HTTPAdapter (e.g., max_retries).
+
+        Usage:
+            client.session.mount(HOST_VANTAGE, RecordAdapter())
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, request, **kwargs):
+        """
+        Send the request to the live API and save a successful response as a fixture.
+
+        Throttling and error messages come with status 200 as well, they are not saved, so a replay never serves
+        them as the recorded data.
+
+        Returns:
+            requests.Response: The response of the request.
+        """
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            params = dict(parse_qsl(urlsplit(request.url).query))
+            if is_error_payload(response.content):
+                logger.warning(f"Skipped recording {params.get('function')} response, the API answered with a "
+                               f"message: {response.content[:120]!r}")
+                return response
+            path = fixture_path(params, self.directory)
+            with open(path, "wb") as file:
+                file.write(response.content)
+            logger.info(f"Recorded {params.get('function')} response as {path}")
+        return response
+
+
+def use_replay(client, **options):
+    """
+    Mount a ReplayAdapter on the session of a client, so no request reaches the network.
+
+    The response caches and the rate limiter stay in front of the adapter. Clear the caches
+    (response_cache.clear(), history_cache.clear()) to measure the full data path, and lift the budgets with
+    rate_limiter.configure() to measure it without waiting.
+
+    Args:
+        client (AlphaVantageClient): The client to redirect (e.g., alpha_vantage).
+        **options: Arguments of ReplayAdapter.
+
+    Returns:
+        ReplayAdapter: The mounted adapter.
+    """
+    adapter = ReplayAdapter(**options)
+    client.session.mount(client.host, adapter)
+    return adapter
+
+
+def use_recording(client, directory=FIXTURE_DIR):
+    """
+    Mount a RecordAdapter on the session of a client, so every live response is saved as a fixture.
+
+    Args:
+        client (AlphaVantageClient): The client to record (e.g., alpha_vantage).
+        directory (str): The fixture directory (default is fixtures/alpha_vantage).
+
+    Returns:
+        RecordAdapter: The mounted adapter.
+    """
+    adapter = RecordAdapter(directory, max_retries=client.session.get_adapter(client.host).max_retries)
+    client.session.mount(client.host, adapter)
+    return adapter
@@ -14,13 +14,22 @@ Example:
     now_data = api_methods.now_data_report("AAPL")
     daily_avg = api_methods.daily_average("AAPL", interval="60min", month="2023-09")
     daily_details = api_methods.daily_detailed_report("AAPL", interval="60min", month="2023-09")
+    intraday = api_methods.intraday_range_report("AAPL", start="2023-03-15", end="2023-09", interval="60min")
     weekly_data = api_methods.weekly_report("AAPL", date="2023-09-09")
+    weekly_range = api_methods.weekly_report("AAPL", start="2019-06", end="2023")
     monthly_data = api_methods.monthly_report("AAPL", date="2023-09-09")
+    watchlist, errors = api_methods.weekly_report_many(["AAPL", "MSFT", "IBM"], date="2023")
 """
 
 import pandas as pd
+import requests
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from app_api_stocks_requests import ApiDataStocks
+from app_api_client import response_problem
+from app_api_csv import date_slice
+
+BULK_WORKERS = 10
 
 
 class ApiStocksMethods(ApiDataStocks):
@@ -67,7 +76,7 @@ class ApiStocksMethods(ApiDataStocks):
         if len(month.split('-')) == 3:
             y, m, d = month.split('-')
             report = self.daily_data_company(company, interval, month=(y + '-' + m)).set_index("timestamp")
-            report2 = report[report.index.str.startswith(month)]
+            report2 = date_slice(report, month, month)
             df_new = pd.DataFrame({'Data': month,
                                    'Open': report2['open'].mean(),
                                    'High': report2['high'].mean(),
@@ -101,39 +110,174 @@ class ApiStocksMethods(ApiDataStocks):
         if len(month.split('-')) == 3:
             y, m, d = month.split('-')
             report = self.daily_data_company(company, interval, month=(y + '-' + m)).set_index("timestamp")
-            return report[report.index.str.startswith(month)]
+            return date_slice(report, month, month)
         return "No Data For This Date"
 
-    def weekly_report(self, company, date=None):
+    def intraday_range_report(self, company, start, end=None, interval="60min"):
+        """
+        Generate an intraday report for a specific company's stock over several months.
+
+        The months are fetched concurrently. Months whose request failed, e.g. because the rate limiter refused
+        the call, are fetched again one by one, so every retry waits for its own call. Closed months are kept in
+        the history cache, so only the current month is downloaded again on later calls.
+
+        Args:
+            company (str): The company's stock symbol (e.g., "AAPL").
+            start (str): The first day of the report in the "YYYY-MM-DD or YYYY-MM" format.
+            end (str): The last day of the report in the "YYYY-MM-DD or YYYY-MM" format (default is None,
+            the current month).
+            interval (str): The time interval for data (default is "60min").
+
+        Returns:
+            pandas.DataFrame: A DataFrame with intraday stock market data, indexed by an ascending
+            DatetimeIndex.
+
+        Raises:
+            ValueError: If some months could not be fetched, the message names the months and the reasons.
+        """
+        if end is None:
+            end = self.date_now
+        months = [month.strftime("%Y-%m") for month in pd.period_range(start[:7], end[:7], freq="M")]
+
+        def fetch(month):
+            self.client.take_response()
+            frame = self.daily_data_company(company, interval, month)
+            problem = response_problem(self.client.take_response())
+            if frame is None and problem is None:
+                problem = "No response"
+            return frame, problem
+
+        with ThreadPoolExecutor(max_workers=BULK_WORKERS) as pool:
+            results = dict(zip(months, pool.map(fetch, months)))
+        for month in months:
+            if results[month][1] is not None:
+                results[month] = fetch(month)
+        missing = [f"{month} ({problem})" for month, (frame, problem) in results.items() if problem is not None]
+        if missing:
+            raise ValueError(f"No {interval} data of {company} for {', '.join(missing)}")
+        frames = [frame for frame, _ in results.values()]
+        frames = [frame for frame in frames if frame is not None and not frame.empty]
+        if not frames:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="timestamp"))
+        report = pd.concat(frames).set_index("timestamp").sort_index()
+        report = report[~report.index.duplicated(keep="last")]
+        return date_slice(report, start, end)
+
+    def weekly_report(self, company, date=None, start=None, end=None):
         """
                Generate a weekly report for a specific company's stock.
 
                Args:
                    company (str): The company's stock symbol (e.g., "AAPL").
                    date (str: The specific date for the report in the "YYYY-MM or YYYY" format (default is None).
+                   start (str, optional): The first date of the report in the "YYYY-MM-DD, YYYY-MM or YYYY"
+                   format (default is None).
+                   end (str, optional): The last date of the report in the same format (default is None).
 
                Returns:
                    pandas.DataFrame: A DataFrame containing weekly stock market data.
                """
         report = self.weekly_data_company(company).set_index("timestamp")
         if date is not None:
-            return report[report.index.str.startswith(date)]
-        else:
-            return report
+            report = date_slice(report, date, date)
+        return date_slice(report, start, end)
 
-    def monthly_report(self, company, date=None):
+    def monthly_report(self, company, date=None, start=None, end=None):
         """
                 Generate a monthly report for a specific company's stock.
 
                 Args:
                     company (str): The company's stock symbol (e.g., "AAPL").
                     date (str): The specific date for the report in the "YYYY-MM or YYYY" format (default is None).
+                    start (str, optional): The first date of the report in the "YYYY-MM-DD, YYYY-MM or YYYY"
+                    format (default is None).
+                    end (str, optional): The last date of the report in the same format (default is None).
 
                 Returns:
                     pandas.DataFrame: A DataFrame containing monthly stock market data.
                 """
         report = self.monthly_data_company(company).set_index("timestamp")
         if date is not None:
-            return report[report.index.str.startswith(date)]
+            report = date_slice(report, date, date)
+        return date_slice(report, start, end)
+
+    def _report_many(self, symbols, report, **kwargs):
+        frames = {}
+        errors = {}
+
+        def fetch(symbol):
+            # Every symbol is fetched on one thread, so the last response of the thread is the one of the symbol.
+            self.client.take_response()
+            try:
+                frame = report(symbol, **kwargs)
+            except requests.RequestException as error:
+                return symbol, None, f"{type(error).__name__}: {error}"
+            except (KeyError, AttributeError, ValueError, TypeError) as error:
+                return symbol, None, response_problem(self.client.take_response()) or f"{type(error).__name__}: {error}"
+            if frame is None or frame.empty:
+                return symbol, None, response_problem(self.client.take_response()) or "No data"
+            return symbol, frame, None
+
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols))
+        with ThreadPoolExecutor(max_workers=BULK_WORKERS) as pool:
+            for symbol, frame, error in pool.map(fetch, symbols):
+                if error is not None:
+                    errors[symbol] = error
+                else:
+                    frames[symbol] = frame
+        if frames:
+            report_many = pd.concat(frames, names=["symbol", "timestamp"])
         else:
-            return report
+            report_many = pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=["symbol", "timestamp"]))
+        return report_many, errors
+
+    def now_data_report_many(self, symbols):
+        """
+        Generate a report with the latest stock market data for many companies at once.
+
+        The symbols are fetched concurrently within the API call budget.
+
+        Args:
+            symbols (list): The companies' stock symbols (e.g., ["AAPL", "MSFT"]).
+
+        Returns:
+            tuple: A pandas.DataFrame indexed by (symbol, timestamp) with one row per company, and a dict
+            of {symbol: error message} for the symbols without data.
+        """
+        def now_report(company):
+            report = self.now_data_report(company)
+            report["timestamp"] = pd.to_datetime(report["latestDay"])
+            return report.drop(["symbol", "latestDay"], axis=1).set_index("timestamp")
+        return self._report_many(symbols, now_report)
+
+    def weekly_report_many(self, symbols, date=None):
+        """
+        Generate weekly reports for many companies at once.
+
+        The symbols are fetched concurrently within the API call budget.
+
+        Args:
+            symbols (list): The companies' stock symbols (e.g., ["AAPL", "MSFT"]).
+            date (str): The specific date for the reports in the "YYYY-MM or YYYY" format (default is None).
+
+        Returns:
+            tuple: A long format pandas.DataFrame indexed by (symbol, timestamp), and a dict
+            of {symbol: error message} for the symbols without data.
+        """
+        return self._report_many(symbols, self.weekly_report, date=date)
+
+    def monthly_report_many(self, symbols, date=None):
+        """
+        Generate monthly reports for many companies at once.
+
+        The symbols are fetched concurrently within the API call budget.
+
+        Args:
+            symbols (list): The companies' stock symbols (e.g., ["AAPL", "MSFT"]).
+            date (str): The specific date for the reports in the "YYYY-MM or YYYY" format (default is None).
+
+        Returns:
+            tuple: A long format pandas.DataFrame indexed by (symbol, timestamp), and a dict
+            of {symbol: error message} for the symbols without data.
+        """
+        return self._report_many(symbols, self.monthly_report, date=date)
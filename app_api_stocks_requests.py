@@ -10,15 +10,13 @@ Usage:
     Create an instance of ApiDataStocks and use its methods to retrieve stock market data.
 """
 
-import requests
-import os
 import logging
 import pandas as pd
 import json
 from datetime import datetime
-from api_info import HOST_VANTAGE, api_key
-
-HOST_VANTAGE = HOST_VANTAGE
+from api_info import api_key
+from app_api_client import alpha_vantage
+from app_api_csv import read_api_csv
 
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', None)
@@ -40,10 +38,14 @@ class ApiDataStocks:
 
        This class provides methods for retrieving and processing stock market data.
 
+       Set float32 to True to keep the price columns as float32.
+
        Usage:
            api_data = ApiDataStocks()
        """
         self.apikey_aplha = api_key
+        self.float32 = False
+        self.client = alpha_vantage
         self.date_now = f"{datetime.now().year}" + "-" + f"{datetime.now().month}".zfill(2)
 
     def gainers_losers(self):
@@ -63,7 +65,7 @@ class ApiDataStocks:
         payload = {"apikey": self.apikey_aplha,
                    "function": "TOP_GAINERS_LOSERS"
                    }
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
             gl = json.loads(r.text)
             logger.info(f"Gauta Gainers-Losers data. Status kodas {r.status_code}")
@@ -94,7 +96,7 @@ class ApiDataStocks:
         payload = {"apikey": self.apikey_aplha,
                    "function": "MARKET_STATUS"
                    }
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
             status = json.loads(r.text)
             logger.info(f"Gauta Open-Close data. Status kodas {r.status_code}")
@@ -129,13 +131,9 @@ class ApiDataStocks:
                    "keywords": keyword,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            result = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            result = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Search data. Status kodas {r.status_code}")
             return result
         else:
@@ -162,13 +160,9 @@ class ApiDataStocks:
                    "symbol": company,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            sdata_now = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sdata_now = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stock Now data. Status kodas {r.status_code}")
             return sdata_now
         else:
@@ -201,14 +195,10 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
             print("CSV data downloaded successfully.")
-            sdata_daily = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sdata_daily = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stock Daily data. Status kodas {r.status_code}")
             return sdata_daily
         else:
@@ -229,9 +219,8 @@ class ApiDataStocks:
                 Exception: If the API request fails or returns an error status code.
 
             This method sends a GET request to an external financial data API to fetch daily stock data
-            for the specified company. The retrieved data is in CSV format and is temporarily saved to
-            a local file for processing. Upon successful retrieval, the data is read into a pandas DataFrame,
-            and the temporary file is removed. If the API request fails, an error message is logged.
+            for the specified company. The retrieved data is in CSV format and is parsed in memory into
+            a pandas DataFrame. If the API request fails, an error message is logged.
             """
         endpoint = "/query"
         payload = {"apikey": self.apikey_aplha,
@@ -239,14 +228,10 @@ class ApiDataStocks:
                    "symbol": company,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
             print("CSV data downloaded successfully.")
-            sdata_daily = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sdata_daily = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stock Daily data. Status kodas {r.status_code}")
             return sdata_daily
         else:
@@ -273,13 +258,9 @@ class ApiDataStocks:
                    "symbol": company,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            sdata_weekly = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sdata_weekly = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stock Weekly data. Status kodas {r.status_code}")
             return sdata_weekly
         else:
@@ -306,13 +287,9 @@ class ApiDataStocks:
                    "symbol": company,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            sdata_monthly = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sdata_monthly = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stock Monthly data. Status kodas {r.status_code}")
             return sdata_monthly
         else:
@@ -357,13 +334,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            sma = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            sma = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta SMA data. Status kodas {r.status_code}")
             return sma
         else:
@@ -408,13 +381,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            ema = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            ema = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta EMA data. Status kodas {r.status_code}")
             return ema
         else:
@@ -479,13 +448,9 @@ class ApiDataStocks:
                    "slowdmatype": slowdma,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            stoch = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            stoch = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta Stoch data. Status kodas {r.status_code}")
             return stoch
         else:
@@ -530,13 +495,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            rsi = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            rsi = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta RSI data. Status kodas {r.status_code}")
             return rsi
         else:
@@ -577,13 +538,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            adx = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            adx = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta ADX data. Status kodas {r.status_code}")
             return adx
         else:
@@ -624,13 +581,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            cci = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            cci = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta CCI data. Status kodas {r.status_code}")
             return cci
         else:
@@ -671,13 +624,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            aroon = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            aroon = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta AROON data. Status kodas {r.status_code}")
             return aroon
         else:
@@ -736,13 +685,9 @@ class ApiDataStocks:
                    "matype": matype,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            bbands = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            bbands = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta BBANDS data. Status kodas {r.status_code}")
             return bbands
         else:
@@ -778,13 +723,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            ad = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            ad = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta AD data. Status kodas {r.status_code}")
             return ad
         else:
@@ -820,13 +761,9 @@ class ApiDataStocks:
                    "month": month,
                    "outputsize": "full",
                    "datatype": "csv"}
-        r = requests.get(HOST_VANTAGE + endpoint, params=payload)
+        r = self.client.get(endpoint, params=payload)
         if r.status_code in range(200, 400):
-            temp_csv_path = "temp_data.csv"
-            with open(temp_csv_path, 'wb') as f:
-                f.write(r.content)
-            obv = pd.read_csv(temp_csv_path)
-            os.remove(temp_csv_path)
+            obv = read_api_csv(r.content, payload["function"], float32=self.float32)
             logger.info(f"Gauta OBV data. Status kodas {r.status_code}")
             return obv
         else:
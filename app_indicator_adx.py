@@ -10,19 +10,29 @@ Usage:
     1. Instantiate an ADXPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input parameters.
     3. Click the "Submit" button to fetch and display the ADX chart.
+       Or click "Period Sweep" to see the ADX of every period from 2 to 200 as a heatmap.
+       With several intervals (e.g., daily,weekly,monthly) the ADX of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, and data points.
     5. The "Close Window" button closes the popup window.
+
+The charts are built and rasterized on a worker thread by a ChartRenderer, so the window stays responsive
+while they are drawn, and a new submit replaces a chart that is still being drawn.
 """
 
 import tkinter as tk
 from tkmacosx import Button as MacButton
 import re
-import mplfinance as mpf
 import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from matplotlib.dates import DateFormatter
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_render import ChartRenderer
+from app_indicator_sweep import sweep, sweep_figure, SWEEP_PERIODS
+from app_api_csv import date_slice, date_range
+from app_api_async import AsyncApiData, run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class ADXPopupWindow(tk.Toplevel):
@@ -40,8 +50,9 @@ class ADXPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -53,12 +64,15 @@ class ADXPopupWindow(tk.Toplevel):
         self.chart_frame_cci = tk.Frame(self)
         self.chart_frame_stock.place(x=530, y=10, width=1050, height=515)
         self.chart_frame_cci.place(x=530, y=526, width=1050, height=350)
+        self.render_stock = ChartRenderer(self.chart_frame_stock, figsize=(12, 6), on_error=self.on_chart_error)
+        self.render_adx = ChartRenderer(self.chart_frame_cci, figsize=(10, 5), on_error=self.on_chart_error)
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'ADX - Average Directional Movement Index\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -112,6 +126,9 @@ class ADXPopupWindow(tk.Toplevel):
         submit_button = MacButton(self, text="Submit", font=self.font, justify="center", command=self.refresh_results)
         close_button.place(x=150, y=765, width=266, height=55)
         submit_button.place(x=150, y=695, width=266, height=55)
+        sweep_button = MacButton(self, text="Period Sweep", font=self.font, justify="center",
+                                 command=self.sweep_results)
+        sweep_button.place(x=150, y=830, width=266, height=40)
 
     def on_entry_focus_in2(self, event):
         if self.entry_var2.get() == "Data Points":
@@ -145,98 +162,95 @@ class ADXPopupWindow(tk.Toplevel):
         if not self.entry_var5.get():
             self.entry_var5.set("Equity or Currency pair")
 
+    def on_chart_error(self, error):
+        self.label_message['fg'] = "red"
+        self.label_message['text'] = 'No Data Found\n Check Entries' if isinstance(error, KeyError) else 'Invalid Entry'
+
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
+        self.render_stock.submit(self.draw_chart_stock, df_data)
+
+    @staticmethod
+    def draw_chart_stock(panel, df_data):
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = panel.subplots()
+        panel.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        panel.draw()
 
     def display_chart_adx(self, df):
         print(df)
+        self.render_adx.submit(self.draw_chart_adx, df)
+
+    @staticmethod
+    def draw_chart_adx(panel, df):
         df.sort_values('time', ascending=True, inplace=True)
         df['time'] = pd.to_datetime(df['time'])
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(df['time'], df['ADX'], color='blue', label='CCI')
+        ax = panel.subplots()
+        panel.line(ax, 'ADX', df['time'], df['ADX'], color='blue', label='CCI')
         ax.grid(True)
-        ax.legend()
         ax.set_title('ADX Chart')
-        ymin, ymax = ax.get_ylim()
-        ax.set_ylim(ymin, ymax)
         max_visible_ticks = 8
         ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
-        chart_frame = self.chart_frame_cci
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        panel.draw(legend=True)
 
-    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
-        df_adx = self.stock_data.adx(symbol=symbol, interval=interval, timep=timep)
-        df_interval = self.method.monthly_report(company=symbol)
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        self.render_adx.submit(self.draw_chart_timeframes, overlay)
 
-        df_adx_filtered = df_adx[(df_adx['time'] >= start_date) & (df_adx['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    @staticmethod
+    def draw_chart_timeframes(panel, overlay):
+        timeframe_figure(None, overlay, 'ADX', fig=panel.clear())
 
-        return df_adx_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
+        return (self.async_method.adx(symbol=symbol, interval=interval, timep=timep, start=start_date, end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
             timep = int(self.entry_var2.get().strip())
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("ADX", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_adx = self.stock_data.adx(symbol=equity, interval=interval, timep=timep)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_adx(df_adx)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_adx(df_adx)
-                    return
+                df_adx, df_data = yield (self.async_method.adx(symbol=equity, interval=interval, timep=timep),
+                                         self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_adx(df_adx)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_adx, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                         start_date=start_date, end_date=end_date,
-                                                                         timep=timep)
+                    df_adx, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                               start_date=start_date, end_date=end_date,
+                                                                               timep=timep)
                     self.display_chart_stock(df_interval)
                     self.display_chart_adx(df_adx)
                     return
                 else:
-                    df_adx = self.stock_data.adx(symbol=equity, interval=interval, month=date, timep=timep)
-                    df_adx = df_adx[df_adx['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_adx(df_adx)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_adx(df_adx)
-                        return
+                    df_adx, df_data = yield (self.async_method.adx(symbol=equity, interval=interval, month=date,
+                                                                   timep=timep, start=date, end=date),
+                                             self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_adx(df_adx)
+                    return
             else:
                 raise ValueError
         except ValueError:
@@ -245,3 +259,42 @@ class ADXPopupWindow(tk.Toplevel):
         except KeyError:
             self.label_message['fg'] = "red"
             self.label_message['text'] = 'No Data Found\n Check Entries'
+
+    def display_chart_sweep(self, grid):
+        self.render_adx.submit(self.draw_chart_sweep, grid)
+
+    @staticmethod
+    def draw_chart_sweep(panel, grid):
+        sweep_figure(grid, 'ADX', fig=panel.clear())
+
+    @background_task
+    def sweep_results(self):
+        try:
+            self.label_message['fg'] = "#0E82D3"
+            self.label_message['text'] = 'Enter Information and Submit to See Results'
+            valid_intervals = {'daily', 'weekly', 'monthly'}
+            equity = self.entry_var5.get().strip().upper()
+            interval = self.entry_var4.get().strip()
+            if interval not in valid_intervals:
+                raise ValueError
+            date = self.entry_var3.get().strip()
+            prices = yield self.async_method.prices(equity, interval)
+            grid = yield run_in_thread(sweep, "ADX", prices, SWEEP_PERIODS)
+            if date != "Date":
+                date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
+                if not re.match(date_pattern, date):
+                    raise ValueError
+                if "/" in date:
+                    start_date, end_date = date.split("/")
+                    grid = date_slice(grid, start_date, end_date)
+                else:
+                    grid = date_slice(grid, date, date)
+            if grid.dropna(how="all").empty:
+                raise KeyError
+            self.display_chart_sweep(grid)
+        except ValueError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'Invalid Entry'
+        except KeyError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'No Data Found\n Check Entries'
@@ -10,19 +10,25 @@ Usage:
     1. Instantiate an AROONPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input parameters.
     3. Click the "Submit" button to fetch and display the Aroon Indicator chart.
+       With several intervals (e.g., daily,weekly,monthly) the Aroon Indicator of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, data points, and chart type.
     5. The "Close Window" button closes the popup window.
 """
 
 import tkinter as tk
 from tkmacosx import Button as MacButton
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import matplotlib.ticker as ticker
-import mplfinance as mpf
 import re
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_chart import ChartPanel
+from app_indicator_signals import SIGNALS, evaluate, plot_signals
+from app_api_csv import date_range
+from app_api_async import AsyncApiData
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class AROONPopupWindow(tk.Toplevel):
@@ -40,8 +46,9 @@ class AROONPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -53,12 +60,15 @@ class AROONPopupWindow(tk.Toplevel):
         self.chart_frame_aroon = tk.Frame(self)
         self.chart_frame_stock.place(x=530, y=10, width=1050, height=515)
         self.chart_frame_aroon.place(x=530, y=526, width=1050, height=350)
+        self.panel_stock = ChartPanel(self.chart_frame_stock, figsize=(12, 6))
+        self.panel_aroon = ChartPanel(self.chart_frame_aroon, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'AROON - Trend Indicator\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -172,108 +182,89 @@ class AROONPopupWindow(tk.Toplevel):
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = self.panel_stock.subplots()
+        self.panel_stock.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_stock.draw()
 
     def display_chart_aroon(self, df):
         df.sort_values('time', ascending=True, inplace=True)
-        chart_frame = self.chart_frame_aroon
         if self.checkbox_state1.get() == 1:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.plot(df['time'], df['Aroon Up'], color='green', label='Aroon Up')
-            ax.plot(df['time'], df['Aroon Down'], color='red', label='Aroon Down')
-            ax.legend()
+            ax = self.panel_aroon.subplots()
+            self.panel_aroon.line(ax, 'Aroon Up', df['time'], df['Aroon Up'], color='green', label='Aroon Up')
+            self.panel_aroon.line(ax, 'Aroon Down', df['time'], df['Aroon Down'], color='red', label='Aroon Down')
+            plot_signals(ax, evaluate(df, SIGNALS["AROON"]), panel=self.panel_aroon)
             ax.set_title('Aroon Indicator Dual-Line Chart')
             ax.set_ylabel('Aroon Values')
             ax.grid(True)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(ticker.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self.panel_aroon.draw(legend=True)
         if self.checkbox_state2.get() == 1:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.fill_between(df['time'], df['Aroon Up'], df['Aroon Down'], color='green', alpha=0.5, label='Aroon Area')
-            ax.legend()
+            ax = self.panel_aroon.subplots()
+            self.panel_aroon.fill(ax, 'Aroon Area', df['time'], df['Aroon Up'], df['Aroon Down'], color='green',
+                                  alpha=0.5, label='Aroon Area')
             ax.set_title('Aroon Indicator Combined Area Chart')
             ax.set_ylabel('Aroon Values')
             ax.grid(True)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(ticker.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self.panel_aroon.draw(legend=True)
 
-    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
-        df_aroon = self.stock_data.aroon(symbol=symbol, interval=interval, timep=timep)
-        df_interval = self.method.monthly_report(company=symbol)
-
-        df_aroon_filtered = df_aroon[(df_aroon['time'] >= start_date) & (df_aroon['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        timeframe_figure(None, overlay, 'AROON', fig=self.panel_aroon.clear())
+        self.panel_aroon.draw()
 
-        return df_aroon_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
+        return (self.async_method.aroon(symbol=symbol, interval=interval, timep=timep, start=start_date, end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
             timep = int(self.entry_var2.get().strip())
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("AROON", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_aroon = self.stock_data.aroon(symbol=equity, interval=interval, timep=timep)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_aroon(df_aroon)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_aroon(df_aroon)
-                    return
+                df_aroon, df_data = yield (self.async_method.aroon(symbol=equity, interval=interval, timep=timep),
+                                           self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_aroon(df_aroon)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_aroon, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                           start_date=start_date, end_date=end_date,
-                                                                           timep=timep)
+                    df_aroon, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                                 start_date=start_date,
+                                                                                 end_date=end_date, timep=timep)
                     self.display_chart_stock(df_interval)
                     self.display_chart_aroon(df_aroon)
                     return
                 else:
-                    df_aroon = self.stock_data.aroon(symbol=equity, interval=interval, month=date, timep=timep)
-                    df_aroon = df_aroon[df_aroon['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_aroon(df_aroon)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_aroon(df_aroon)
-                        return
+                    df_aroon, df_data = yield (self.async_method.aroon(symbol=equity, interval=interval, month=date,
+                                                                       timep=timep, start=date, end=date),
+                                               self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_aroon(df_aroon)
+                    return
             else:
                 raise ValueError
         except ValueError:
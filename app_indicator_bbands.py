@@ -11,10 +11,15 @@ Usage:
     1. Instantiate a BBANDSPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input BBANDS parameters.
     3. Click the "Submit" button to fetch and display the BBANDS chart.
+       With several intervals (e.g., daily,weekly,monthly) the BBANDS of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, and more.
     5. Choose between Line Chart and Area Chart display using checkboxes.
     6. The "Close Window" button closes the popup window.
 
+The charts are built and rasterized on a worker thread by a ChartRenderer, so the window stays responsive
+while they are drawn, and a new submit replaces a chart that is still being drawn.
+
 The class provides a user-friendly interface for exploring Bollinger Bands (BBANDS) charts
 with customized parameters and chart type.
 """
@@ -22,13 +27,17 @@ with customized parameters and chart type.
 import tkinter as tk
 from tkmacosx import Button as MacButton
 import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import matplotlib.ticker as ticker
-import mplfinance as mpf
 import re
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_render import ChartRenderer
+from app_indicator_signals import SIGNALS, evaluate, plot_signals
+from app_api_csv import date_range
+from app_api_async import AsyncApiData
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class BBANDSPopupWindow(tk.Toplevel):
@@ -46,8 +55,9 @@ class BBANDSPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -59,6 +69,8 @@ class BBANDSPopupWindow(tk.Toplevel):
         self.chart_frame_bbands = tk.Frame(self)
         self.chart_frame_stock.place(x=720, y=10, width=900, height=515)
         self.chart_frame_bbands.place(x=720, y=526, width=900, height=350)
+        self.render_stock = ChartRenderer(self.chart_frame_stock, figsize=(12, 6), on_error=self.on_chart_error)
+        self.render_bbands = ChartRenderer(self.chart_frame_bbands, figsize=(10, 5), on_error=self.on_chart_error)
 
         # BUTTON
         close_button = MacButton(self, text="Close Window", font=self.font, justify="center", command=self.destroy)
@@ -70,7 +82,8 @@ class BBANDSPopupWindow(tk.Toplevel):
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'BBANDS - Bollinger Bands\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -259,80 +272,84 @@ class BBANDSPopupWindow(tk.Toplevel):
         elif self.checkbox_state2.get() == 0:
             self.checkbox1.config(state=tk.NORMAL)
 
+    def on_chart_error(self, error):
+        self.label_message['fg'] = "red"
+        self.label_message['text'] = 'No Data Found\n Check Entries' if isinstance(error, KeyError) else 'Invalid Entry'
+
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
+        self.render_stock.submit(self.draw_chart_stock, df_data)
+
+    @staticmethod
+    def draw_chart_stock(panel, df_data):
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(10, 5))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = panel.subplots()
+        panel.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-    def display_chart_bbands(self, df):
-        chart_frame = self.chart_frame_bbands
-        if self.checkbox_state1.get() == 1:
+        panel.draw()
+
+    def display_chart_bbands(self, df, df_data=None):
+        line, area = self.checkbox_state1.get() == 1, self.checkbox_state2.get() == 1
+        if line or area:
+            self.render_bbands.submit(self.draw_chart_bbands, df, df_data, line, area)
+
+    @staticmethod
+    def draw_chart_bbands(panel, df, df_data, line, area):
+        if line:
             df.sort_values('time', ascending=True, inplace=True)
             df['time'] = pd.to_datetime(df['time'])
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.plot(df['time'], df['Real Lower Band'], color='blue', label='Real Lower Band')
-            ax.plot(df['time'], df['Real Middle Band'], color='orange', label='Real Middle Band')
-            ax.plot(df['time'], df['Real Upper Band'], color='purple', label='Real Upper Band')
+            ax = panel.subplots()
+            panel.line(ax, 'Real Lower Band', df['time'], df['Real Lower Band'], color='blue',
+                       label='Real Lower Band')
+            panel.line(ax, 'Real Middle Band', df['time'], df['Real Middle Band'], color='orange',
+                       label='Real Middle Band')
+            panel.line(ax, 'Real Upper Band', df['time'], df['Real Upper Band'], color='purple',
+                       label='Real Upper Band')
+            if df_data is not None:
+                df_close = df.join(df_data['close'], on='time')
+                panel.line(ax, 'Close', df_close['time'], df_close['close'], color='grey', linewidth=1, label='Close')
+                plot_signals(ax, evaluate(df_close, SIGNALS["BBANDS"]), column="close", panel=panel)
             ax.grid(True)
-            ax.legend()
             ax.set_title('BBANDS Chart')
             ax.set_ylabel('BBANDS Values')
-            ymin, ymax = ax.get_ylim()
-            ax.set_ylim(ymin, ymax)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        if self.checkbox_state2.get() == 1:
+            panel.draw(legend=True)
+        if area:
             df.sort_values('time', ascending=True, inplace=True)
             df['time'] = pd.to_datetime(df['time'])
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.fill_between(df['time'], df['Real Lower Band'], df['Real Middle Band'],
-                            df['Real Upper Band'], color='blue', alpha=0.5)
-            ax.legend()
+            ax = panel.subplots()
+            panel.fill(ax, 'BBANDS Area', df['time'], df['Real Lower Band'], df['Real Middle Band'],
+                       color='blue', alpha=0.5)
             ax.set_title('BBANDS Indicator Area Chart')
             ax.set_ylabel('BBANDS Values')
             ax.grid(True)
-            ymin, ymax = ax.get_ylim()
-            ax.set_ylim(ymin, ymax)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(ticker.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            panel.draw(legend=True)
 
-    def fetch_data_for_date_range(self, equity, interval, start_date, end_date, pricet,
-                                  timep, matype, nbdevdn, nbdevup):
-        df_bbands = self.stock_data.bbands(symbol=equity, interval=interval, series=pricet, timep=timep, matype=matype,
-                                           nbdevdn=nbdevdn, nbdevup=nbdevup)
-        df_interval = self.method.monthly_report(company=equity)
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        self.render_bbands.submit(self.draw_chart_timeframes, overlay)
 
-        df_bbands_filtered = df_bbands[(df_bbands['time'] >= start_date) & (df_bbands['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    @staticmethod
+    def draw_chart_timeframes(panel, overlay):
+        timeframe_figure(None, overlay, 'BBANDS', fig=panel.clear())
 
-        return df_bbands_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, equity, interval, start_date, end_date, pricet,
+                                  timep, matype, nbdevdn, nbdevup):
+        return (self.async_method.bbands(symbol=equity, interval=interval, series=pricet, timep=timep, matype=matype,
+                                         nbdevdn=nbdevdn, nbdevup=nbdevup, start=start_date, end=end_date),
+                self.async_method.report(equity, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             price_set = {'close', 'open', 'low', 'high'}
             matype = self.entry_var10.get().strip()
             nbdevdn = self.entry_var9.get().strip()
@@ -340,51 +357,50 @@ class BBANDSPopupWindow(tk.Toplevel):
             timep = int(self.entry_var7.get().strip())
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             pricet = self.entry_var6.get().strip()
             if pricet.lower() not in price_set:
                 raise ValueError
             date = self.entry_var3.get().strip()
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("BBANDS", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep, series_type=pricet,
+                                                                   nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_bbands = self.stock_data.bbands(symbol=equity, interval=interval, series=pricet, timep=timep,
-                                                   matype=matype, nbdevdn=nbdevdn, nbdevup=nbdevup, month=date)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_bbands(df_bbands)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_bbands(df_bbands)
-                    return
+                df_bbands, df_data = yield (self.async_method.bbands(symbol=equity, interval=interval, series=pricet,
+                                                                     timep=timep, matype=matype, nbdevdn=nbdevdn,
+                                                                     nbdevup=nbdevup),
+                                            self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_bbands(df_bbands, df_data)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_bbands, df_interval = self.fetch_data_for_date_range(equity=equity, interval=interval,
-                                                                            start_date=start_date, end_date=end_date,
-                                                                            pricet=pricet, timep=timep, matype=matype,
-                                                                            nbdevdn=nbdevdn, nbdevup=nbdevup)
+                    df_bbands, df_interval = yield self.fetch_data_for_date_range(equity=equity, interval=interval,
+                                                                                  start_date=start_date,
+                                                                                  end_date=end_date, pricet=pricet,
+                                                                                  timep=timep, matype=matype,
+                                                                                  nbdevdn=nbdevdn, nbdevup=nbdevup)
                     self.display_chart_stock(df_interval)
-                    self.display_chart_bbands(df_bbands)
+                    self.display_chart_bbands(df_bbands, df_interval)
                     return
                 else:
-                    df_bbands = self.stock_data.bbands(symbol=equity, interval=interval, series=pricet, timep=timep,
-                                                       matype=matype, nbdevdn=nbdevdn, nbdevup=nbdevup)
-                    df_bbands = df_bbands[df_bbands['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_bbands(df_bbands)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_bbands(df_bbands)
-                        return
+                    df_bbands, df_data = yield (self.async_method.bbands(symbol=equity, interval=interval,
+                                                                         series=pricet, timep=timep, matype=matype,
+                                                                         nbdevdn=nbdevdn, nbdevup=nbdevup, start=date,
+                                                                         end=date),
+                                                self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_bbands(df_bbands, df_data)
+                    return
             else:
                 raise ValueError
         except ValueError:
@@ -0,0 +1,190 @@
+"""
+app_indicator_cache.py
+
+This module keeps computed indicator outputs in memory, so redrawing a chart or opening another window on the
+same symbol does not compute the same indicator again.
+
+An output is stored under its price series (symbol, interval, month and the interval its bars are downloaded in),
+the indicator and its parameters, and it is only valid for one version of the series: a content hash of its
+timestamps and OHLCV values. When the series changes, for example when a new bar is merged into it, the next
+lookup sees another version and every output of the old version is dropped at once. The cache is bounded by bytes
+with least recently used eviction and counts its hits, misses, evictions and invalidations.
+
+Classes:
+    IndicatorCache: A process-wide in-memory LRU cache of indicator outputs bounded by bytes.
+
+Functions:
+    series_version: The content hash of a price series.
+
+Usage:
+    The shared `indicator_cache` instance is used by every LocalIndicators, so all the indicator windows share
+    their results.
+
+Example:
+    version = series_version(prices)
+    df = indicator_cache.get(("IBM", "weekly", None, "weekly"), version, "RSI", {"time_period": 14})
+    if df is None:
+        df = compute_indicator("RSI", prices, time_period=14)
+        indicator_cache.put(("IBM", "weekly", None, "weekly"), version, "RSI", {"time_period": 14}, df)
+    print(indicator_cache.stats())
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+INDICATOR_MAX_BYTES = 64 * 1024 * 1024
+
+
+def series_version(prices):
+    """
+    The content hash of a price series.
+
+    Args:
+        prices (pandas.DataFrame): The OHLCV data indexed by timestamp.
+
+    Returns:
+        str: A hex digest that changes with any timestamp, value or column of the series.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(map(str, prices.columns)).encode())
+    digest.update(np.asarray(prices.index, dtype="datetime64[ns]").tobytes())
+    digest.update(np.ascontiguousarray(prices.to_numpy(dtype="float64")).tobytes())
+    return digest.hexdigest()
+
+
+def _size(value):
+    if isinstance(value, tuple):
+        return sum(_size(part) for part in value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    return 0
+
+
+class IndicatorCache:
+    def __init__(self, max_bytes=INDICATOR_MAX_BYTES):
+        """
+        Initialize a new instance of the IndicatorCache class.
+
+        Args:
+            max_bytes (int): The memory budget of the stored outputs (default is 64 MB).
+
+        Usage:
+            cache = IndicatorCache(max_bytes=16 * 1024 * 1024)
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(series, function, params):
+        """
+        Build the cache key of an output.
+
+        Args:
+            series (tuple): The symbol, interval and month of the price series and the interval its bars are
+            downloaded in.
+            function (str): The indicator (e.g., "RSI").
+            params (dict): The parameters of the indicator.
+
+        Returns:
+            tuple: The series, the indicator and the sorted (name, value) pairs of the parameters.
+        """
+        return series, function, tuple(sorted((name, str(value)) for name, value in params.items()))
+
+    def _check_version(self, series, version):
+        # A new version of a series drops every output of the previous one.
+        if self.versions.get(series, version) != version:
+            for key in [key for key in self.entries if key[0] == series]:
+                self._remove(key)
+                self.invalidations += 1
+        self.versions[series] = version
+
+    def get(self, series, version, function, params):
+        """
+        Read an output from memory.
+
+        Args:
+            series (tuple): The symbol, interval and month of the price series and the interval its bars are
+            downloaded in.
+            version (str): The series_version() of the prices.
+            function (str): The indicator (e.g., "RSI").
+            params (dict): The parameters of the indicator.
+
+        Returns:
+            pandas.DataFrame or tuple or None: The stored output, or None if it is missing.
+        """
+        key = self.key(series, function, params)
+        with self.lock:
+            self._check_version(series, version)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, series, version, function, params, value):
+        """
+        Save an output in memory, evicting the least recently used outputs over the memory budget.
+
+        Args:
+            series (tuple): The symbol, interval and month of the price series and the interval its bars are
+            downloaded in.
+            version (str): The series_version() of the prices the output was computed from.
+            function (str): The indicator (e.g., "RSI").
+            params (dict): The parameters of the indicator.
+            value (pandas.DataFrame or tuple): The output, which must not be modified afterwards.
+        """
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        key = self.key(series, function, params)
+        with self.lock:
+            self._check_version(series, version)
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        value, size = self.entries.pop(key)
+        self.size -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Report the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, invalidations, stored entries and stored bytes.
+        """
+        with self.lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "invalidations": self.invalidations,
+                    "entries": len(self.entries),
+                    "bytes": self.size}
+
+
+indicator_cache = IndicatorCache()
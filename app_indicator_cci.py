@@ -10,6 +10,9 @@ Usage:
     1. Instantiate a CCIPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input CCI parameters.
     3. Click the "Submit" button to fetch and display the CCI chart.
+       Or click "Period Sweep" to see the CCI of every period from 2 to 200 as a heatmap.
+       With several intervals (e.g., daily,weekly,monthly) the CCI of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, and month.
     5. The "Close Window" button closes the popup window.
 
@@ -20,12 +23,16 @@ with customized parameters.
 import tkinter as tk
 from tkmacosx import Button as MacButton
 import re
-import mplfinance as mpf
 import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from matplotlib.dates import DateFormatter
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_chart import ChartPanel
+from app_indicator_sweep import sweep, sweep_figure, SWEEP_PERIODS
+from app_api_csv import date_slice, date_range
+from app_api_async import AsyncApiData, run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class CCIPopupWindow(tk.Toplevel):
@@ -43,8 +50,9 @@ class CCIPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -56,12 +64,15 @@ class CCIPopupWindow(tk.Toplevel):
         self.chart_frame_cci = tk.Frame(self)
         self.chart_frame_stock.place(x=530, y=10, width=1050, height=515)
         self.chart_frame_cci.place(x=530, y=526, width=1050, height=350)
+        self.panel_stock = ChartPanel(self.chart_frame_stock, figsize=(12, 6))
+        self.panel_cci = ChartPanel(self.chart_frame_cci, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'CCI - Commodity Chanel Index\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -115,6 +126,9 @@ class CCIPopupWindow(tk.Toplevel):
         submit_button = MacButton(self, text="Submit", font=self.font, justify="center", command=self.refresh_results)
         close_button.place(x=150, y=765, width=266, height=55)
         submit_button.place(x=150, y=695, width=266, height=55)
+        sweep_button = MacButton(self, text="Period Sweep", font=self.font, justify="center",
+                                 command=self.sweep_results)
+        sweep_button.place(x=150, y=830, width=266, height=40)
 
     def on_entry_focus_in2(self, event):
         if self.entry_var2.get() == "Data Points":
@@ -151,94 +165,76 @@ class CCIPopupWindow(tk.Toplevel):
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = self.panel_stock.subplots()
+        self.panel_stock.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_stock.draw()
 
     def display_chart_cci(self, df):
         df.sort_values('time', ascending=True, inplace=True)
         df['time'] = pd.to_datetime(df['time'])
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(df['time'], df['CCI'], color='blue', label='CCI')
+        ax = self.panel_cci.subplots()
+        self.panel_cci.line(ax, 'CCI', df['time'], df['CCI'], color='blue', label='CCI')
         ax.grid(True)
-        ax.legend()
         ax.set_title('CCI Chart')
-        ymin, ymax = ax.get_ylim()
-        ax.set_ylim(ymin, ymax)
         max_visible_ticks = 8
         ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
-        chart_frame = self.chart_frame_cci
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_cci.draw(legend=True)
 
-    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
-        df_cci = self.stock_data.cci(symbol=symbol, interval=interval, timep=timep)
-        df_interval = self.method.monthly_report(company=symbol)
-
-        df_cci_filtered = df_cci[(df_cci['time'] >= start_date) & (df_cci['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        timeframe_figure(None, overlay, 'CCI', fig=self.panel_cci.clear())
+        self.panel_cci.draw()
 
-        return df_cci_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep):
+        return (self.async_method.cci(symbol=symbol, interval=interval, timep=timep, start=start_date, end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
             timep = int(self.entry_var2.get().strip())
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("CCI", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_cci = self.stock_data.cci(symbol=equity, interval=interval, timep=timep)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_cci(df_cci)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_cci(df_cci)
-                    return
+                df_cci, df_data = yield (self.async_method.cci(symbol=equity, interval=interval, timep=timep),
+                                         self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_cci(df_cci)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_cci, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                         start_date=start_date, end_date=end_date,
-                                                                         timep=timep)
+                    df_cci, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                               start_date=start_date, end_date=end_date,
+                                                                               timep=timep)
                     self.display_chart_stock(df_interval)
                     self.display_chart_cci(df_cci)
                     return
                 else:
-                    df_cci = self.stock_data.ema(symbol=equity, interval=interval, month=date, timep=timep)
-                    df_cci = df_cci[df_cci['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_cci(df_cci)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_cci(df_cci)
-                        return
+                    df_cci, df_data = yield (self.async_method.cci(symbol=equity, interval=interval, month=date,
+                                                                   timep=timep, start=date, end=date),
+                                             self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_cci(df_cci)
+                    return
             else:
                 raise ValueError
         except ValueError:
@@ -247,3 +243,39 @@ class CCIPopupWindow(tk.Toplevel):
         except KeyError:
             self.label_message['fg'] = "red"
             self.label_message['text'] = 'No Data Found\n Check Entries'
+
+    def display_chart_sweep(self, grid):
+        sweep_figure(grid, 'CCI', fig=self.panel_cci.clear())
+        self.panel_cci.draw()
+
+    @background_task
+    def sweep_results(self):
+        try:
+            self.label_message['fg'] = "#0E82D3"
+            self.label_message['text'] = 'Enter Information and Submit to See Results'
+            valid_intervals = {'daily', 'weekly', 'monthly'}
+            equity = self.entry_var5.get().strip().upper()
+            interval = self.entry_var4.get().strip()
+            if interval not in valid_intervals:
+                raise ValueError
+            date = self.entry_var3.get().strip()
+            prices = yield self.async_method.prices(equity, interval)
+            grid = yield run_in_thread(sweep, "CCI", prices, SWEEP_PERIODS)
+            if date != "Date":
+                date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
+                if not re.match(date_pattern, date):
+                    raise ValueError
+                if "/" in date:
+                    start_date, end_date = date.split("/")
+                    grid = date_slice(grid, start_date, end_date)
+                else:
+                    grid = date_slice(grid, date, date)
+            if grid.dropna(how="all").empty:
+                raise KeyError
+            self.display_chart_sweep(grid)
+        except ValueError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'Invalid Entry'
+        except KeyError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'No Data Found\n Check Entries'
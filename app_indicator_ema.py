@@ -11,6 +11,8 @@ Usage:
     1. Instantiate an EMAPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input EMA parameters.
     3. Click the "Submit" button to fetch and display the EMA chart.
+       With several intervals (e.g., daily,weekly,monthly) the EMA of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, data points, and price type.
     5. The "Close Window" button closes the popup window.
 
@@ -21,12 +23,14 @@ with customized parameters.
 import tkinter as tk
 from tkmacosx import Button as MacButton
 import matplotlib.pyplot as plt
-from matplotlib.dates import date2num
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 import re
-from app_api_stocks_requests import ApiDataStocks, pd
-from app_mixed_methods import Methods
+from app_api_stocks_requests import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_chart import ChartPanel
+from app_api_csv import date_range
+from app_api_async import AsyncApiData
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class EMAPopupWindow(tk.Toplevel):
@@ -44,8 +48,9 @@ class EMAPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -55,12 +60,14 @@ class EMAPopupWindow(tk.Toplevel):
         # CHART FRAME
         self.chart_frame = tk.Frame(self)
         self.chart_frame.place(x=530, y=90, width=1050, height=770)
+        self.panel = ChartPanel(self.chart_frame, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'EMA - Exponential Moving Average\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -168,84 +175,71 @@ class EMAPopupWindow(tk.Toplevel):
         df_data = df_data.sort_index()
         df.sort_values('time', ascending=True, inplace=True)
         df['time'] = pd.to_datetime(df['time'])
-        fig, ax = plt.subplots(figsize=(10, 5))
-        df_data['time'] = date2num(df_data.index.to_pydatetime())
-        ax.vlines(df_data['time'], df_data['low'], df_data['high'], color='black', linewidth=1)
-        ax.vlines(df_data['time'], df_data['open'], df_data['close'],
-                  color=np.where(df_data['open'] > df_data['close'], 'red', 'green'), linewidth=4)
-        ax.plot(df['time'], df['EMA'], color='blue', label='EMA')
+        ax = self.panel.subplots()
+        self.panel.candles(ax, 'Stock', df_data)
+        self.panel.line(ax, 'EMA', df['time'], df['EMA'], color='blue', label='EMA')
         ax.grid(True)
-        ax.legend()
         ax.set_title('EMA Chart')
         ax.set_xlabel('Time')
         ax.set_ylabel('Price')
-        ymin, ymax = ax.get_ylim()
-        ax.set_ylim(ymin - 0, ymax + 0)
         max_visible_ticks = 8
         ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
-        chart_frame = self.chart_frame
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel.draw(legend=True)
 
-    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep, pricet):
-        df_ema = self.stock_data.ema(symbol=symbol, interval=interval, timep=timep, series=pricet)
-        df_interval = self.method.monthly_report(company=symbol)
-
-        df_ema_filtered = df_ema[(df_ema['time'] >= start_date) & (df_ema['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    def display_chart_timeframes(self, bars, overlay):
+        timeframe_figure(bars, overlay, 'EMA', fig=self.panel.clear())
+        self.panel.draw()
 
-        return df_ema_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep, pricet):
+        return (self.async_method.ema(symbol=symbol, interval=interval, timep=timep, series=pricet, start=start_date,
+                                      end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
             price_set = {'close', 'open', 'low', 'high'}
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
             timep = int(self.entry_var2.get().strip())
             pricet = self.entry_var1.get().strip()
             if pricet.lower() not in price_set:
                 raise ValueError
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("EMA", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep, series_type=pricet)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_ema = self.stock_data.ema(symbol=equity, interval=interval, timep=timep, series=pricet)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart(df_ema, df_data)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart(df_ema, df_data)
-                    return
+                df_ema, df_data = yield (self.async_method.ema(symbol=equity, interval=interval, timep=timep,
+                                                               series=pricet),
+                                         self.async_method.report(equity, interval))
+                self.display_chart(df_ema, df_data)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_ema, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                         start_date=start_date, end_date=end_date,
-                                                                         timep=timep, pricet=pricet)
+                    df_ema, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                               start_date=start_date, end_date=end_date,
+                                                                               timep=timep, pricet=pricet)
                     self.display_chart(df_ema, df_interval)
                     return
                 else:
-                    df_ema = self.stock_data.ema(symbol=equity, interval=interval, month=date,
-                                                 timep=timep, series=pricet)
-                    df_ema = df_ema[df_ema['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart(df_ema, df_data)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart(df_ema, df_data)
-                        return
+                    df_ema, df_data = yield (self.async_method.ema(symbol=equity, interval=interval, month=date,
+                                                                   timep=timep, series=pricet, start=date, end=date),
+                                             self.async_method.report(equity, interval, date=date))
+                    self.display_chart(df_ema, df_data)
+                    return
             else:
                 raise ValueError
         except ValueError:
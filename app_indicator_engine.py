@@ -0,0 +1,1358 @@
+"""
+app_indicator_engine.py
+
+This module computes the technical indicators of Alpha Vantage locally with NumPy, from price data the app already
+holds, instead of sending one request per indicator.
+
+The functions follow the conventions of the API (which are those of TA-Lib): EMA is seeded with the SMA of the
+first period, RSI and ADX use Wilder smoothing, standard deviations are population deviations, and every
+indicator starts at the same bar as the API output.
+
+Functions:
+    moving_average: Moving average of a series with the API's matype codes.
+    sma, ema, rsi, stoch, adx, cci, aroon, bbands, ad, obv: The indicators on NumPy arrays.
+    plus_di, minus_di: The directional indicators behind ADX on NumPy arrays.
+    wma, dema, tema, trima, t3, kama, mama: The other moving averages of the API's matype codes.
+    bbands_many: Bollinger Bands for several standard deviation multipliers from one variance pass.
+    williams_r, donchian: Williams %R and Donchian channels on NumPy arrays.
+    compute_indicator: Compute an indicator from an OHLCV DataFrame in the layout of the API's CSV output.
+    compute_many: Compute several indicators on one OHLCV frame into one aligned DataFrame.
+    compute_timeframes: Compute an indicator on several timeframes resampled from one OHLCV frame, aligned on the
+    finest of them.
+
+Classes:
+    SharedWindows: The price columns of one symbol with the intermediates shared between indicators.
+    LocalIndicators: A drop-in replacement for ApiStocksMethods whose indicator methods are computed locally
+    from the cached price series of the same interval.
+
+Example:
+    indicators = LocalIndicators()
+    df_rsi = indicators.rsi(symbol="IBM", interval="weekly", timep=14)
+    df_bbands = compute_indicator("BBANDS", weekly_prices, time_period=20, matype=7)
+    middle, bands = bbands_many(close, 20, nbdevs=[(1, 1), (2, 2), (3, 3)])
+    dashboard = compute_many(weekly_prices, [("rsi", 14), ("bbands", 20, 2, 2), ("stoch", 5, 3, 3)])
+    bars, overlay = LocalIndicators(base="daily").timeframes("RSI", "IBM", ["daily", "weekly"], time_period=14)
+"""
+
+import math
+import threading
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from app_indicator_rolling import rolling_max, rolling_min, rolling_argmax, rolling_argmin, rolling_moments
+from app_api_stock_methods import ApiStocksMethods
+from app_api_csv import date_bounds, date_slice
+from app_indicator_timeframes import TIMEFRAMES, timeframe_rank, resample_prices, align
+from app_indicator_cache import indicator_cache, series_version
+
+MA_TYPES = {0: "SMA", 1: "EMA", 2: "WMA", 3: "DEMA", 4: "TEMA", 5: "TRIMA", 6: "T3", 7: "KAMA", 8: "MAMA"}
+MAMA_LOOKBACK = 32
+WINDOWS_KEPT = 16
+INTRADAY_INTERVALS = ("1min", "5min", "15min", "30min", "60min")
+COLUMNS = {"SMA": ["SMA"],
+           "EMA": ["EMA"],
+           "RSI": ["RSI"],
+           "STOCH": ["SlowK", "SlowD"],
+           "ADX": ["ADX"],
+           "CCI": ["CCI"],
+           "AROON": ["Aroon Down", "Aroon Up"],
+           "BBANDS": ["Real Upper Band", "Real Middle Band", "Real Lower Band"],
+           "PLUS_DI": ["PLUS_DI"],
+           "MINUS_DI": ["MINUS_DI"],
+           "AD": ["Chaikin A/D"],
+           "OBV": ["OBV"],
+           "WILLR": ["WILLR"],
+           "DONCHIAN": ["Donchian Upper", "Donchian Middle", "Donchian Lower"]}
+DECIMALS = 4
+
+
+def _nan(length):
+    return np.full(length, np.nan)
+
+
+def _divide(numerator, denominator):
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _smooth(values, alpha, start, seed):
+    """
+    Run y[i] = (1 - alpha) * y[i - 1] + alpha * values[i] from y[start] = seed, NaN before start.
+    """
+    out = _nan(len(values))
+    if start >= len(values):
+        return out
+    tail = np.array(values[start:], dtype="float64")
+    tail[0] = seed
+    out[start:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def _valid_tail(values):
+    values = np.asarray(values, dtype="float64")
+    valid = np.flatnonzero(~np.isnan(values))
+    first = valid[0] if len(valid) else len(values)
+    return first, values[first:]
+
+
+def sma(values, period):
+    """
+    Simple moving average.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): Number of values in each average.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first period - 1 values.
+    """
+    return rolling_moments(values, period)[0]
+
+
+def ema(values, period):
+    """
+    Exponential moving average with a smoothing factor of 2 / (period + 1), seeded with the SMA of the
+    first period values.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the average.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first period - 1 values.
+    """
+    values = np.asarray(values, dtype="float64")
+    if period > len(values):
+        return _nan(len(values))
+    return _smooth(values, 2 / (period + 1), period - 1, values[:period].mean())
+
+
+def wma(values, period):
+    """
+    Linearly weighted moving average, the newest value has the weight period.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the average.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first period - 1 values.
+    """
+    values = np.asarray(values, dtype="float64")
+    out = _nan(len(values))
+    if period <= len(values):
+        weights = np.arange(period, 0, -1, dtype="float64")
+        out[period - 1:] = np.convolve(values, weights, mode="valid") / weights.sum()
+    return out
+
+
+def dema(values, period):
+    """
+    Double exponential moving average, 2 * EMA - EMA(EMA).
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the averages.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first 2 * (period - 1) values.
+    """
+    first = ema(values, period)
+    return 2 * first - moving_average(first, period, 1)
+
+
+def tema(values, period):
+    """
+    Triple exponential moving average, 3 * EMA - 3 * EMA(EMA) + EMA(EMA(EMA)).
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the averages.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first 3 * (period - 1) values.
+    """
+    first = ema(values, period)
+    second = moving_average(first, period, 1)
+    return 3 * first - 3 * second + moving_average(second, period, 1)
+
+
+def trima(values, period):
+    """
+    Triangular moving average, the SMA of an SMA whose periods add up to period + 1.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the average.
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first period - 1 values.
+    """
+    inner = (period + 1) // 2
+    return moving_average(sma(values, inner), period + 1 - inner, 0)
+
+
+def t3(values, period, vfactor=0.7):
+    """
+    Tillson T3, a weighted sum of six chained EMAs.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of each EMA.
+        vfactor (float): The volume factor (default is 0.7).
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first 6 * (period - 1) values.
+    """
+    chain = [np.asarray(values, dtype="float64")]
+    for _ in range(6):
+        chain.append(moving_average(chain[-1], period, 1))
+    a = vfactor
+    return (-a ** 3 * chain[6] + (3 * a ** 2 + 3 * a ** 3) * chain[5]
+            + (-6 * a ** 2 - 3 * a - 3 * a ** 3) * chain[4] + (1 + 3 * a + a ** 3 + 3 * a ** 2) * chain[3])
+
+
+def kama(values, period, fast=2, slow=30):
+    """
+    Kaufman adaptive moving average. The smoothing constant follows the efficiency ratio of the period,
+    between the EMA constants of the fast and the slow period.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the efficiency ratio.
+        fast (int): The period of the fastest smoothing (default is 2).
+        slow (int): The period of the slowest smoothing (default is 30).
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first period values.
+    """
+    values = np.asarray(values, dtype="float64")
+    out = _nan(len(values))
+    if period >= len(values):
+        return out
+    change = np.abs(values[period:] - values[:-period])
+    volatility = np.convolve(np.abs(np.diff(values)), np.ones(period), mode="valid")
+    efficiency = np.where(volatility > 0, _divide(change, volatility), 1.0)
+    fastest, slowest = 2 / (fast + 1), 2 / (slow + 1)
+    constants = (efficiency * (fastest - slowest) + slowest) ** 2
+    average = values[period - 1]
+    for index, constant in enumerate(constants, period):
+        average += constant * (values[index] - average)
+        out[index] = average
+    return out
+
+
+def _hilbert(series, index, bandwidth):
+    return (0.0962 * series[index] + 0.5769 * series[index - 2] - 0.5769 * series[index - 4]
+            - 0.0962 * series[index - 6]) * bandwidth
+
+
+def mama(values, fastlimit=0.5, slowlimit=0.05):
+    """
+    MESA adaptive moving average of Ehlers. The smoothing factor follows the rate of change of the phase that
+    a Hilbert transform measures, between the slow and the fast limit.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        fastlimit (float): The largest smoothing factor (default is 0.5).
+        slowlimit (float): The smallest smoothing factor (default is 0.05).
+
+    Returns:
+        numpy.ndarray: The averages, NaN for the first MAMA_LOOKBACK values.
+    """
+    values = np.asarray(values, dtype="float64")
+    length = len(values)
+    out = _nan(length)
+    if length <= MAMA_LOOKBACK:
+        return out
+    smooth, detrender, i1, q1, i2, q2, real, imaginary, cycle, phase = ([0.0] * length for _ in range(10))
+    average = values[0]
+    for index in range(6, length):
+        smooth[index] = (4 * values[index] + 3 * values[index - 1] + 2 * values[index - 2] + values[index - 3]) / 10
+        bandwidth = 0.075 * cycle[index - 1] + 0.54
+        detrender[index] = _hilbert(smooth, index, bandwidth)
+        q1[index] = _hilbert(detrender, index, bandwidth)
+        i1[index] = detrender[index - 3]
+        i2[index] = 0.2 * (i1[index] - _hilbert(q1, index, bandwidth)) + 0.8 * i2[index - 1]
+        q2[index] = 0.2 * (q1[index] + _hilbert(i1, index, bandwidth)) + 0.8 * q2[index - 1]
+        real[index] = 0.2 * (i2[index] * i2[index - 1] + q2[index] * q2[index - 1]) + 0.8 * real[index - 1]
+        imaginary[index] = 0.2 * (i2[index] * q2[index - 1] - q2[index] * i2[index - 1]) + 0.8 * imaginary[index - 1]
+        measured = cycle[index - 1]
+        if real[index] != 0 and imaginary[index] != 0:
+            measured = 360 / math.degrees(math.atan(imaginary[index] / real[index]))
+        measured = min(max(measured, 0.67 * cycle[index - 1]), 1.5 * cycle[index - 1])
+        cycle[index] = 0.2 * min(max(measured, 6), 50) + 0.8 * cycle[index - 1]
+        phase[index] = math.degrees(math.atan(q1[index] / i1[index])) if i1[index] != 0 else phase[index - 1]
+        alpha = max(fastlimit / max(phase[index - 1] - phase[index], 1), slowlimit)
+        average = alpha * values[index] + (1 - alpha) * average
+        out[index] = average
+    out[:MAMA_LOOKBACK] = np.nan
+    return out
+
+
+def moving_average(values, period, matype=0):
+    """
+    Moving average selected by the API's matype code. Leading NaN values are skipped.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the average, MAMA does not use it.
+        matype (int): One of MA_TYPES, 0 = SMA, 1 = EMA, 2 = WMA, 3 = DEMA, 4 = TEMA, 5 = TRIMA, 6 = T3,
+        7 = KAMA, 8 = MAMA (default is 0).
+
+    Returns:
+        numpy.ndarray: The averages.
+
+    Raises:
+        ValueError: If the matype is not supported.
+    """
+    functions = {0: sma, 1: ema, 2: wma, 3: dema, 4: tema, 5: trima, 6: t3, 7: kama,
+                 8: lambda values, period: mama(values)}
+    if int(matype) not in functions:
+        raise ValueError(f"Moving average type {matype} is not supported")
+    first, tail = _valid_tail(values)
+    out = _nan(first + len(tail))
+    out[first:] = functions[int(matype)](tail, period)
+    return out
+
+
+class SharedWindows:
+    def __init__(self, prices):
+        """
+        Hold the price columns of one symbol and the intermediates that several indicators need, so each
+        of them is computed once: rolling means, variances and moving averages, rolling highs and lows, price
+        changes, true range and directional movement.
+
+        Args:
+            prices (pandas.DataFrame or dict): Price columns (open, high, low, close, volume), oldest first.
+
+        Usage:
+            windows = SharedWindows(prices)
+            middle = windows.mean("close", 20)
+        """
+        self.prices = prices
+        self.length = len(prices) if isinstance(prices, pd.DataFrame) else len(next(iter(prices.values())))
+        self.cache = {}
+
+    def _memo(self, key, build):
+        if key not in self.cache:
+            self.cache[key] = build()
+        return self.cache[key]
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name):
+        """
+        A price column as a float64 array. "typical" is (high + low + close) / 3.
+        """
+        if name == "typical":
+            return self._memo(("column", name), lambda: (self.column("high") + self.column("low")
+                                                         + self.column("close")) / 3)
+        return self._memo(("column", name), lambda: np.asarray(self.prices[name], dtype="float64"))
+
+    def moments(self, name, period):
+        """
+        The rolling mean and population variance of a column, from one stable pass.
+        """
+        return self._memo(("moments", name, period), lambda: rolling_moments(self.column(name), period))
+
+    def mean(self, name, period):
+        """
+        The simple moving average of a column, NaN for the first period - 1 values.
+        """
+        return self.moments(name, period)[0]
+
+    def variance(self, name, period):
+        """
+        The population variance of a column over the period.
+        """
+        return self.moments(name, period)[1]
+
+    def deviation(self, name, period):
+        """
+        The population standard deviation of a column over the period.
+        """
+        return self._memo(("deviation", name, period), lambda: np.sqrt(self.variance(name, period)))
+
+    def average(self, name, period, matype=0):
+        """
+        The moving average of a column selected by the API's matype code.
+        """
+        if int(matype) == 0:
+            return self.mean(name, period)
+        return self._memo(("average", name, period, int(matype)),
+                          lambda: moving_average(self.column(name), period, matype))
+
+    def highest(self, name, period):
+        """
+        The highest value of a column over the period.
+        """
+        return self._memo(("highest", name, period), lambda: rolling_max(self.column(name), period))
+
+    def lowest(self, name, period):
+        """
+        The lowest value of a column over the period.
+        """
+        return self._memo(("lowest", name, period), lambda: rolling_min(self.column(name), period))
+
+    def _since(self, positions, period):
+        out = _nan(len(self))
+        out[period - 1:] = np.arange(period - 1, len(self)) - positions[period - 1:]
+        return out
+
+    def since_highest(self, name, period):
+        """
+        Bars since the highest value of a column over the period, a tie counts as the most recent.
+        """
+        return self._memo(("since_highest", name, period),
+                          lambda: self._since(rolling_argmax(self.column(name), period), period))
+
+    def since_lowest(self, name, period):
+        """
+        Bars since the lowest value of a column over the period, a tie counts as the most recent.
+        """
+        return self._memo(("since_lowest", name, period),
+                          lambda: self._since(rolling_argmin(self.column(name), period), period))
+
+    def changes(self, name):
+        """
+        The gains and losses of a column from one value to the next, both positive.
+        """
+        def build():
+            change = np.diff(self.column(name))
+            return np.clip(change, 0, None), np.clip(-change, 0, None)
+        return self._memo(("changes", name), build)
+
+    def directional(self):
+        """
+        The plus and minus directional movement and the true range, 0 on the first bar.
+        """
+        def build():
+            high, low, close = self.column("high"), self.column("low"), self.column("close")
+            up = np.r_[0.0, np.diff(high)]
+            down = np.r_[0.0, -np.diff(low)]
+            plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+            minus_dm = np.where((down > 0) & (down > up), down, 0.0)
+            previous = np.r_[close[0], close[:-1]]
+            true_range = np.maximum(high, previous) - np.minimum(low, previous)
+            true_range[0] = 0.0
+            return plus_dm, minus_dm, true_range
+        return self._memo(("directional",), build)
+
+    def directional_index(self, period):
+        """
+        The plus and minus directional indicators as fractions, Wilder smoothed, NaN for the first period - 1 values.
+        """
+        def build():
+            smoothed = [_smooth(values, 1 / period, period - 1, values[1:period].sum() / period)
+                        for values in self.directional()]
+            return _divide(smoothed[0], smoothed[2]), _divide(smoothed[1], smoothed[2])
+        return self._memo(("directional_index", period), build)
+
+
+def _rsi(windows, name, period):
+    out = _nan(len(windows))
+    if period >= len(windows):
+        return out
+    gain, loss = windows.changes(name)
+    average_gain = _smooth(gain, 1 / period, period - 1, gain[:period].mean())
+    average_loss = _smooth(loss, 1 / period, period - 1, loss[:period].mean())
+    out[period:] = 100 * _divide(average_gain[period - 1:], average_gain[period - 1:] + average_loss[period - 1:])
+    return out
+
+
+def _stoch(windows, fastk, slowk, slowd, slowkma, slowdma):
+    lowest, highest = windows.lowest("low", fastk), windows.highest("high", fastk)
+    fast_k = 100 * _divide(windows.column("close") - lowest, highest - lowest)
+    fast_k[np.isnan(lowest)] = np.nan
+    slow_k = moving_average(fast_k, slowk, slowkma)
+    return slow_k, moving_average(slow_k, slowd, slowdma)
+
+
+def _adx(windows, period):
+    out = _nan(len(windows))
+    if 2 * period > len(windows):
+        return out
+    plus_di, minus_di = windows.directional_index(period)
+    dx = 100 * _divide(np.abs(plus_di - minus_di), plus_di + minus_di)
+    return _smooth(dx, 1 / period, 2 * period - 1, dx[period:2 * period].mean())
+
+
+def _di(windows, period, side):
+    # The API starts the directional indicators one bar after the seed of the smoothing.
+    out = 100 * windows.directional_index(period)[side]
+    out[:period] = np.nan
+    return out
+
+
+def _cci(windows, period):
+    typical = windows.column("typical")
+    out = _nan(len(typical))
+    if period > len(typical):
+        return out
+    mean = windows.mean("typical", period)[period - 1:]
+    deviation = np.abs(sliding_window_view(typical, period) - mean[:, None]).mean(axis=1)
+    out[period - 1:] = _divide(typical[period - 1:] - mean, 0.015 * deviation)
+    return out
+
+
+def _aroon(windows, period):
+    if period >= len(windows):
+        return _nan(len(windows)), _nan(len(windows))
+    up = 100 * (period - windows.since_highest("high", period + 1)) / period
+    down = 100 * (period - windows.since_lowest("low", period + 1)) / period
+    return down, up
+
+
+def _williams_r(windows, period):
+    highest, lowest = windows.highest("high", period), windows.lowest("low", period)
+    out = -100 * _divide(highest - windows.column("close"), highest - lowest)
+    out[np.isnan(highest)] = np.nan
+    return out
+
+
+def _donchian(windows, period):
+    upper, lower = windows.highest("high", period), windows.lowest("low", period)
+    return upper, (upper + lower) / 2, lower
+
+
+def _bbands(windows, name, period, nbdevup, nbdevdn, matype):
+    middle, deviation = windows.average(name, period, matype), windows.deviation(name, period)
+    return middle + float(nbdevup) * deviation, middle, middle - float(nbdevdn) * deviation
+
+
+def _bbands_many(windows, name, period, nbdevs, matype):
+    middle, deviation = windows.average(name, period, matype), windows.deviation(name, period)
+    return middle, {(nbdevup, nbdevdn): (middle + float(nbdevup) * deviation, middle - float(nbdevdn) * deviation)
+                    for nbdevup, nbdevdn in nbdevs}
+
+
+def _ad(windows):
+    high, low, close = windows.column("high"), windows.column("low"), windows.column("close")
+    return np.cumsum(_divide((close - low) - (high - close), high - low) * windows.column("volume"))
+
+
+def _obv(windows):
+    volume = windows.column("volume")
+    signed = np.sign(np.diff(windows.column("close"))) * volume[1:]
+    return np.cumsum(np.r_[volume[:1], signed])
+
+
+def rsi(values, period=14):
+    """
+    Relative Strength Index with Wilder smoothing.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the index (default is 14).
+
+    Returns:
+        numpy.ndarray: The index from 0 to 100, NaN for the first period values.
+    """
+    return _rsi(SharedWindows({"close": values}), "close", period)
+
+
+def stoch(high, low, close, fastk=5, slowk=3, slowd=3, slowkma=0, slowdma=0):
+    """
+    Stochastic Oscillator.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        fastk (int): The period of the fast %K line (default is 5).
+        slowk (int): The smoothing period of the slow %K line (default is 3).
+        slowd (int): The smoothing period of the slow %D line (default is 3).
+        slowkma (int): The matype of the slow %K smoothing (default is 0, SMA).
+        slowdma (int): The matype of the slow %D smoothing (default is 0, SMA).
+
+    Returns:
+        tuple: (slow %K, slow %D) arrays.
+    """
+    return _stoch(SharedWindows({"high": high, "low": low, "close": close}), fastk, slowk, slowd, slowkma, slowdma)
+
+
+def adx(high, low, close, period=14):
+    """
+    Average Directional Movement Index with Wilder smoothing.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the index (default is 14).
+
+    Returns:
+        numpy.ndarray: The index, NaN for the first 2 * period - 1 values.
+    """
+    return _adx(SharedWindows({"high": high, "low": low, "close": close}), period)
+
+
+def plus_di(high, low, close, period=14):
+    """
+    Plus Directional Indicator (+DI) with Wilder smoothing.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the indicator (default is 14).
+
+    Returns:
+        numpy.ndarray: The indicator from 0 to 100, NaN for the first period values.
+    """
+    return _di(SharedWindows({"high": high, "low": low, "close": close}), period, 0)
+
+
+def minus_di(high, low, close, period=14):
+    """
+    Minus Directional Indicator (-DI) with Wilder smoothing.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the indicator (default is 14).
+
+    Returns:
+        numpy.ndarray: The indicator from 0 to 100, NaN for the first period values.
+    """
+    return _di(SharedWindows({"high": high, "low": low, "close": close}), period, 1)
+
+
+def cci(high, low, close, period=20):
+    """
+    Commodity Channel Index.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the index (default is 20).
+
+    Returns:
+        numpy.ndarray: The index, NaN for the first period - 1 values.
+    """
+    return _cci(SharedWindows({"high": high, "low": low, "close": close}), period)
+
+
+def aroon(high, low, period=14):
+    """
+    Aroon indicator. A tie counts as the most recent extreme.
+
+    Args:
+        high, low (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the indicator (default is 14).
+
+    Returns:
+        tuple: (Aroon Down, Aroon Up) arrays, NaN for the first period values.
+    """
+    return _aroon(SharedWindows({"high": high, "low": low}), period)
+
+
+def williams_r(high, low, close, period=14):
+    """
+    Williams %R.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the indicator (default is 14).
+
+    Returns:
+        numpy.ndarray: The indicator from -100 to 0, NaN for the first period - 1 values.
+    """
+    return _williams_r(SharedWindows({"high": high, "low": low, "close": close}), period)
+
+
+def donchian(high, low, period=20):
+    """
+    Donchian channels: the highest high, the lowest low and their midpoint over the period.
+
+    Args:
+        high, low (numpy.ndarray): The price series, oldest first.
+        period (int): The period of the channels (default is 20).
+
+    Returns:
+        tuple: (upper, middle, lower) arrays, NaN for the first period - 1 values.
+    """
+    return _donchian(SharedWindows({"high": high, "low": low}), period)
+
+
+def bbands(values, period=5, nbdevup=2, nbdevdn=2, matype=0):
+    """
+    Bollinger Bands around a moving average, with the population standard deviation of the period from a
+    numerically stable rolling variance.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the bands (default is 5).
+        nbdevup (float): Standard deviations of the upper band (default is 2).
+        nbdevdn (float): Standard deviations of the lower band (default is 2).
+        matype (int): The matype of the middle band (default is 0, SMA).
+
+    Returns:
+        tuple: (upper, middle, lower) arrays.
+    """
+    return _bbands(SharedWindows({"close": values}), "close", period, nbdevup, nbdevdn, matype)
+
+
+def bbands_many(values, period=5, nbdevs=((2, 2),), matype=0):
+    """
+    Bollinger Bands for several pairs of standard deviation multipliers at once. The middle band and the
+    standard deviation are computed once and every pair only scales the deviation.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        period (int): The period of the bands (default is 5).
+        nbdevs (list): (nbdevup, nbdevdn) pairs (default is ((2, 2),)).
+        matype (int): The matype of the middle band (default is 0, SMA).
+
+    Returns:
+        tuple: The middle band array and a dict of {(nbdevup, nbdevdn): (upper, lower)} arrays.
+    """
+    return _bbands_many(SharedWindows({"close": values}), "close", period, nbdevs, matype)
+
+
+def ad(high, low, close, volume):
+    """
+    Chaikin Accumulation/Distribution line.
+
+    Args:
+        high, low, close, volume (numpy.ndarray): The price and volume series, oldest first.
+
+    Returns:
+        numpy.ndarray: The line.
+    """
+    return _ad(SharedWindows({"high": high, "low": low, "close": close, "volume": volume}))
+
+
+def obv(close, volume):
+    """
+    On Balance Volume, starting at the first volume.
+
+    Args:
+        close, volume (numpy.ndarray): The price and volume series, oldest first.
+
+    Returns:
+        numpy.ndarray: The running volume.
+    """
+    return _obv(SharedWindows({"close": close, "volume": volume}))
+
+
+def _positive(value, name):
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"{name} has to be a positive integer")
+    return value
+
+
+def _compute(windows, function, params):
+    series = str(params.get("series_type", "close")).lower()
+    period = _positive(params.get("time_period", 14), "time_period")
+    if function == "SMA":
+        return [windows.mean(series, period)]
+    if function == "EMA":
+        return [ema(windows.column(series), period)]
+    if function == "RSI":
+        return [_rsi(windows, series, period)]
+    if function == "STOCH":
+        return _stoch(windows, _positive(params.get("fastkperiod", 5), "fastkperiod"),
+                      _positive(params.get("slowkperiod", 3), "slowkperiod"),
+                      _positive(params.get("slowdperiod", 3), "slowdperiod"),
+                      int(params.get("slowkmatype", 0)), int(params.get("slowdmatype", 0)))
+    if function == "ADX":
+        return [_adx(windows, period)]
+    if function == "PLUS_DI":
+        return [_di(windows, period, 0)]
+    if function == "MINUS_DI":
+        return [_di(windows, period, 1)]
+    if function == "CCI":
+        return [_cci(windows, period)]
+    if function == "AROON":
+        return _aroon(windows, period)
+    if function == "BBANDS":
+        return _bbands(windows, series, period, float(params.get("nbdevup", 2)), float(params.get("nbdevdn", 2)),
+                       int(params.get("matype", 0)))
+    if function == "AD":
+        return [_ad(windows)]
+    if function == "OBV":
+        return [_obv(windows)]
+    if function == "WILLR":
+        return [_williams_r(windows, period)]
+    if function == "DONCHIAN":
+        return _donchian(windows, period)
+    raise ValueError(f"{function} is not a supported indicator")
+
+
+def compute_indicator(function, prices, **params):
+    """
+    Compute an indicator from an OHLCV DataFrame in the layout of the API's CSV output.
+
+    Args:
+        function (str): The API function (e.g., "RSI").
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        **params: The API parameters of the indicator (time_period, series_type, fastkperiod, slowkperiod,
+        slowdperiod, slowkmatype, slowdmatype, nbdevup, nbdevdn, matype).
+
+    Returns:
+        pandas.DataFrame: A "time" column and the indicator columns, newest first, without the warm-up rows.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    prices = prices.sort_index()
+    return _frame(function, prices.index, _compute(SharedWindows(prices), function, params))
+
+
+def _frame(function, index, outputs, start=None, end=None):
+    first, stop = date_bounds(index, start, end)
+    df = pd.DataFrame(dict(zip(COLUMNS[function], (values[first:stop] for values in outputs))))
+    df.insert(0, "time", index[first:stop].to_numpy())
+    return df.dropna().iloc[::-1].round(DECIMALS).reset_index(drop=True)
+
+
+# Positional parameters of the specs accepted by compute_many.
+SPEC_PARAMS = {"SMA": ("time_period", "series_type"),
+               "EMA": ("time_period", "series_type"),
+               "RSI": ("time_period", "series_type"),
+               "STOCH": ("fastkperiod", "slowkperiod", "slowdperiod", "slowkmatype", "slowdmatype"),
+               "ADX": ("time_period",),
+               "CCI": ("time_period",),
+               "AROON": ("time_period",),
+               "BBANDS": ("time_period", "nbdevup", "nbdevdn", "matype", "series_type"),
+               "AD": (),
+               "OBV": (),
+               "PLUS_DI": ("time_period",),
+               "MINUS_DI": ("time_period",),
+               "WILLR": ("time_period",),
+               "DONCHIAN": ("time_period",)}
+
+
+def compute_many(prices, specs):
+    """
+    Compute several indicators on one OHLCV frame in a single pass over shared intermediates.
+
+    Rolling means and variances, rolling highs and lows, price changes and the true range are computed once
+    and reused by every indicator that needs them.
+
+    Args:
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        specs (list): Indicator specs, a name followed by its positional parameters, e.g.
+        [("rsi", 14), ("bbands", 20, 2, 2), ("stoch", 5, 3, 3), ("obv",)]. See SPEC_PARAMS for the order.
+
+    Returns:
+        pandas.DataFrame: One column per indicator output, named like "RSI (14)" or "Real Upper Band (20, 2, 2)",
+        indexed by the timestamps of the prices, oldest first. Warm-up values are NaN.
+
+    Raises:
+        ValueError: If a spec is unknown or has invalid parameters.
+    """
+    prices = prices.sort_index()
+    windows = SharedWindows(prices)
+    columns = {}
+    for spec in specs:
+        spec = (spec,) if isinstance(spec, str) else tuple(spec)
+        function = spec[0].upper()
+        if function not in SPEC_PARAMS or len(spec) - 1 > len(SPEC_PARAMS[function]):
+            raise ValueError(f"Invalid indicator spec {spec}")
+        params = dict(zip(SPEC_PARAMS[function], spec[1:]))
+        label = f" ({', '.join(str(value) for value in spec[1:])})" if len(spec) > 1 else ""
+        for column, values in zip(COLUMNS[function], _compute(windows, function, params)):
+            columns[column + label] = values
+    return pd.DataFrame(columns, index=prices.index)
+
+
+def compute_timeframes(function, prices, base, timeframes, **params):
+    """
+    Compute an indicator on several timeframes derived from one OHLCV frame, aligned on the finest of them.
+
+    Every coarser timeframe is resampled from the prices, so one series feeds them all. Its values are aligned on
+    the bars of the finest timeframe without lookahead (see app_indicator_timeframes.align).
+
+    Args:
+        function (str): The API function (e.g., "RSI").
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        base (str): The timeframe of the prices, one of TIMEFRAMES (e.g., "daily").
+        timeframes (list): The timeframes to compute, none finer than the base (e.g., ["daily", "weekly"]).
+        **params: The API parameters of the indicator, see compute_indicator.
+
+    Returns:
+        tuple: The OHLCV bars of the finest timeframe, oldest first, and a pandas.DataFrame on the same index with
+        one column per output and timeframe, named like "RSI (weekly)". Warm-up values are NaN.
+
+    Raises:
+        ValueError: If the function, a timeframe or a parameter is invalid.
+    """
+    function = function.upper()
+    if function not in COLUMNS:
+        raise ValueError(f"{function} is not a supported indicator")
+    timeframes = sorted(set(timeframes), key=timeframe_rank)
+    if not timeframes or timeframe_rank(timeframes[0]) < timeframe_rank(base):
+        raise ValueError(f"The timeframes can not be finer than {base}")
+    prices = prices.sort_index()
+    bars = prices if timeframes[0] == base else resample_prices(prices, timeframes[0])
+    columns = {}
+    for timeframe in timeframes:
+        frame = bars if timeframe == timeframes[0] else resample_prices(prices, timeframe)
+        for column, values in zip(COLUMNS[function], _compute(SharedWindows(frame), function, params)):
+            values = pd.Series(values, index=frame.index)
+            columns[f"{column} ({timeframe})"] = values if frame is bars else align(values, bars.index, timeframe)
+    return bars, pd.DataFrame(columns, index=bars.index)
+
+
+class LocalIndicators(ApiStocksMethods):
+    def __init__(self, local=True, base=None, cache=indicator_cache):
+        """
+        Initialize a new instance of the LocalIndicators class.
+
+        The indicator methods have the signatures of ApiDataStocks and return the same DataFrames, but they are
+        computed from the daily, weekly, monthly or intraday price series of the symbol, which the price charts
+        fetch anyway and which is answered from the response caches. The shared intermediates of the last
+        WINDOWS_KEPT series are kept until the series changes, so changing the multipliers or the moving average
+        of an indicator does not repeat the rolling passes. The whole output of every indicator is kept in an
+        IndicatorCache shared by all instances, valid until the content of its price series changes, so redraws
+        and other windows on the same symbol reuse it. Every indicator method also takes start and end dates
+        ("YYYY", "YYYY-MM" or "YYYY-MM-DD"), which select the rows of the output by binary search.
+
+        With a base interval, the coarser intervals are resampled from the base series instead of being
+        downloaded, so one daily series feeds the daily, weekly and monthly prices and indicators.
+
+        Args:
+            local (bool): Compute the indicators locally, otherwise send the API requests (default is True).
+            base (str, optional): "daily" or an intraday interval to derive the coarser intervals from (default is
+            None, every interval is downloaded).
+            cache (IndicatorCache): The cache of the outputs (default is the shared indicator cache).
+
+        Usage:
+            indicators = LocalIndicators()
+            df_sma = indicators.sma(symbol="IBM", interval="weekly", timep=60)
+        """
+        super().__init__()
+        self.local = local
+        self.base = base
+        self.cache = cache
+        self.windows = {}
+        self.lock = threading.Lock()
+
+    def prices(self, symbol, interval="weekly", month=None):
+        """
+        Retrieve the price series an indicator is computed from.
+
+        Without a month, intraday indicators are computed from the current month. Intervals coarser than the base
+        interval are resampled from the base series.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+
+        Returns:
+            pandas.DataFrame: The OHLCV data indexed by timestamp, oldest first, empty if nothing was received.
+
+        Raises:
+            ValueError: If the interval is not supported.
+        """
+        source = self._source(interval)
+        if source != interval:
+            return resample_prices(self.prices(symbol, source, month), interval)
+        if interval == "daily":
+            prices = self.day_data_company(symbol)
+        elif interval == "weekly":
+            prices = self.weekly_data_company(symbol)
+        elif interval == "monthly":
+            prices = self.monthly_data_company(symbol)
+        elif interval in INTRADAY_INTERVALS:
+            prices = self.daily_data_company(symbol, interval, month)
+        else:
+            raise ValueError(f"{interval} is not a supported interval")
+        if prices is None or "timestamp" not in prices.columns:
+            return pd.DataFrame()
+        return prices.set_index("timestamp").sort_index()
+
+    def _source(self, interval):
+        """
+        The interval whose bars are downloaded for an interval, the base interval if they are resampled from it.
+        """
+        if self.base is not None and interval in TIMEFRAMES and timeframe_rank(interval) > timeframe_rank(self.base):
+            return self.base
+        return interval
+
+    def report(self, symbol, interval="weekly", date=None, start=None, end=None, month=None):
+        """
+        Generate the price report of an interval, in the layout of ApiStocksMethods.weekly_report.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            date (str, optional): The specific date in the "YYYY-MM or YYYY" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+
+        Returns:
+            pandas.DataFrame: The OHLCV data indexed by timestamp, newest first.
+        """
+        report = self.prices(symbol, interval, month).iloc[::-1]
+        if date is not None:
+            report = date_slice(report, date, date)
+        return date_slice(report, start, end)
+
+    def timeframes(self, function, symbol, timeframes=("daily", "weekly", "monthly"), month=None, start=None,
+                   end=None, **params):
+        """
+        Compute an indicator on several intervals from one price series, aligned on the finest interval.
+
+        The series is the base interval, or the finest of the timeframes without a base. The warm-up of every
+        timeframe uses the whole series, start and end only select the rows that are returned.
+
+        Args:
+            function (str): The API function (e.g., "RSI").
+            symbol (str): The stock symbol (e.g., "AAPL").
+            timeframes (list): The intervals to compute (default is ("daily", "weekly", "monthly")).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+            **params: The API parameters of the indicator, see compute_indicator.
+
+        Returns:
+            tuple: The OHLCV bars of the finest interval and the aligned indicator columns of every interval, both
+            indexed by timestamp, oldest first. Both are empty if no prices were received.
+
+        Raises:
+            ValueError: If the function, an interval or a parameter is invalid.
+        """
+        base = self.base or min(timeframes, key=timeframe_rank)
+        prices = self.prices(symbol, base, month)
+        if prices.empty:
+            return prices, pd.DataFrame()
+        series = (symbol.upper(), base, month if base in INTRADAY_INTERVALS else None, self._source(base))
+        version = series_version(prices)
+        key = dict(params, timeframes=",".join(sorted(set(timeframes), key=timeframe_rank)))
+        outputs = self.cache.get(series, version, f"TIMEFRAMES {function.upper()}", key)
+        if outputs is None:
+            outputs = compute_timeframes(function, prices, base, timeframes, **params)
+            self.cache.put(series, version, f"TIMEFRAMES {function.upper()}", key, outputs)
+        bars, overlay = outputs
+        first, stop = date_bounds(bars.index, start, end)
+        return bars.iloc[first:stop].copy(), overlay.iloc[first:stop].copy()
+
+    def _windows(self, symbol, interval, month):
+        if interval not in INTRADAY_INTERVALS and self.base not in INTRADAY_INTERVALS:
+            month = None
+        prices = self.prices(symbol, interval, month)
+        # Downloaded and resampled bars of the same interval differ, e.g. the weekly bars of an instance without a
+        # base and of one with a daily base, so the source is part of the key of the series.
+        key = (symbol.upper(), interval, month, self._source(interval))
+        if prices.empty:
+            return prices, None, key, None
+        version = series_version(prices)
+        # The indicator methods run on several threads at once, e.g. the background tasks of the windows.
+        with self.lock:
+            kept = self.windows.get(key)
+            if kept is None or kept[0] != version:
+                self.windows.pop(key, None)
+                while len(self.windows) >= WINDOWS_KEPT:
+                    self.windows.pop(next(iter(self.windows)))
+                kept = (version, SharedWindows(prices))
+                self.windows[key] = kept
+        return prices, kept[1], key, version
+
+    def _cached(self, function, symbol, interval, month, params, build):
+        """
+        The whole output of an indicator from the indicator cache, built from the prices and the shared windows
+        of the series on a miss. None if no prices were received.
+        """
+        prices, windows, series, version = self._windows(symbol, interval, month)
+        if windows is None:
+            return None
+        df = self.cache.get(series, version, function, params)
+        if df is None:
+            df = build(prices, windows)
+            self.cache.put(series, version, function, params, df)
+        return df
+
+    def _compute(self, function, symbol, interval, month, start=None, end=None, **params):
+        df = self._cached(function, symbol, interval, month, params,
+                          lambda prices, windows: _frame(function, prices.index, _compute(windows, function, params)))
+        if df is None:
+            return pd.DataFrame()
+        # The cached frame is shared, callers get their own copy of the selected rows.
+        return date_slice(df, start, end, column="time").copy()
+
+    @staticmethod
+    def _remote(df, start, end):
+        if df is None or df.empty or "time" not in df.columns:
+            return df
+        return date_slice(df, start, end, column="time")
+
+    def sma(self, symbol, series='close', interval='weekly', timep=60, month=None, start=None, end=None):
+        """
+        Compute the Simple Moving Average (SMA) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.sma if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            series (str): The price type, close, open, high or low (default is 'close').
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The number of bars averaged (default is 60).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "SMA" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().sma(symbol, series, interval, timep, month), start, end)
+        return self._compute("SMA", symbol, interval, month, start, end, time_period=timep, series_type=series)
+
+    def ema(self, symbol, series='close', interval='weekly', timep=60, month=None, start=None, end=None):
+        """
+        Compute the Exponential Moving Average (EMA) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.ema if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            series (str): The price type, close, open, high or low (default is 'close').
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the average (default is 60).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "EMA" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().ema(symbol, series, interval, timep, month), start, end)
+        return self._compute("EMA", symbol, interval, month, start, end, time_period=timep, series_type=series)
+
+    def stoch(self, symbol, interval='weekly', fastk=5, slowk=3, slowd=3,
+              slowkma=0, slowdma=0, month=None, start=None, end=None):
+        """
+        Compute the Stochastic Oscillator (STOCH) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.stoch if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            fastk (int): The period of the fast %K (default is 5).
+            slowk (int): The period of the slow %K average (default is 3).
+            slowd (int): The period of the slow %D average (default is 3).
+            slowkma (int): The matype of the slow %K average (default is 0, SMA).
+            slowdma (int): The matype of the slow %D average (default is 0, SMA).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "SlowK" and "SlowD" columns, newest first, without the warm-up
+            rows, empty if no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().stoch(symbol, interval, fastk, slowk, slowd, slowkma, slowdma, month),
+                                start, end)
+        return self._compute("STOCH", symbol, interval, month, start, end, fastkperiod=fastk, slowkperiod=slowk,
+                             slowdperiod=slowd, slowkmatype=slowkma, slowdmatype=slowdma)
+
+    def rsi(self, symbol, interval='weekly', timep='60', series='close', month=None, start=None, end=None):
+        """
+        Compute the Relative Strength Index (RSI) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.rsi if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the index (default is 60).
+            series (str): The price type, close, open, high or low (default is 'close').
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "RSI" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().rsi(symbol, interval, timep, series, month), start, end)
+        return self._compute("RSI", symbol, interval, month, start, end, time_period=timep, series_type=series)
+
+    def adx(self, symbol, interval='weekly', timep='60', month=None, start=None, end=None):
+        """
+        Compute the Average Directional Movement Index (ADX) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.adx if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the index (default is 60).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "ADX" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().adx(symbol, interval, timep, month), start, end)
+        return self._compute("ADX", symbol, interval, month, start, end, time_period=timep)
+
+    def cci(self, symbol, interval='weekly', timep='60', month=None, start=None, end=None):
+        """
+        Compute the Commodity Channel Index (CCI) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.cci if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the index (default is 60).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "CCI" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().cci(symbol, interval, timep, month), start, end)
+        return self._compute("CCI", symbol, interval, month, start, end, time_period=timep)
+
+    def aroon(self, symbol, interval='weekly', timep='60', month=None, start=None, end=None):
+        """
+        Compute the Aroon indicator (AROON) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.aroon if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The number of bars looked back (default is 60).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "Aroon Down" and "Aroon Up" columns, newest first, without the
+            warm-up rows, empty if no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().aroon(symbol, interval, timep, month), start, end)
+        return self._compute("AROON", symbol, interval, month, start, end, time_period=timep)
+
+    def bbands(self, symbol, interval='weekly', timep=20, series='close',
+               nbdevup=2, nbdevdn=2, matype=0, month=None, start=None, end=None):
+        """
+        Compute the Bollinger Bands (BBANDS) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.bbands if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the bands (default is 20).
+            series (str): The price type, close, open, high or low (default is 'close').
+            nbdevup (int): The standard deviation multiplier of the upper band (default is 2).
+            nbdevdn (int): The standard deviation multiplier of the lower band (default is 2).
+            matype (int): The matype of the middle band (default is 0, SMA).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "Real Upper Band", "Real Middle Band" and "Real Lower Band"
+            columns, newest first, without the warm-up rows, empty if no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().bbands(symbol, interval, timep, series, nbdevup, nbdevdn, matype, month),
+                                start, end)
+        return self._compute("BBANDS", symbol, interval, month, start, end, time_period=timep, series_type=series,
+                             nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype)
+
+    def bbands_many(self, symbol, interval='weekly', timep=20, series='close', nbdevs=((2, 2),), matype=0,
+                    month=None, start=None, end=None):
+        """
+        Compute Bollinger Bands for several pairs of standard deviation multipliers from one variance pass.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            timep (int): The period of the bands (default is 20).
+            series (str): The price type, close, open, high or low (default is 'close').
+            nbdevs (list): (nbdevup, nbdevdn) pairs (default is ((2, 2),)).
+            matype (int): The matype of the middle band (default is 0, SMA).
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column, the "Real Middle Band" and one "Real Upper Band (up, dn)" and
+            "Real Lower Band (up, dn)" column per pair, newest first, without the warm-up rows.
+        """
+        def build(prices, windows):
+            middle, bands = _bbands_many(windows, str(series).lower(), _positive(timep, "time_period"), nbdevs,
+                                         int(matype))
+            df = pd.DataFrame({"time": prices.index.to_numpy(), "Real Middle Band": middle})
+            for (nbdevup, nbdevdn), (upper, lower) in bands.items():
+                df[f"Real Upper Band ({nbdevup}, {nbdevdn})"] = upper
+                df[f"Real Lower Band ({nbdevup}, {nbdevdn})"] = lower
+            return df.dropna().iloc[::-1].round(DECIMALS).reset_index(drop=True)
+
+        params = {"time_period": timep, "series_type": series, "nbdevs": tuple(map(tuple, nbdevs)), "matype": matype}
+        df = self._cached("BBANDS_MANY", symbol, interval, month, params, build)
+        if df is None:
+            return pd.DataFrame()
+        return date_slice(df, start, end, column="time").copy()
+
+    def ad(self, symbol, interval='weekly', month=None, start=None, end=None):
+        """
+        Compute the Chaikin A/D Line (AD) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.ad if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "Chaikin A/D" column, newest first, without the warm-up rows,
+            empty if no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().ad(symbol, interval, month), start, end)
+        return self._compute("AD", symbol, interval, month, start, end)
+
+    def obv(self, symbol, interval='weekly', month=None, start=None, end=None):
+        """
+        Compute the On-Balance Volume (OBV) of a stock.
+
+        Computed from the price series of the symbol, or with the API request of ApiStocksMethods.obv if the
+        instance is not local. start and end select the rows of either output.
+
+        Args:
+            symbol (str): The stock symbol (e.g., "AAPL").
+            interval (str): 1min, 5min, 15min, 30min, 60min, daily, weekly or monthly (default is 'weekly').
+            month (str, optional): The month of intraday data in the "YYYY-MM" format (default is None).
+            start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+            end (str, optional): The last date in the same format (default is None).
+
+        Returns:
+            pandas.DataFrame: A "time" column and the "OBV" column, newest first, without the warm-up rows, empty if
+            no prices were received.
+        """
+        if not self.local:
+            return self._remote(super().obv(symbol, interval, month), start, end)
+        return self._compute("OBV", symbol, interval, month, start, end)
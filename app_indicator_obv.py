@@ -10,6 +10,8 @@ Usage:
     1. Instantiate an OBVPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input OBV parameters.
     3. Click the "Submit" button to fetch and display the OBV chart.
+       With several intervals (e.g., daily,weekly,monthly) the OBV of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, and month.
     5. The "Close Window" button closes the popup window.
 
@@ -19,12 +21,15 @@ with customized parameters.
 
 import tkinter as tk
 from tkmacosx import Button as MacButton
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
-import mplfinance as mpf
+from matplotlib.dates import DateFormatter
 import re
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_chart import ChartPanel
+from app_api_csv import date_range
+from app_api_async import AsyncApiData
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class OBVPopupWindow(tk.Toplevel):
@@ -42,8 +47,9 @@ class OBVPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -55,12 +61,15 @@ class OBVPopupWindow(tk.Toplevel):
         self.chart_frame_obv = tk.Frame(self)
         self.chart_frame_stock.place(x=530, y=10, width=1050, height=515)
         self.chart_frame_obv.place(x=530, y=526, width=1050, height=350)
+        self.panel_stock = ChartPanel(self.chart_frame_stock, figsize=(12, 6))
+        self.panel_obv = ChartPanel(self.chart_frame_obv, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'OBV - On Balance Volume\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.'
@@ -131,91 +140,73 @@ class OBVPopupWindow(tk.Toplevel):
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = self.panel_stock.subplots()
+        self.panel_stock.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_stock.draw()
 
     def display_chart_obv(self, df):
         df.sort_values('time', ascending=True, inplace=True)
         df['time'] = pd.to_datetime(df['time'])
-        fig_obv, ax_obv = plt.subplots(figsize=(12, 6))
-        ax_obv.plot(df['time'], df['OBV'], color='blue', label='OBV')
+        ax_obv = self.panel_obv.subplots()
+        self.panel_obv.line(ax_obv, 'OBV', df['time'], df['OBV'], color='blue', label='OBV')
         ax_obv.grid(True)
-        ax_obv.legend()
         ax_obv.set_title('OBV Chart')
         ax_obv.set_ylabel('OBV')
+        self.panel_obv.draw(legend=True)
 
-        chart_frame = self.chart_frame_obv
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-
-        canvas_obv = tkagg.FigureCanvasTkAgg(fig_obv, master=chart_frame)
-        canvas_obv.draw()
-        canvas_obv.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        timeframe_figure(None, overlay, 'OBV', fig=self.panel_obv.clear())
+        self.panel_obv.draw()
 
     def fetch_data_for_date_range(self, symbol, interval, start_date, end_date):
-        df_obv = self.stock_data.obv(symbol=symbol, interval=interval)
-        df_interval = self.method.monthly_report(company=symbol)
-
-        df_obv_filtered = df_obv[(df_obv['time'] >= start_date) & (df_obv['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
-
-        return df_obv_filtered, df_interval_filtered
+        return (self.async_method.obv(symbol=symbol, interval=interval, start=start_date, end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("OBV", equity, intervals, start=start_date,
+                                                                   end=end_date)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_obv = self.stock_data.obv(symbol=equity, interval=interval)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_obv(df_obv)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_obv(df_obv)
-                    return
+                df_obv, df_data = yield (self.async_method.obv(symbol=equity, interval=interval),
+                                         self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_obv(df_obv)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_obv, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                         start_date=start_date, end_date=end_date)
+                    df_obv, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                               start_date=start_date, end_date=end_date)
                     self.display_chart_stock(df_interval)
                     self.display_chart_obv(df_obv)
                     return
                 else:
-                    df_obv = self.stock_data.obv(symbol=equity, interval=interval, month=date)
-                    df_obv = df_obv[df_obv['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_obv(df_obv)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_obv(df_obv)
-                        return
+                    df_obv, df_data = yield (self.async_method.obv(symbol=equity, interval=interval, month=date,
+                                                                   start=date, end=date),
+                                             self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_obv(df_obv)
+                    return
             else:
                 raise ValueError
 
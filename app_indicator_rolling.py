@@ -0,0 +1,291 @@
+"""
+app_indicator_rolling.py
+
+This module provides O(n) rolling maximum, minimum, argmax, argmin, mean and variance kernels, independent of the
+window length.
+
+The batch kernels use the van Herk/Gil-Werman block scheme: the series is cut into blocks of the window length,
+running extremes are taken forwards and backwards inside each block with NumPy, and every window is the
+combination of one backward and one forward value. For new bars arriving one at a time, MonotonicWindow keeps a
+monotonic deque with O(1) amortized work per value. A tie always resolves to the most recent position, which is
+the convention of the Aroon indicator.
+
+Functions:
+    rolling_max, rolling_min: Rolling extremes, NaN for the first window - 1 values.
+    rolling_argmax, rolling_argmin: Positions of the rolling extremes, -1 for the first window - 1 values.
+    rolling_moments: Stable rolling mean and population variance, NaN for the first window - 1 values.
+    benchmark: Measure the throughput of the kernels and of the indicators built on them.
+
+Classes:
+    MonotonicWindow: The rolling extreme of a stream of values.
+
+Example:
+    highest = rolling_max(high, 200)
+    bars_since_high = np.arange(len(high)) - rolling_argmax(high, 201)
+    mean, variance = rolling_moments(close, 20)
+    window = MonotonicWindow(14, kind="max")
+    value, position = window.push(141.2)
+"""
+
+import time
+from collections import deque
+import numpy as np
+
+
+def _blocks(values, window, fill):
+    length = len(values)
+    padded = np.full(-(-length // window) * window, fill, dtype="float64")
+    padded[:length] = values
+    return padded.reshape(-1, window)
+
+
+def _rolling_extreme(values, window, extreme, fill):
+    values = np.asarray(values, dtype="float64")
+    length = len(values)
+    out = np.full(length, np.nan)
+    if window < 1 or window > length:
+        return out
+    blocks = _blocks(values, window, fill)
+    forward = extreme.accumulate(blocks, axis=1).ravel()[:length]
+    backward = extreme.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:length]
+    out[window - 1:] = extreme(backward[:length - window + 1], forward[window - 1:])
+    return out
+
+
+def rolling_max(values, window):
+    """
+    Rolling maximum in O(n).
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        window (int): Number of values in each window.
+
+    Returns:
+        numpy.ndarray: The maximum of each window, NaN for the first window - 1 values.
+    """
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values, window):
+    """
+    Rolling minimum in O(n).
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        window (int): Number of values in each window.
+
+    Returns:
+        numpy.ndarray: The minimum of each window, NaN for the first window - 1 values.
+    """
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def rolling_moments(values, window):
+    """
+    Rolling mean and population variance in O(n), numerically stable.
+
+    Running sums of squares over the whole series lose every significant digit once the level of the prices is
+    large against their spread. Here each block is shifted by its first value before its sums are taken, so the
+    sums only ever span one window, and each window merges the tail of one block with the head of the next
+    with the pairwise update of Chan et al. (the batch form of Welford's algorithm).
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        window (int): Number of values in each window.
+
+    Returns:
+        tuple: (mean, variance) arrays, NaN for the first window - 1 values.
+    """
+    values = np.asarray(values, dtype="float64")
+    length = len(values)
+    mean, variance = np.full(length, np.nan), np.full(length, np.nan)
+    if window < 1 or window > length:
+        return mean, variance
+    blocks = _blocks(values, window, 0.0)
+    shift = blocks[:, :1]
+    blocks = np.where(np.arange(blocks.size).reshape(blocks.shape) < length, blocks - shift, 0.0)
+    counts = np.arange(1, window + 1, dtype="float64")
+
+    def moments(shifted):
+        sums = np.cumsum(shifted, axis=1)
+        squares = np.cumsum(shifted * shifted, axis=1)
+        return shift + sums / counts, squares - sums * sums / counts
+
+    head_mean, head_m2 = (part.ravel()[:length] for part in moments(blocks))
+    tail_mean, tail_m2 = (part[:, ::-1].ravel()[:length] for part in moments(blocks[:, ::-1]))
+    start = length - window + 1
+    tail_count = (window - np.arange(start) % window) % window
+    head_count = window - tail_count
+    head_mean, head_m2 = head_mean[window - 1:], head_m2[window - 1:]
+    tail_mean, tail_m2 = tail_mean[:start], tail_m2[:start]
+    delta = np.where(tail_count > 0, head_mean - tail_mean, 0.0)
+    mean[window - 1:] = np.where(tail_count > 0, tail_mean + delta * head_count / window, head_mean)
+    m2 = np.where(tail_count > 0, tail_m2 + head_m2 + delta * delta * tail_count * head_count / window, head_m2)
+    variance[window - 1:] = np.clip(m2 / window, 0, None)
+    return mean, variance
+
+
+def rolling_argmax(values, window):
+    """
+    Position of the rolling maximum in O(n). A tie resolves to the most recent position.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        window (int): Number of values in each window.
+
+    Returns:
+        numpy.ndarray: The int64 position of the maximum of each window in the series, -1 for the first
+        window - 1 values.
+    """
+    values = np.asarray(values, dtype="float64")
+    length = len(values)
+    out = np.full(length, -1, dtype="int64")
+    if window < 1 or window > length:
+        return out
+    blocks = _blocks(values, window, -np.inf)
+    positions = np.arange(blocks.size).reshape(blocks.shape)
+    forward = np.maximum.accumulate(blocks, axis=1)
+    # Forward: the latest position in the block so far that equals the running maximum.
+    forward_position = np.maximum.accumulate(np.where(blocks == forward, positions, -1), axis=1)
+    backward = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+    # Backward: the earliest position that is greater than everything after it, i.e. the latest maximum.
+    following = np.concatenate([backward[:, 1:], np.full((len(blocks), 1), -np.inf)], axis=1)
+    latest = np.where(blocks > following, positions, blocks.size)
+    backward_position = np.minimum.accumulate(latest[:, ::-1], axis=1)[:, ::-1]
+    forward, forward_position = forward.ravel()[:length], forward_position.ravel()[:length]
+    backward, backward_position = backward.ravel()[:length], backward_position.ravel()[:length]
+    start = length - window + 1
+    out[window - 1:] = np.where(forward[window - 1:] >= backward[:start],
+                                forward_position[window - 1:], backward_position[:start])
+    return out
+
+
+def rolling_argmin(values, window):
+    """
+    Position of the rolling minimum in O(n). A tie resolves to the most recent position.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        window (int): Number of values in each window.
+
+    Returns:
+        numpy.ndarray: The int64 position of the minimum of each window in the series, -1 for the first
+        window - 1 values.
+    """
+    return rolling_argmax(-np.asarray(values, dtype="float64"), window)
+
+
+class MonotonicWindow:
+    def __init__(self, window, kind="max"):
+        """
+        Initialize a new instance of the MonotonicWindow class.
+
+        Args:
+            window (int): Number of values in the window.
+            kind (str): "max" or "min" (default is "max").
+
+        Usage:
+            highest = MonotonicWindow(14, kind="max")
+            value, position = highest.push(bar["high"])
+        """
+        if kind not in ("max", "min"):
+            raise ValueError("kind has to be 'max' or 'min'")
+        self.window = window
+        self.kind = kind
+        self.position = -1
+        self.candidates = deque()
+
+    def push(self, value):
+        """
+        Add the next value of the stream.
+
+        Args:
+            value (float): The new value.
+
+        Returns:
+            tuple: (extreme, position) of the current window, position counts from the first value pushed.
+        """
+        self.position += 1
+        if self.kind == "max":
+            while self.candidates and self.candidates[-1][1] <= value:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] >= value:
+                self.candidates.pop()
+        self.candidates.append((self.position, value))
+        if self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+        return self.candidates[0][1], self.candidates[0][0]
+
+    @property
+    def full(self):
+        return self.position >= self.window - 1
+
+    def to_dict(self):
+        """
+        Serialize the window.
+
+        Returns:
+            dict: The window length, the kind, the position and the candidates, all JSON compatible.
+        """
+        return {"window": self.window, "kind": self.kind, "position": self.position,
+                "candidates": [list(candidate) for candidate in self.candidates]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a window from the output of to_dict().
+
+        Args:
+            data (dict): The serialized window.
+
+        Returns:
+            MonotonicWindow: The restored window.
+        """
+        window = cls(data["window"], data["kind"])
+        window.position = data["position"]
+        window.candidates = deque(tuple(candidate) for candidate in data["candidates"])
+        return window
+
+
+def benchmark(bars=1_000_000, window=200, repeat=3):
+    """
+    Measure the throughput of the rolling kernels and of the indicators built on them.
+
+    Args:
+        bars (int): Length of the random walk series (default is 1,000,000).
+        window (int): The window length (default is 200).
+        repeat (int): The best of this many runs is reported (default is 3).
+
+    Returns:
+        dict: Million bars per second of each kernel and indicator.
+    """
+    from app_indicator_engine import aroon, stoch, williams_r, donchian, bbands_many
+    random = np.random.RandomState(0)
+    close = 100 + np.cumsum(random.normal(0, 1, bars))
+    high = close + np.abs(random.normal(0, 1, bars))
+    low = close - np.abs(random.normal(0, 1, bars))
+    cases = {"rolling_max": lambda: rolling_max(high, window),
+             "rolling_min": lambda: rolling_min(low, window),
+             "rolling_argmax": lambda: rolling_argmax(high, window),
+             "rolling_argmin": lambda: rolling_argmin(low, window),
+             "rolling_moments": lambda: rolling_moments(close, window),
+             "aroon": lambda: aroon(high, low, window),
+             "stoch": lambda: stoch(high, low, close, window, 3, 3),
+             "williams_r": lambda: williams_r(high, low, close, window),
+             "donchian": lambda: donchian(high, low, window),
+             "bbands_many": lambda: bbands_many(close, window, [(1, 1), (2, 2), (3, 3)])}
+    results = {}
+    for name, case in cases.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case()
+            best = min(best, time.perf_counter() - start)
+        results[name] = bars / best / 1e6
+    return results
+
+
+if __name__ == "__main__":
+    for name, throughput in benchmark().items():
+        print(f"{name:15s} {throughput:8.1f} M bars/s")
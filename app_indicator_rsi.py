@@ -10,6 +10,9 @@ Usage:
     1. Instantiate an RSIPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input RSI parameters.
     3. Click the "Submit" button to fetch and display the RSI chart.
+       Or click "Period Sweep" to see the RSI of every period from 2 to 200 as a heatmap.
+       With several intervals (e.g., daily,weekly,monthly) the RSI of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, data points, and price type.
     5. The "Close Window" button closes the popup window.
 
@@ -20,12 +23,17 @@ with customized parameters.
 import tkinter as tk
 from tkmacosx import Button as MacButton
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.backends.backend_tkagg as tkagg
-import mplfinance as mpf
+from matplotlib.dates import DateFormatter
 import re
-from app_mixed_methods import Methods, pd
-from app_api_stocks_requests import ApiDataStocks
+from app_mixed_methods import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_chart import ChartPanel
+from app_indicator_signals import SIGNALS, evaluate, plot_signals
+from app_indicator_sweep import sweep, sweep_figure, SWEEP_PERIODS
+from app_api_csv import date_slice, date_range
+from app_api_async import AsyncApiData, run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class RSIPopupWindow(tk.Toplevel):
@@ -43,8 +51,9 @@ class RSIPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -56,12 +65,15 @@ class RSIPopupWindow(tk.Toplevel):
         self.chart_frame_rsi = tk.Frame(self)
         self.chart_frame_stock.place(x=530, y=10, width=1050, height=515)
         self.chart_frame_rsi.place(x=530, y=526, width=1050, height=350)
+        self.panel_stock = ChartPanel(self.chart_frame_stock, figsize=(12, 6))
+        self.panel_rsi = ChartPanel(self.chart_frame_rsi, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'RSI - Relative Strength Index\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -124,6 +136,9 @@ class RSIPopupWindow(tk.Toplevel):
         submit_button = MacButton(self, text="Submit", font=self.font, justify="center", command=self.refresh_results)
         close_button.place(x=150, y=775, width=266, height=55)
         submit_button.place(x=150, y=705, width=266, height=55)
+        sweep_button = MacButton(self, text="Period Sweep", font=self.font, justify="center",
+                                 command=self.sweep_results)
+        sweep_button.place(x=150, y=840, width=266, height=35)
 
     def on_entry_focus_in1(self, event):
         if self.entry_var1.get() == "Price Type":
@@ -168,100 +183,86 @@ class RSIPopupWindow(tk.Toplevel):
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = self.panel_stock.subplots()
+        self.panel_stock.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_stock.draw()
 
     def display_chart_rsi(self, df):
         df.sort_values('time', ascending=True, inplace=True)
         df['time'] = pd.to_datetime(df['time'])
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.plot(df['time'], df['RSI'], color='blue', label='RSI')
+        ax = self.panel_rsi.subplots()
+        self.panel_rsi.line(ax, 'RSI', df['time'], df['RSI'], color='blue', label='RSI')
+        for level in (30, 70):
+            self.panel_rsi.hline(ax, level, level, color='grey', linestyle='--', linewidth=1)
+        plot_signals(ax, evaluate(df, SIGNALS["RSI"]), panel=self.panel_rsi)
         ax.grid(True)
-        ax.legend()
         ax.set_title('RSI Chart')
         ax.set_ylabel('%')
-        ymin, ymax = ax.get_ylim()
-        ax.set_ylim(ymin, ymax)
         max_visible_ticks = 8
         ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
-        chart_frame = self.chart_frame_rsi
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.panel_rsi.draw(legend=True)
 
-    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep, pricet):
-        df_rsi = self.stock_data.rsi(symbol=symbol, interval=interval, timep=timep, series=pricet)
-        df_interval = self.method.monthly_report(company=symbol)
-
-        df_rsi_filtered = df_rsi[(df_rsi['time'] >= start_date) & (df_rsi['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        timeframe_figure(None, overlay, 'RSI', fig=self.panel_rsi.clear())
+        self.panel_rsi.draw()
 
-        return df_rsi_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, symbol, interval, start_date, end_date, timep, pricet):
+        return (self.async_method.rsi(symbol=symbol, interval=interval, timep=timep, series=pricet, start=start_date,
+                                      end=end_date),
+                self.async_method.report(symbol, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
             price_set = {'close', 'open', 'low', 'high'}
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
             timep = int(self.entry_var2.get().strip())
             pricet = self.entry_var1.get().strip()
             if pricet.lower() not in price_set:
                 raise ValueError
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("RSI", equity, intervals, start=start_date,
+                                                                   end=end_date, time_period=timep, series_type=pricet)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_rsi = self.stock_data.rsi(symbol=equity, interval=interval, timep=timep, series=pricet)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_rsi(df_rsi)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_rsi(df_rsi)
-                    return
+                df_rsi, df_data = yield (self.async_method.rsi(symbol=equity, interval=interval, timep=timep,
+                                                               series=pricet),
+                                         self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_rsi(df_rsi)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_rsi, df_interval = self.fetch_data_for_date_range(symbol=equity, interval=interval,
-                                                                         start_date=start_date, end_date=end_date,
-                                                                         timep=timep, pricet=pricet)
+                    df_rsi, df_interval = yield self.fetch_data_for_date_range(symbol=equity, interval=interval,
+                                                                               start_date=start_date, end_date=end_date,
+                                                                               timep=timep, pricet=pricet)
                     self.display_chart_stock(df_interval)
                     self.display_chart_rsi(df_rsi)
                     return
                 else:
-                    df_rsi = self.stock_data.rsi(symbol=equity, interval=interval, month=date,
-                                                 timep=timep, series=pricet)
-                    df_rsi = df_rsi[df_rsi['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_rsi(df_rsi)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_rsi(df_rsi)
-                        return
+                    df_rsi, df_data = yield (self.async_method.rsi(symbol=equity, interval=interval, month=date,
+                                                                   timep=timep, series=pricet, start=date, end=date),
+                                             self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_rsi(df_rsi)
+                    return
             else:
                 raise ValueError
         except ValueError:
@@ -270,3 +271,43 @@ class RSIPopupWindow(tk.Toplevel):
         except KeyError:
             self.label_message['fg'] = "red"
             self.label_message['text'] = 'No Data Found\n Check Entries'
+
+    def display_chart_sweep(self, grid):
+        sweep_figure(grid, 'RSI', fig=self.panel_rsi.clear())
+        self.panel_rsi.draw()
+
+    @background_task
+    def sweep_results(self):
+        try:
+            self.label_message['fg'] = "#0E82D3"
+            self.label_message['text'] = 'Enter Information and Submit to See Results'
+            price_set = {'close', 'open', 'low', 'high'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
+            equity = self.entry_var5.get().strip().upper()
+            interval = self.entry_var4.get().strip()
+            if interval not in valid_intervals:
+                raise ValueError
+            date = self.entry_var3.get().strip()
+            pricet = self.entry_var1.get().strip()
+            if pricet.lower() not in price_set:
+                raise ValueError
+            prices = yield self.async_method.prices(equity, interval)
+            grid = yield run_in_thread(sweep, "RSI", prices, SWEEP_PERIODS, series_type=pricet)
+            if date != "Date":
+                date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
+                if not re.match(date_pattern, date):
+                    raise ValueError
+                if "/" in date:
+                    start_date, end_date = date.split("/")
+                    grid = date_slice(grid, start_date, end_date)
+                else:
+                    grid = date_slice(grid, date, date)
+            if grid.dropna(how="all").empty:
+                raise KeyError
+            self.display_chart_sweep(grid)
+        except ValueError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'Invalid Entry'
+        except KeyError:
+            self.label_message['fg'] = "red"
+            self.label_message['text'] = 'No Data Found\n Check Entries'
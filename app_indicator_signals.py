@@ -0,0 +1,259 @@
+"""
+app_indicator_signals.py
+
+This module turns indicator outputs into crossover and threshold events, such as RSI crossing 30 or 70, SlowK
+crossing SlowD, the close leaving the Bollinger Bands, +DI crossing -DI and Aroon Up crossing Aroon Down.
+
+A crossing is a change of the sign of the distance between two series, or between a series and a level. Bars on
+which the distance is exactly zero or unknown (warm-up) keep the previous sign, so touching a level and turning
+back is not a crossing. The batch evaluation finds every crossing of a history with NumPy, and SignalMonitor
+gives the same events bar by bar for new bars, e.g. next to the streaming indicators.
+
+The events are plain tables with the time, the signal name, the direction ("up" or "down"), the value that
+crossed, the level it crossed and the close, newest first like the indicator outputs. The charts draw them as
+markers and AlertSystem sends the new ones by email.
+
+Classes:
+    Cross: A signal that fires when a series crosses another series or a fixed level.
+    SignalMonitor: Incremental evaluation of signals on new bars.
+
+Functions:
+    evaluate: Find the crossings of signals in an indicator frame.
+    compute_signals: Compute an indicator from OHLCV prices and find the crossings of its signals.
+    plot_signals: Draw events as markers on a chart.
+
+Example:
+    events = compute_signals(weekly_prices, "RSI", time_period=14)
+    events = evaluate(df_stoch, SIGNALS["STOCH"])
+    monitor = SignalMonitor(SIGNALS["STOCH"]).seed(df_stoch)
+    new_events = monitor.update({"SlowK": 81.2, "SlowD": 79.5}, time="2023-09-15")
+"""
+
+import numpy as np
+import pandas as pd
+from app_indicator_engine import SharedWindows, COLUMNS, _compute
+from app_api_csv import date_slice
+
+EVENT_COLUMNS = ["time", "signal", "direction", "value", "level", "close"]
+
+
+class Cross:
+    def __init__(self, name, series, level):
+        """
+        Initialize a new instance of the Cross class.
+
+        Args:
+            name (str): The name of the signal in the events (e.g., "RSI 70").
+            series (str): The column that crosses (e.g., "RSI").
+            level (str or float): The column or the fixed level it crosses (e.g., "SlowD" or 70).
+
+        Usage:
+            overbought = Cross("RSI 70", "RSI", 70)
+            events = evaluate(df_rsi, [overbought])
+        """
+        self.name = name
+        self.series = series
+        self.level = level
+
+    def values(self, row):
+        """
+        The series and the level in a frame or in the values of one bar.
+
+        Args:
+            row (pandas.DataFrame or dict): The indicator columns.
+
+        Returns:
+            tuple: (series, level) values, float arrays for a frame.
+        """
+        level = row[self.level] if isinstance(self.level, str) else self.level
+        if isinstance(row, pd.DataFrame):
+            series = row[self.series].to_numpy(dtype="float64")
+            return series, np.broadcast_to(np.asarray(level, dtype="float64"), series.shape)
+        return float(row[self.series]), float(level)
+
+
+SIGNALS = {"RSI": [Cross("RSI 30", "RSI", 30), Cross("RSI 70", "RSI", 70)],
+           "STOCH": [Cross("SlowK/SlowD", "SlowK", "SlowD")],
+           "BBANDS": [Cross("Close/Upper Band", "close", "Real Upper Band"),
+                      Cross("Close/Lower Band", "close", "Real Lower Band")],
+           "ADX": [Cross("+DI/-DI", "PLUS_DI", "MINUS_DI")],
+           "AROON": [Cross("Aroon Up/Down", "Aroon Up", "Aroon Down")]}
+# The engine functions whose outputs the signals of an indicator read.
+SIGNAL_INPUTS = {"RSI": ["RSI"], "STOCH": ["STOCH"], "BBANDS": ["BBANDS"], "ADX": ["ADX", "PLUS_DI", "MINUS_DI"],
+                 "AROON": ["AROON"]}
+
+
+def _crossings(distance):
+    """
+    Positions where the sign of the distance changes, with +1 for up and -1 for down.
+    """
+    sign = np.sign(distance)
+    known = ~np.isnan(sign) & (sign != 0)
+    # The last known sign at every position, NaN before the first one.
+    last = np.maximum.accumulate(np.where(known, np.arange(len(sign)), -1))
+    previous = np.where(last >= 0, sign[np.clip(last, 0, None)], np.nan)
+    positions = np.flatnonzero(known[1:] & (sign[1:] != previous[:-1]) & ~np.isnan(previous[:-1])) + 1
+    return positions, sign[positions]
+
+
+def _events(rows):
+    events = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+    return events.sort_values("time", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def evaluate(frame, signals):
+    """
+    Find the crossings of signals in an indicator frame.
+
+    Args:
+        frame (pandas.DataFrame): The indicator columns, with a "time" column like the API output or indexed by
+        timestamp, in any order. A "close" column is needed by the Bollinger Band signals.
+        signals (list): The Cross signals, e.g. SIGNALS["RSI"].
+
+    Returns:
+        pandas.DataFrame: One row per crossing with the EVENT_COLUMNS, newest first.
+    """
+    if "time" in frame.columns:
+        frame = frame.set_index("time")
+    frame = frame.sort_index()
+    times = frame.index.to_numpy()
+    close = frame["close"].to_numpy(dtype="float64") if "close" in frame.columns else np.full(len(frame), np.nan)
+    parts = []
+    for signal in signals:
+        series, level = signal.values(frame)
+        positions, directions = _crossings(series - level)
+        parts.append(pd.DataFrame({"time": times[positions], "signal": signal.name,
+                                   "direction": np.where(directions > 0, "up", "down"),
+                                   "value": series[positions], "level": level[positions],
+                                   "close": close[positions]}))
+    return _events(pd.concat(parts, ignore_index=True) if parts else None)
+
+
+def compute_signals(prices, function, start=None, end=None, **params):
+    """
+    Compute an indicator from OHLCV prices and find the crossings of its signals.
+
+    The whole history is evaluated, so the first event after start is found even when it needs older bars.
+
+    Args:
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        function (str): One of SIGNALS (e.g., "RSI"), ADX gives the +DI/-DI crossings.
+        start (str, optional): The first date in the "YYYY-MM-DD, YYYY-MM or YYYY" format (default is None).
+        end (str, optional): The last date in the same format (default is None).
+        **params: The API parameters of the indicator, see compute_indicator.
+
+    Returns:
+        pandas.DataFrame: One row per crossing with the EVENT_COLUMNS, newest first.
+
+    Raises:
+        ValueError: If the function has no signals or a parameter is invalid.
+    """
+    function = function.upper()
+    if function not in SIGNALS:
+        raise ValueError(f"{function} has no signals")
+    prices = prices.sort_index()
+    if prices.empty:
+        return _events(None)
+    windows = SharedWindows(prices)
+    columns = {"close": windows.column("close")}
+    for name in SIGNAL_INPUTS[function]:
+        columns.update(zip(COLUMNS[name], _compute(windows, name, params)))
+    events = evaluate(pd.DataFrame(columns, index=prices.index), SIGNALS[function])
+    return date_slice(events, start, end, column="time")
+
+
+class SignalMonitor:
+    def __init__(self, signals):
+        """
+        Initialize a new instance of the SignalMonitor class.
+
+        The monitor keeps the last known sign of every signal, so each new bar is evaluated in O(1) and gives the
+        same events as evaluate() over the whole history.
+
+        Args:
+            signals (list): The Cross signals, e.g. SIGNALS["STOCH"].
+
+        Usage:
+            monitor = SignalMonitor(SIGNALS["RSI"]).seed(df_rsi)
+            for event in monitor.update({"RSI": rsi.update(bar, time)}, time):
+                alert.send_alert(event["close"])
+        """
+        self.signals = list(signals)
+        self.signs = {signal.name: None for signal in self.signals}
+        self.last_time = None
+
+    def update(self, values, time=None):
+        """
+        Evaluate the signals on the indicator values of a new bar.
+
+        Args:
+            values (dict or pandas.Series): The indicator columns of the bar, and its "close" if known. Missing
+            values (None or NaN) keep the previous state.
+            time (str or pandas.Timestamp, optional): The time of the bar. Bars that are not newer than the
+            last one are ignored (default is None, always evaluate).
+
+        Returns:
+            list: The events of the bar as dicts with the EVENT_COLUMNS keys.
+        """
+        if time is not None:
+            time = pd.Timestamp(time)
+            if self.last_time is not None and time <= self.last_time:
+                return []
+            self.last_time = time
+        events = []
+        for signal in self.signals:
+            try:
+                series, level = signal.values(values)
+            except (KeyError, TypeError):
+                continue
+            distance = series - level
+            if np.isnan(distance) or distance == 0:
+                continue
+            sign = 1 if distance > 0 else -1
+            previous, self.signs[signal.name] = self.signs[signal.name], sign
+            if previous is not None and previous != sign:
+                close = values.get("close")
+                events.append({"time": time, "signal": signal.name, "direction": "up" if sign > 0 else "down",
+                               "value": series, "level": level, "close": np.nan if close is None else float(close)})
+        return events
+
+    def seed(self, frame):
+        """
+        Feed the history of the indicator into the monitor.
+
+        Args:
+            frame (pandas.DataFrame): The indicator columns, with a "time" column or indexed by timestamp.
+
+        Returns:
+            SignalMonitor: The monitor itself.
+        """
+        if "time" in frame.columns:
+            frame = frame.set_index("time")
+        frame = frame.sort_index()
+        for time, row in zip(frame.index, frame.to_dict("records")):
+            self.update(row, time=time)
+        return self
+
+
+def plot_signals(ax, events, column="value", panel=None):
+    """
+    Draw events as markers, green triangles up and red triangles down.
+
+    Args:
+        ax (matplotlib.axes.Axes): The chart.
+        events (pandas.DataFrame): The output of evaluate() or compute_signals().
+        column (str): The event column of the marker height, "value", "level" or "close" (default is "value").
+        panel (ChartPanel, optional): The panel of the chart, which updates the markers of the previous events in
+        place (default is None, new markers are added to the axes).
+    """
+    for direction, marker, color in (("up", "^", "green"), ("down", "v", "red")):
+        selected = events[events["direction"] == direction]
+        if selected.empty:
+            continue
+        if panel is not None:
+            panel.line(ax, f'Cross {direction}', pd.to_datetime(selected["time"]), selected[column],
+                       linestyle='none', marker=marker, color=color, markersize=8, zorder=3,
+                       label=f'Cross {direction}')
+        else:
+            ax.scatter(pd.to_datetime(selected["time"]), selected[column], marker=marker, color=color, s=60,
+                       zorder=3, label=f'Cross {direction}')
@@ -10,23 +10,32 @@ Usage:
     1. Instantiate an STOCHPopupWindow object with a master Tkinter window and a title.
     2. Use the GUI to input STOCH parameters.
     3. Click the "Submit" button to fetch and display the STOCH chart.
+       With several intervals (e.g., daily,weekly,monthly) the STOCH of each is drawn on one chart,
+       aligned on the bars of the finest interval.
     4. Optionally, provide parameters for equity or currency pair, interval, month, fastk, slowk, slowd,
        slowkma, slowdma, and chart type.
     5. The "Close Window" button closes the popup window.
 
+The charts are built and rasterized on a worker thread by a ChartRenderer, so the window stays responsive
+while they are drawn, and a new submit replaces a chart that is still being drawn.
+
 The class provides a user-friendly interface for exploring Stochastic Oscillator (STOCH) charts
 with customized parameters.
 """
 
 import tkinter as tk
 from tkmacosx import Button as MacButton
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import matplotlib.ticker as ticker
-import mplfinance as mpf
 import re
-from app_api_stocks_requests import ApiDataStocks, pd
-from app_mixed_methods import Methods
+from app_api_stocks_requests import pd
+from app_indicator_engine import LocalIndicators
+from app_indicator_timeframes import timeframe_figure
+from app_tkinter_render import ChartRenderer
+from app_indicator_signals import SIGNALS, evaluate, plot_signals
+from app_api_csv import date_range
+from app_api_async import AsyncApiData
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class STOCHPopupWindow(tk.Toplevel):
@@ -44,8 +53,9 @@ class STOCHPopupWindow(tk.Toplevel):
         self.resizable(width=False, height=False)
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
-        self.method = Methods()
-        self.stock_data = ApiDataStocks()
+        self.stock_data = LocalIndicators(base="daily")
+        self.async_method = AsyncApiData(self.stock_data)
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -57,6 +67,8 @@ class STOCHPopupWindow(tk.Toplevel):
         self.chart_frame_stoch = tk.Frame(self)
         self.chart_frame_stock.place(x=720, y=10, width=900, height=515)
         self.chart_frame_stoch.place(x=720, y=526, width=900, height=350)
+        self.render_stock = ChartRenderer(self.chart_frame_stock, figsize=(12, 6), on_error=self.on_chart_error)
+        self.render_stoch = ChartRenderer(self.chart_frame_stoch, figsize=(10, 5), on_error=self.on_chart_error)
 
         # BUTTON
         close_button = MacButton(self, text="Close Window", font=self.font, justify="center", command=self.destroy)
@@ -68,7 +80,8 @@ class STOCHPopupWindow(tk.Toplevel):
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
         label['text'] = f'STOCH - Stochastic Oscillator\n\n' \
                         f'1. Equity or Forex pair (IBM or USDEUR)\n\n' \
-                        f'2. Interval = weekly, monthly\n\n' \
+                        f'2. Interval = daily, weekly, monthly, or several\n' \
+                        f'to overlay them (e.g., daily,weekly,monthly)\n\n' \
                         f'3. For example, date=2009-01 or date=2009,\n' \
                         f'or date interval 2009-01/2012-01.\nAny month equal to or\n' \
                         f'later than 2000-01 (January 2000) is supported.\n\n' \
@@ -249,71 +262,75 @@ class STOCHPopupWindow(tk.Toplevel):
         elif self.checkbox_state2.get() == 0:
             self.checkbox1.config(state=tk.NORMAL)
 
+    def on_chart_error(self, error):
+        self.label_message['fg'] = "red"
+        self.label_message['text'] = 'No Data Found\n Check Entries' if isinstance(error, KeyError) else 'Invalid Entry'
+
     def display_chart_stock(self, df_data):
         df_data.index = pd.to_datetime(df_data.index)
+        self.render_stock.submit(self.draw_chart_stock, df_data)
+
+    @staticmethod
+    def draw_chart_stock(panel, df_data):
         df_sorted = df_data.sort_index()
-        fig, ax = plt.subplots(figsize=(10, 5))
-        mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=0, datetime_format="%Y-%m-%d", ax=ax)
+        ax = panel.subplots()
+        panel.candles(ax, 'Stock', df_sorted)
         ax.grid(True)
-        ax.yaxis.tick_left()
-        ax.yaxis.set_label_position("left")
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         ax.set_title('Stock Chart')
-        chart_frame = self.chart_frame_stock
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        panel.draw()
 
     def display_chart_stoch(self, df):
+        line, area = self.checkbox_state1.get() == 1, self.checkbox_state2.get() == 1
+        if line or area:
+            self.render_stoch.submit(self.draw_chart_stoch, df, line, area)
+
+    @staticmethod
+    def draw_chart_stoch(panel, df, line, area):
         df.sort_values('time', ascending=True, inplace=True)
-        chart_frame = self.chart_frame_stoch
-        if self.checkbox_state1.get() == 1:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.plot(df['time'], df['SlowK'], color='blue', label='SlowK')
-            ax.plot(df['time'], df['SlowD'], color='red', label='SlowD')
-            ax.legend()
+        if line:
+            ax = panel.subplots()
+            panel.line(ax, 'SlowK', df['time'], df['SlowK'], color='blue', label='SlowK')
+            panel.line(ax, 'SlowD', df['time'], df['SlowD'], color='red', label='SlowD')
+            plot_signals(ax, evaluate(df, SIGNALS["STOCH"]), panel=panel)
             ax.set_title('STOCH Indicator Chart')
             ax.set_ylabel('STOCH Values')
             ax.grid(True)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(ticker.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        if self.checkbox_state2.get() == 1:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.fill_between(df['time'], df['SlowK'], df['SlowD'], color='blue', alpha=0.5, label='STOCH Area')
-            ax.legend()
+            panel.draw(legend=True)
+        if area:
+            ax = panel.subplots()
+            panel.fill(ax, 'STOCH Area', df['time'], df['SlowK'], df['SlowD'], color='blue', alpha=0.5,
+                       label='STOCH Area')
             ax.set_title('STOCH Indicator Area Chart')
             ax.set_ylabel('STOCH Values')
             ax.grid(True)
             max_visible_ticks = 8
             ax.xaxis.set_major_locator(ticker.MaxNLocator(max_visible_ticks))
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            panel.draw(legend=True)
 
-    def fetch_data_for_date_range(self, equity, interval, start_date, end_date, fastkperiod, slowkperiod,
-                                  slowdperiod, slowkmatype, slowdmatype):
-        df_stoch = self.stock_data.stoch(symbol=equity, interval=interval, fastk=fastkperiod, slowk=slowkperiod,
-                                         slowd=slowdperiod, slowkma=slowkmatype, slowdma=slowdmatype, month=start_date)
-        df_interval = self.method.monthly_report(company=equity)
+    def display_chart_timeframes(self, bars, overlay):
+        self.display_chart_stock(bars)
+        self.render_stoch.submit(self.draw_chart_timeframes, overlay)
 
-        df_stoch_filtered = df_stoch[(df_stoch['time'] >= start_date) & (df_stoch['time'] <= end_date)]
-        df_interval_filtered = df_interval[(df_interval.index >= start_date) & (df_interval.index <= end_date)]
+    @staticmethod
+    def draw_chart_timeframes(panel, overlay):
+        timeframe_figure(None, overlay, 'STOCH', fig=panel.clear())
 
-        return df_stoch_filtered, df_interval_filtered
+    def fetch_data_for_date_range(self, equity, interval, start_date, end_date, fastkperiod, slowkperiod,
+                                  slowdperiod, slowkmatype, slowdmatype):
+        return (self.async_method.stoch(symbol=equity, interval=interval, fastk=fastkperiod, slowk=slowkperiod,
+                                        slowd=slowdperiod, slowkma=slowkmatype, slowdma=slowdmatype, month=start_date,
+                                        start=start_date, end=end_date),
+                self.async_method.report(equity, interval, start=start_date, end=end_date))
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
-            valid_intervals = {'weekly', 'monthly'}
+            valid_intervals = {'daily', 'weekly', 'monthly'}
             slowdmatype = self.entry_var10.get().strip()
             slowkmatype = self.entry_var9.get().strip()
             slowdperiod = self.entry_var8.get().strip()
@@ -321,53 +338,53 @@ class STOCHPopupWindow(tk.Toplevel):
             fastkperiod = self.entry_var6.get().strip()
             equity = self.entry_var5.get().strip().upper()
             interval = self.entry_var4.get().strip()
-            if interval not in valid_intervals:
+            intervals = [item.strip() for item in interval.split(",")]
+            if not set(intervals) <= valid_intervals:
                 raise ValueError
             date = self.entry_var3.get().strip()
+            if len(intervals) > 1:
+                start_date, end_date = date_range(None if date == "Date" else date)
+                bars, overlay = yield self.async_method.timeframes("STOCH", equity, intervals, start=start_date,
+                                                                   end=end_date, fastkperiod=fastkperiod,
+                                                                   slowkperiod=slowkperiod, slowdperiod=slowdperiod,
+                                                                   slowkmatype=slowkmatype, slowdmatype=slowdmatype)
+                self.display_chart_timeframes(bars, overlay)
+                return
             if date == "Date":
-                df_stoch = self.stock_data.stoch(symbol=equity, interval=interval, fastk=fastkperiod, slowk=slowkperiod,
-                                                 slowd=slowdperiod, slowkma=slowkmatype,
-                                                 slowdma=slowdmatype, month=date)
-                if interval == "weekly":
-                    df_data = self.method.weekly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_stoch(df_stoch)
-                    return
-                else:
-                    df_data = self.method.monthly_report(company=equity)
-                    self.display_chart_stock(df_data)
-                    self.display_chart_stoch(df_stoch)
-                    return
+                df_stoch, df_data = yield (self.async_method.stoch(symbol=equity, interval=interval, fastk=fastkperiod,
+                                                                   slowk=slowkperiod, slowd=slowdperiod,
+                                                                   slowkma=slowkmatype, slowdma=slowdmatype,
+                                                                   month=date),
+                                           self.async_method.report(equity, interval))
+                self.display_chart_stock(df_data)
+                self.display_chart_stoch(df_stoch)
+                return
             date_pattern = r"^(?:\d{4}|\d{4}-\d{2})(?:\/(?:\d{4}|\d{4}-\d{2}))?$"
             if re.match(date_pattern, date):
                 date_pattern_split = r'^\d{4}(?:-\d{2})?/\d{4}(?:-\d{2})?$'
                 if re.match(date_pattern_split, date):
                     start_date, end_date = date.split("/")
-                    df_stoch, df_interval = self.fetch_data_for_date_range(equity=equity, interval=interval,
-                                                                           start_date=start_date, end_date=end_date,
-                                                                           slowdmatype=slowdmatype,
-                                                                           slowkmatype=slowkmatype,
-                                                                           slowdperiod=slowdperiod,
-                                                                           slowkperiod=slowkperiod,
-                                                                           fastkperiod=fastkperiod)
+                    df_stoch, df_interval = yield self.fetch_data_for_date_range(equity=equity, interval=interval,
+                                                                                 start_date=start_date,
+                                                                                 end_date=end_date,
+                                                                                 slowdmatype=slowdmatype,
+                                                                                 slowkmatype=slowkmatype,
+                                                                                 slowdperiod=slowdperiod,
+                                                                                 slowkperiod=slowkperiod,
+                                                                                 fastkperiod=fastkperiod)
                     self.display_chart_stock(df_interval)
                     self.display_chart_stoch(df_stoch)
                     return
                 else:
-                    df_stoch = self.stock_data.stoch(symbol=equity, interval=interval, fastk=fastkperiod,
-                                                     slowk=slowkperiod, slowd=slowdperiod, slowkma=slowkmatype,
-                                                     slowdma=slowdmatype, month=date)
-                    df_stoch = df_stoch[df_stoch['time'].str.startswith(date)]
-                    if interval == "weekly":
-                        df_data = self.method.weekly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_stoch(df_stoch)
-                        return
-                    else:
-                        df_data = self.method.monthly_report(company=equity, date=date)
-                        self.display_chart_stock(df_data)
-                        self.display_chart_stoch(df_stoch)
-                        return
+                    df_stoch, df_data = yield (self.async_method.stoch(symbol=equity, interval=interval,
+                                                                       fastk=fastkperiod, slowk=slowkperiod,
+                                                                       slowd=slowdperiod, slowkma=slowkmatype,
+                                                                       slowdma=slowdmatype, month=date, start=date,
+                                                                       end=date),
+                                               self.async_method.report(equity, interval, date=date))
+                    self.display_chart_stock(df_data)
+                    self.display_chart_stoch(df_stoch)
+                    return
             else:
                 raise ValueError
         except ValueError:
@@ -0,0 +1,513 @@
+"""
+app_indicator_stream.py
+
+This module provides incremental indicators that keep their state between bars, so a new bar costs O(1) work
+instead of a recompute of the whole history.
+
+Every indicator is seeded once from a price history, advanced with update() for each appended bar, and can be
+saved to and restored from the history cache next to the price series it was computed from. The values match
+those of app_indicator_engine, before rounding.
+
+Classes:
+    StreamingIndicator: The base class with seeding, duplicate bar detection and serialization.
+    StreamingSMA, StreamingEMA, StreamingRSI, StreamingADX, StreamingOBV, StreamingAD, StreamingBBands,
+    StreamingStoch, StreamingAroon: The incremental indicators.
+    StreamingSignalInputs: The columns that the signals of an indicator read, for SignalMonitor.
+
+Functions:
+    from_dict: Rebuild an indicator from its serialized state.
+    save_state: Store an indicator in the history cache.
+    load_state: Restore an indicator from the history cache.
+
+Example:
+    rsi = StreamingRSI(period=14).seed(weekly_prices)
+    save_state(rsi, "IBM", "weekly")
+    rsi = load_state("IBM", "weekly", StreamingRSI(period=14))
+    value = rsi.update({"close": 141.2}, time="2023-09-15")
+    inputs = StreamingSignalInputs("STOCH", fastkperiod=5).seed(daily_prices)
+    monitor = SignalMonitor(SIGNALS["STOCH"])
+    events = monitor.update(inputs.update(bar, time=time), time=time)
+"""
+
+import abc
+import json
+from collections import deque
+import pandas as pd
+from app_api_cache import history_cache
+from app_indicator_engine import COLUMNS
+from app_indicator_rolling import MonotonicWindow
+
+
+class StreamingIndicator(abc.ABC):
+    def __init__(self, **params):
+        """
+        Initialize the parameters and the bar counter of an incremental indicator.
+
+        Args:
+            **params: The parameters of the indicator, they are part of its serialized state.
+        """
+        self.params = params
+        self.count = 0
+        self.last_time = None
+        self.value = None
+
+    @abc.abstractmethod
+    def _update(self, bar):
+        """
+        Compute the value of a new bar from the state, and update the state.
+        """
+
+    def update(self, bar, time=None):
+        """
+        Advance the indicator by one bar.
+
+        Args:
+            bar (dict or pandas.Series): The bar with open, high, low, close and volume values.
+            time (str or pandas.Timestamp, optional): The time of the bar. Bars that are not newer than the
+            last one are ignored (default is None, always advance).
+
+        Returns:
+            float or tuple or None: The new value, None while the indicator is warming up.
+        """
+        if time is not None:
+            time = pd.Timestamp(time)
+            if self.last_time is not None and time <= pd.Timestamp(self.last_time):
+                return self.value
+            self.last_time = time.isoformat()
+        self.count += 1
+        self.value = self._update(bar)
+        return self.value
+
+    def seed(self, prices):
+        """
+        Feed a price history into the indicator.
+
+        Args:
+            prices (pandas.DataFrame): OHLCV columns indexed by timestamp, in any order.
+
+        Returns:
+            StreamingIndicator: The indicator itself.
+        """
+        prices = prices.sort_index()
+        for time, bar in zip(prices.index, prices.to_dict("records")):
+            self.update(bar, time=time)
+        return self
+
+    def to_dict(self):
+        """
+        Serialize the indicator.
+
+        Returns:
+            dict: The class name, the parameters and the state, all JSON compatible.
+        """
+        state = {}
+        for name, value in vars(self).items():
+            if name == "params":
+                continue
+            if isinstance(value, (StreamingIndicator, MonotonicWindow)):
+                value = value.to_dict()
+            elif isinstance(value, deque):
+                value = list(value)
+            state[name] = value
+        return {"name": type(self).__name__, "params": self.params, "state": state}
+
+    def _restore(self, state):
+        for name, value in state.items():
+            current = getattr(self, name, None)
+            if isinstance(current, StreamingIndicator):
+                value = from_dict(value)
+            elif isinstance(current, MonotonicWindow):
+                value = MonotonicWindow.from_dict(value)
+            elif isinstance(current, deque):
+                value = deque(value, maxlen=current.maxlen)
+            elif isinstance(value, list):
+                value = tuple(value)
+            setattr(self, name, value)
+        return self
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, period=20, series="close"):
+        """
+        Simple moving average.
+
+        Args:
+            period (int): Number of values in each average (default is 20).
+            series (str): The price column (default is "close").
+        """
+        super().__init__(period=period, series=series)
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def push(self, value):
+        """
+        Advance the average by a plain value instead of a bar.
+        """
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        if len(self.window) < self.window.maxlen:
+            return None
+        return self.total / self.window.maxlen
+
+    def _update(self, bar):
+        return self.push(float(bar[self.params["series"]]))
+
+
+class StreamingEMA(StreamingIndicator):
+    def __init__(self, period=20, series="close"):
+        """
+        Exponential moving average, seeded with the SMA of the first period values.
+
+        Args:
+            period (int): The period of the average (default is 20).
+            series (str): The price column (default is "close").
+        """
+        super().__init__(period=period, series=series)
+        self.seen = 0
+        self.total = 0.0
+        self.average = None
+
+    def push(self, value):
+        """
+        Advance the average by a plain value instead of a bar.
+        """
+        period = self.params["period"]
+        if self.average is None:
+            self.total += value
+            self.seen += 1
+            if self.seen == period:
+                self.average = self.total / period
+            return self.average
+        self.average += 2 / (period + 1) * (value - self.average)
+        return self.average
+
+    def _update(self, bar):
+        return self.push(float(bar[self.params["series"]]))
+
+
+def _moving_average(period, matype):
+    if int(matype) == 0:
+        return StreamingSMA(period)
+    if int(matype) == 1:
+        return StreamingEMA(period)
+    raise ValueError(f"Moving average type {matype} is not supported")
+
+
+class StreamingRSI(StreamingIndicator):
+    def __init__(self, period=14, series="close"):
+        """
+        Relative Strength Index with Wilder smoothing.
+
+        Args:
+            period (int): The period of the index (default is 14).
+            series (str): The price column (default is "close").
+        """
+        super().__init__(period=period, series=series)
+        self.previous = None
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def _update(self, bar):
+        period = self.params["period"]
+        close = float(bar[self.params["series"]])
+        previous, self.previous = self.previous, close
+        if previous is None:
+            return None
+        change = close - previous
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        changes = self.count - 1
+        if changes <= period:
+            self.gain += gain / period
+            self.loss += loss / period
+            if changes < period:
+                return None
+        else:
+            self.gain = (self.gain * (period - 1) + gain) / period
+            self.loss = (self.loss * (period - 1) + loss) / period
+        total = self.gain + self.loss
+        return 100 * self.gain / total if total else 0.0
+
+
+class StreamingADX(StreamingIndicator):
+    def __init__(self, period=14):
+        """
+        Average Directional Movement Index with Wilder smoothing.
+
+        Args:
+            period (int): The period of the index (default is 14).
+        """
+        super().__init__(period=period)
+        self.previous = None
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.true_range = 0.0
+        self.dx_total = 0.0
+        self.adx = None
+        self.plus_di = None
+        self.minus_di = None
+
+    def _update(self, bar):
+        period = self.params["period"]
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        previous, self.previous = self.previous, (high, low, close)
+        if previous is None:
+            return None
+        up, down = high - previous[0], previous[1] - low
+        plus_dm = up if up > 0 and up > down else 0.0
+        minus_dm = down if down > 0 and down > up else 0.0
+        true_range = max(high, previous[2]) - min(low, previous[2])
+        bar_number = self.count - 1
+        if bar_number < period:
+            self.plus_dm += plus_dm
+            self.minus_dm += minus_dm
+            self.true_range += true_range
+            return None
+        self.plus_dm += plus_dm - self.plus_dm / period
+        self.minus_dm += minus_dm - self.minus_dm / period
+        self.true_range += true_range - self.true_range / period
+        plus_di = self.plus_dm / self.true_range if self.true_range else 0.0
+        minus_di = self.minus_dm / self.true_range if self.true_range else 0.0
+        self.plus_di, self.minus_di = 100 * plus_di, 100 * minus_di
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di) if plus_di + minus_di else 0.0
+        if bar_number <= 2 * period - 1:
+            self.dx_total += dx
+            if bar_number < 2 * period - 1:
+                return None
+            self.adx = self.dx_total / period
+            return self.adx
+        self.adx = (self.adx * (period - 1) + dx) / period
+        return self.adx
+
+
+class StreamingOBV(StreamingIndicator):
+    def __init__(self):
+        """
+        On Balance Volume, starting at the first volume.
+        """
+        super().__init__()
+        self.previous = None
+        self.obv = 0.0
+
+    def _update(self, bar):
+        close, volume = float(bar["close"]), float(bar["volume"])
+        if self.previous is None:
+            self.obv = volume
+        elif close > self.previous:
+            self.obv += volume
+        elif close < self.previous:
+            self.obv -= volume
+        self.previous = close
+        return self.obv
+
+
+class StreamingAD(StreamingIndicator):
+    def __init__(self):
+        """
+        Chaikin Accumulation/Distribution line.
+        """
+        super().__init__()
+        self.ad = 0.0
+
+    def _update(self, bar):
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        if high != low:
+            self.ad += ((close - low) - (high - close)) / (high - low) * float(bar["volume"])
+        return self.ad
+
+
+class StreamingBBands(StreamingIndicator):
+    def __init__(self, period=20, nbdevup=2, nbdevdn=2, series="close"):
+        """
+        Bollinger Bands around a simple moving average.
+
+        Args:
+            period (int): The period of the bands (default is 20).
+            nbdevup (float): Standard deviations of the upper band (default is 2).
+            nbdevdn (float): Standard deviations of the lower band (default is 2).
+            series (str): The price column (default is "close").
+        """
+        super().__init__(period=period, nbdevup=nbdevup, nbdevdn=nbdevdn, series=series)
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.squares = 0.0
+
+    def _update(self, bar):
+        value = float(bar[self.params["series"]])
+        period = self.window.maxlen
+        if len(self.window) == period:
+            # Welford update that replaces the oldest value of the window with the new one.
+            old = self.window[0]
+            mean = self.mean + (value - old) / period
+            self.squares += (value - old) * (value - mean + old - self.mean)
+            self.mean = mean
+        else:
+            delta = value - self.mean
+            self.mean += delta / (len(self.window) + 1)
+            self.squares += delta * (value - self.mean)
+        self.window.append(value)
+        if len(self.window) < period:
+            return None
+        deviation = max(self.squares / period, 0.0) ** 0.5
+        return (self.mean + self.params["nbdevup"] * deviation, self.mean,
+                self.mean - self.params["nbdevdn"] * deviation)
+
+
+class StreamingStoch(StreamingIndicator):
+    def __init__(self, fastk=5, slowk=3, slowd=3, slowkma=0, slowdma=0):
+        """
+        Stochastic Oscillator. The highest high and lowest low of the %K period are kept in monotonic windows.
+
+        Args:
+            fastk (int): The period of the fast %K line (default is 5).
+            slowk (int): The smoothing period of the slow %K line (default is 3).
+            slowd (int): The smoothing period of the slow %D line (default is 3).
+            slowkma (int): The matype of the slow %K smoothing, 0 = SMA or 1 = EMA (default is 0).
+            slowdma (int): The matype of the slow %D smoothing, 0 = SMA or 1 = EMA (default is 0).
+        """
+        super().__init__(fastk=fastk, slowk=slowk, slowd=slowd, slowkma=slowkma, slowdma=slowdma)
+        self.highest = MonotonicWindow(fastk, kind="max")
+        self.lowest = MonotonicWindow(fastk, kind="min")
+        self.slow_k = _moving_average(slowk, slowkma)
+        self.slow_d = _moving_average(slowd, slowdma)
+
+    def _update(self, bar):
+        highest = self.highest.push(float(bar["high"]))[0]
+        lowest = self.lowest.push(float(bar["low"]))[0]
+        if not self.highest.full:
+            return None
+        fast_k = 100 * (float(bar["close"]) - lowest) / (highest - lowest) if highest != lowest else 0.0
+        slow_k = self.slow_k.push(fast_k)
+        if slow_k is None:
+            return None
+        slow_d = self.slow_d.push(slow_k)
+        if slow_d is None:
+            return None
+        return slow_k, slow_d
+
+
+class StreamingAroon(StreamingIndicator):
+    def __init__(self, period=14):
+        """
+        Aroon Down and Aroon Up, the bars since the lowest low and the highest high of the last period + 1 bars.
+
+        Args:
+            period (int): The period of the indicator (default is 14).
+        """
+        super().__init__(period=period)
+        self.highest = MonotonicWindow(period + 1, kind="max")
+        self.lowest = MonotonicWindow(period + 1, kind="min")
+
+    def _update(self, bar):
+        period = self.params["period"]
+        highest = self.highest.push(float(bar["high"]))[1]
+        lowest = self.lowest.push(float(bar["low"]))[1]
+        if not self.highest.full:
+            return None
+        position = self.highest.position
+        return 100 * (period - (position - lowest)) / period, 100 * (period - (position - highest)) / period
+
+
+class StreamingSignalInputs(StreamingIndicator):
+    def __init__(self, function="RSI", **params):
+        """
+        The indicator columns that the signals of app_indicator_signals.SIGNALS read, and the close.
+
+        The value of a bar is a dict like a row of compute_signals' input, with None while the indicator is
+        warming up, so it can be passed to SignalMonitor.update().
+
+        Args:
+            function (str): RSI, STOCH, BBANDS, ADX or AROON (default is "RSI").
+            **params: The API parameters of the indicator (time_period, series_type, fastkperiod, slowkperiod,
+            slowdperiod, slowkmatype, slowdmatype, nbdevup, nbdevdn, matype).
+
+        Raises:
+            ValueError: If the function has no streaming indicator or a parameter is not supported.
+        """
+        function = function.upper()
+        super().__init__(function=function, **params)
+        period = int(params.get("time_period", 14))
+        series = str(params.get("series_type", "close")).lower()
+        if function == "RSI":
+            self.indicator = StreamingRSI(period, series)
+        elif function == "STOCH":
+            self.indicator = StreamingStoch(int(params.get("fastkperiod", 5)), int(params.get("slowkperiod", 3)),
+                                            int(params.get("slowdperiod", 3)), int(params.get("slowkmatype", 0)),
+                                            int(params.get("slowdmatype", 0)))
+        elif function == "BBANDS":
+            if int(params.get("matype", 0)) != 0:
+                raise ValueError("The streaming Bollinger Bands only support matype 0")
+            self.indicator = StreamingBBands(period, float(params.get("nbdevup", 2)),
+                                             float(params.get("nbdevdn", 2)), series)
+        elif function == "ADX":
+            self.indicator = StreamingADX(period)
+        elif function == "AROON":
+            self.indicator = StreamingAroon(period)
+        else:
+            raise ValueError(f"{function} has no streaming indicator")
+
+    def _update(self, bar):
+        function = self.params["function"]
+        value = self.indicator.update(bar)
+        if function == "ADX":
+            names, value = ["PLUS_DI", "MINUS_DI"], (self.indicator.plus_di, self.indicator.minus_di)
+        else:
+            names = COLUMNS[function]
+        if not isinstance(value, tuple):
+            value = (value,) * len(names)
+        return {"close": float(bar["close"]), **dict(zip(names, value))}
+
+
+INDICATORS = {cls.__name__: cls for cls in (StreamingSMA, StreamingEMA, StreamingRSI, StreamingADX, StreamingOBV,
+                                            StreamingAD, StreamingBBands, StreamingStoch, StreamingAroon,
+                                            StreamingSignalInputs)}
+
+
+def from_dict(data):
+    """
+    Rebuild an indicator from its serialized state.
+
+    Args:
+        data (dict): The output of StreamingIndicator.to_dict().
+
+    Returns:
+        StreamingIndicator: The restored indicator.
+    """
+    return INDICATORS[data["name"]](**data["params"])._restore(data["state"])
+
+
+def _state_key(indicator):
+    return f"{type(indicator).__name__}:{json.dumps(indicator.params, sort_keys=True)}"
+
+
+def save_state(indicator, symbol, interval, cache=history_cache):
+    """
+    Store an indicator in the history cache, next to the price series it was computed from.
+
+    Args:
+        indicator (StreamingIndicator): The indicator to store.
+        symbol (str): The symbol of the price series.
+        interval (str): The interval of the price series (e.g., "weekly").
+        cache (HistoryCache): The cache to store in (default is the shared history cache).
+    """
+    cache.store_state(symbol, interval, _state_key(indicator), json.dumps(indicator.to_dict()))
+
+
+def load_state(symbol, interval, indicator, cache=history_cache):
+    """
+    Restore an indicator with the same class and parameters from the history cache.
+
+    Args:
+        symbol (str): The symbol of the price series.
+        interval (str): The interval of the price series (e.g., "weekly").
+        indicator (StreamingIndicator): A new indicator with the wanted parameters.
+        cache (HistoryCache): The cache to read from (default is the shared history cache).
+
+    Returns:
+        StreamingIndicator: The restored indicator, or the given one if nothing is stored.
+    """
+    stored = cache.lookup_state(symbol, interval, _state_key(indicator))
+    if stored is None:
+        return indicator
+    return from_dict(json.loads(stored))
@@ -0,0 +1,229 @@
+"""
+app_indicator_sweep.py
+
+This module evaluates an indicator over a whole grid of periods at once, so the effect of the "Data Points"
+parameter can be seen on one chart instead of submitting the form once per period.
+
+Moving sums come from one cumulative sum for every period, the Wilder and exponential smoothings run once over
+the bars for all periods side by side, and the mean deviation of CCI uses strided windows over a typical price and
+rolling means that are shared between the periods.
+
+Functions:
+    sweep_sma, sweep_ema, sweep_rsi: Period sweeps of a single price series.
+    sweep_cci, sweep_adx: Period sweeps of the high, low and close series.
+    sweep: Sweep an indicator over the OHLCV frame of a symbol into a time x period DataFrame.
+    sweep_figure: Draw a sweep as a heatmap.
+
+Example:
+    prices = LocalIndicators().prices("IBM", "weekly")
+    grid = sweep("RSI", prices, range(2, 201))
+    fig = sweep_figure(grid, "RSI")
+"""
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app_indicator_engine import SharedWindows, _cci, _divide, _positive
+
+SWEEP_FUNCTIONS = ("SMA", "EMA", "RSI", "CCI", "ADX")
+SWEEP_PERIODS = range(2, 201)
+
+
+def _periods(periods):
+    return np.array(sorted({_positive(period, "time_period") for period in periods}), dtype="int64")
+
+
+def _window_sums(values, periods):
+    """
+    The moving sums of values for every period, rows are the bars and columns the periods.
+    """
+    length = len(values)
+    sums = np.r_[0.0, np.cumsum(values)]
+    end = np.arange(1, length + 1)[:, None]
+    begin = end - periods[None, :]
+    grid = sums[end] - sums[np.clip(begin, 0, None)]
+    grid[begin < 0] = np.nan
+    return grid
+
+
+def _smooth_grid(values, alphas, starts, seeds):
+    """
+    Run y[i] = (1 - alpha) * y[i - 1] + alpha * values[i] from y[start] = seed for every column at once.
+
+    values is one series shared by the columns or one series per column. Columns whose start is past the end
+    stay NaN.
+    """
+    length = len(values)
+    out = np.full((length, len(alphas)), np.nan)
+    state = np.full(len(alphas), np.nan)
+    for index in range(max(int(starts.min()), 0), length):
+        state = np.where(starts == index, seeds, state + alphas * (values[index] - state))
+        out[index] = state
+    return out
+
+
+def sweep_sma(values, periods=SWEEP_PERIODS):
+    """
+    Simple moving averages for a grid of periods.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        periods (iterable): The periods (default is 2 - 200).
+
+    Returns:
+        numpy.ndarray: A (bars x periods) array, NaN during the warm-up of each period.
+    """
+    values = np.asarray(values, dtype="float64")
+    periods = _periods(periods)
+    if not len(values):
+        return np.full((0, len(periods)), np.nan)
+    # Sums of the distance to the first value keep the running sum small.
+    return values[0] + _window_sums(values - values[0], periods) / periods
+
+
+def sweep_ema(values, periods=SWEEP_PERIODS):
+    """
+    Exponential moving averages seeded with the SMA of the first period, for a grid of periods.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        periods (iterable): The periods (default is 2 - 200).
+
+    Returns:
+        numpy.ndarray: A (bars x periods) array, NaN during the warm-up of each period.
+    """
+    values = np.asarray(values, dtype="float64")
+    periods = _periods(periods)
+    averages = sweep_sma(values, periods)
+    seeds = np.full(len(periods), np.nan)
+    valid = np.flatnonzero(periods <= len(values))
+    seeds[valid] = averages[periods[valid] - 1, valid]
+    return _smooth_grid(values, 2 / (periods + 1), periods - 1, seeds)
+
+
+def sweep_rsi(values, periods=SWEEP_PERIODS):
+    """
+    Relative Strength Index with Wilder smoothing for a grid of periods.
+
+    Args:
+        values (numpy.ndarray): The series, oldest first.
+        periods (iterable): The periods (default is 2 - 200).
+
+    Returns:
+        numpy.ndarray: A (bars x periods) array from 0 to 100, NaN for the first period values of each period.
+    """
+    values = np.asarray(values, dtype="float64")
+    periods = _periods(periods)
+    out = np.full((len(values), len(periods)), np.nan)
+    if len(values) < 2:
+        return out
+    change = np.diff(values)
+    averages = []
+    for moves in (np.clip(change, 0, None), np.clip(-change, 0, None)):
+        sums = np.r_[0.0, np.cumsum(moves)]
+        seeds = sums[np.clip(periods, 0, len(moves))] / periods
+        averages.append(_smooth_grid(moves, 1 / periods, periods - 1, seeds))
+    out[1:] = 100 * _divide(averages[0], averages[0] + averages[1])
+    return out
+
+
+def sweep_cci(high, low, close, periods=SWEEP_PERIODS):
+    """
+    Commodity Channel Index for a grid of periods.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        periods (iterable): The periods (default is 2 - 200).
+
+    Returns:
+        numpy.ndarray: A (bars x periods) array, NaN for the first period - 1 values of each period.
+    """
+    windows = SharedWindows({"high": high, "low": low, "close": close})
+    return np.column_stack([_cci(windows, period) for period in _periods(periods)])
+
+
+def sweep_adx(high, low, close, periods=SWEEP_PERIODS):
+    """
+    Average Directional Movement Index with Wilder smoothing for a grid of periods.
+
+    Args:
+        high, low, close (numpy.ndarray): The price series, oldest first.
+        periods (iterable): The periods (default is 2 - 200).
+
+    Returns:
+        numpy.ndarray: A (bars x periods) array, NaN for the first 2 * period - 1 values of each period.
+    """
+    windows = SharedWindows({"high": high, "low": low, "close": close})
+    periods = _periods(periods)
+    length = len(windows)
+    columns = np.arange(len(periods))
+    smoothed = []
+    for values in windows.directional():
+        sums = np.r_[0.0, np.cumsum(values)]
+        seeds = (sums[np.clip(periods, 0, length)] - sums[min(1, length)]) / periods
+        smoothed.append(_smooth_grid(values, 1 / periods, periods - 1, seeds))
+    plus_di = _divide(smoothed[0], smoothed[2])
+    minus_di = _divide(smoothed[1], smoothed[2])
+    dx = 100 * _divide(np.abs(plus_di - minus_di), plus_di + minus_di)
+    sums = np.vstack([np.zeros(len(periods)), np.cumsum(np.nan_to_num(dx), axis=0)])
+    seeds = (sums[np.clip(2 * periods, 0, length), columns] - sums[np.clip(periods, 0, length), columns]) / periods
+    out = _smooth_grid(dx, 1 / periods, 2 * periods - 1, seeds)
+    out[:, 2 * periods > length] = np.nan
+    return out
+
+
+def sweep(function, prices, periods=SWEEP_PERIODS, series_type="close"):
+    """
+    Sweep an indicator over a grid of periods.
+
+    Args:
+        function (str): One of SWEEP_FUNCTIONS (e.g., "RSI").
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        periods (iterable): The periods (default is 2 - 200).
+        series_type (str): The price type of SMA, EMA and RSI, close, open, high or low (default is "close").
+
+    Returns:
+        pandas.DataFrame: One row per bar, oldest first, and one column per period. Warm-up values are NaN.
+
+    Raises:
+        ValueError: If the function or a period is invalid.
+    """
+    function = function.upper()
+    prices = prices.sort_index()
+    periods = _periods(periods)
+    if function in ("SMA", "EMA", "RSI"):
+        values = prices[str(series_type).lower()].to_numpy(dtype="float64")
+        grid = {"SMA": sweep_sma, "EMA": sweep_ema, "RSI": sweep_rsi}[function](values, periods)
+    elif function in ("CCI", "ADX"):
+        high, low, close = (prices[name].to_numpy(dtype="float64") for name in ("high", "low", "close"))
+        grid = {"CCI": sweep_cci, "ADX": sweep_adx}[function](high, low, close, periods)
+    else:
+        raise ValueError(f"{function} can not be swept")
+    return pd.DataFrame(grid, index=prices.index, columns=pd.Index(periods, name="period"))
+
+
+def sweep_figure(grid, title, figsize=(12, 6), fig=None):
+    """
+    Draw a sweep as a heatmap with the time on the x axis and the period on the y axis.
+
+    Args:
+        grid (pandas.DataFrame): The output of sweep().
+        title (str): The indicator name for the title and the color bar.
+        figsize (tuple): The size of the figure in inches (default is (12, 6)).
+        fig (matplotlib.figure.Figure, optional): An empty figure to draw in, e.g. ChartPanel.clear() (default is
+        None, a new pyplot figure).
+
+    Returns:
+        matplotlib.figure.Figure: The figure.
+    """
+    grid = grid.dropna(how="all")
+    if fig is None:
+        fig = plt.figure(figsize=figsize)
+    ax = fig.subplots()
+    mesh = ax.pcolormesh(grid.index, grid.columns, grid.to_numpy().T, shading="nearest",
+                         cmap="RdYlGn_r" if title.upper() == "RSI" else "viridis")
+    fig.colorbar(mesh, ax=ax, label=title)
+    ax.set_title(f'{title} Period Sweep')
+    ax.set_ylabel('Data Points')
+    ax.xaxis.set_major_locator(plt.MaxNLocator(8))
+    return fig
@@ -0,0 +1,184 @@
+"""
+app_indicator_timeframes.py
+
+This module derives coarser timeframes from the finest price series of a symbol, so one download of daily or
+intraday bars feeds the daily, weekly and monthly views and their indicators, and it aligns the indicators of
+several timeframes on the bars of the finest one for an overlay chart.
+
+Bars are grouped the way the API groups them: intraday bars into buckets of whole minutes stamped with the start
+of the bucket, days stamped with the date, weeks ending on Friday and calendar months stamped with their last
+trading day. Open is the first open of a group, high and low its extremes, close the last close and volume the
+sum. The last group is kept when it is still running, like the current week of the weekly series.
+
+A coarser value is aligned on a finer bar only once it is known at that bar: the bars inside a week show the
+indicator of the previous week, and the last bar of the week, which closes it, shows the new value.
+
+Functions:
+    timeframe_rank: The position of a timeframe from the finest to the coarsest.
+    resample_prices: Aggregate an OHLCV frame into a coarser timeframe.
+    align: Align the values of a coarser timeframe on the bars of a finer one, without lookahead.
+    timeframe_figure: Draw the price bars of the finest timeframe with the indicator of every timeframe.
+
+Example:
+    daily = LocalIndicators().prices("IBM", "daily")
+    weekly = resample_prices(daily, "weekly")
+    weekly_rsi = pd.Series(rsi(weekly["close"].to_numpy(), 14), index=weekly.index)
+    daily["weekly rsi"] = align(weekly_rsi, daily.index, "weekly")
+"""
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.dates import date2num
+
+TIMEFRAMES = ("1min", "5min", "15min", "30min", "60min", "daily", "weekly", "monthly")
+PRICE_SCALE = ("SMA", "EMA", "BBANDS", "DONCHIAN")
+DAY = 86_400_000_000_000
+# 1970-01-03 was a Saturday, the first day of a week ending on Friday.
+WEEK_OFFSET = 2
+
+
+def timeframe_rank(timeframe):
+    """
+    The position of a timeframe from the finest to the coarsest.
+
+    Args:
+        timeframe (str): One of TIMEFRAMES (e.g., "weekly").
+
+    Returns:
+        int: 0 for 1min up to 7 for monthly.
+
+    Raises:
+        ValueError: If the timeframe is not supported.
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"{timeframe} is not a supported interval")
+    return TIMEFRAMES.index(timeframe)
+
+
+def _keys(index, timeframe):
+    """
+    The group of every timestamp in a timeframe, as int64 values that increase with time.
+    """
+    index = pd.DatetimeIndex(index)
+    nanoseconds = index.asi8
+    if timeframe == "monthly":
+        return np.asarray(index.year * 12 + index.month - 1, dtype="int64")
+    if timeframe == "weekly":
+        return (nanoseconds // DAY - WEEK_OFFSET) // 7
+    if timeframe == "daily":
+        return nanoseconds // DAY
+    return nanoseconds // (int(timeframe[:-3]) * 60_000_000_000)
+
+
+def resample_prices(prices, timeframe):
+    """
+    Aggregate an OHLCV frame into a coarser timeframe.
+
+    Args:
+        prices (pandas.DataFrame): Columns open, high, low, close and volume, indexed by timestamp in any order.
+        timeframe (str): The target timeframe, one of TIMEFRAMES not finer than the prices.
+
+    Returns:
+        pandas.DataFrame: The open, high, low, close and volume of every group, indexed by timestamp, oldest first.
+
+    Raises:
+        ValueError: If the timeframe is not supported.
+    """
+    rank = timeframe_rank(timeframe)
+    prices = prices.sort_index()
+    if prices.empty:
+        return prices[["open", "high", "low", "close", "volume"]]
+    keys = _keys(prices.index, timeframe)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    if rank < TIMEFRAMES.index("daily"):
+        index = pd.DatetimeIndex(prices.index[starts]).floor(f"{timeframe[:-3]}min")
+    else:
+        index = pd.DatetimeIndex(prices.index[ends]).normalize()
+    columns = {"open": prices["open"].to_numpy()[starts],
+               "high": np.maximum.reduceat(prices["high"].to_numpy(), starts),
+               "low": np.minimum.reduceat(prices["low"].to_numpy(), starts),
+               "close": prices["close"].to_numpy()[ends],
+               "volume": np.add.reduceat(prices["volume"].to_numpy(), starts)}
+    return pd.DataFrame(columns, index=index.rename(prices.index.name))
+
+
+def align(values, index, timeframe):
+    """
+    Align the values of a coarser timeframe on the bars of a finer one, without lookahead.
+
+    Every bar gets the value of the last group that has closed at that bar: the previous group inside a group,
+    and the group's own value on its last bar.
+
+    Args:
+        values (pandas.Series or pandas.DataFrame): The coarser values indexed by their timestamps, oldest first.
+        index (pandas.DatetimeIndex): The timestamps of the finer bars, oldest first.
+        timeframe (str): The timeframe of the values.
+
+    Returns:
+        pandas.Series or pandas.DataFrame: The values on the index, NaN before the first group has closed.
+    """
+    keys = _keys(index, timeframe)
+    groups = _keys(values.index, timeframe)
+    closing = np.r_[keys[1:] != keys[:-1], True][:len(keys)]
+    # The last group up to the bar's own group on a closing bar, the last group before it otherwise.
+    positions = np.where(closing, np.searchsorted(groups, keys, side="right"), np.searchsorted(groups, keys)) - 1
+    data = values.to_numpy()
+    out = np.full((len(index),) + data.shape[1:], np.nan)
+    valid = positions >= 0
+    out[valid] = data[positions[valid]]
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(out, index=index, columns=values.columns)
+    return pd.Series(out, index=index, name=values.name)
+
+
+def timeframe_figure(prices, overlay, function, figsize=(10, 5), fig=None):
+    """
+    Draw the price bars of the finest timeframe with the aligned indicator of every timeframe.
+
+    Indicators on the price scale (SMA, EMA, BBANDS, DONCHIAN) are drawn over the bars, the others in a panel
+    below them. Without prices only the indicator is drawn, for windows that chart the prices separately. Coarser
+    timeframes are drawn as steps, since their values change once per group.
+
+    Args:
+        prices (pandas.DataFrame): The OHLCV bars of the finest timeframe indexed by timestamp, or None.
+        overlay (pandas.DataFrame): The indicator columns of every timeframe, indexed like the bars.
+        function (str): The indicator name, for the title and the panel layout.
+        figsize (tuple): The size of the figure in inches (default is (10, 5)).
+        fig (matplotlib.figure.Figure, optional): An empty figure to draw in, e.g. ChartPanel.clear() (default is
+        None, a new pyplot figure).
+
+    Returns:
+        matplotlib.figure.Figure: The figure.
+    """
+    function = function.upper()
+    overlay = overlay.sort_index()
+    if fig is None:
+        fig = plt.figure(figsize=figsize)
+    if prices is None or function in PRICE_SCALE:
+        ax = fig.subplots()
+        panel = ax
+    else:
+        ax, panel = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [2, 1]})
+    if prices is not None:
+        prices = prices.sort_index()
+        overlay = overlay.reindex(prices.index)
+        time = date2num(prices.index.to_pydatetime())
+        ax.vlines(time, prices['low'], prices['high'], color='black', linewidth=1)
+        ax.vlines(time, prices['open'], prices['close'],
+                  color=np.where(prices['open'] > prices['close'], 'red', 'green'), linewidth=3)
+        ax.set_ylabel('Price')
+    time = date2num(overlay.index.to_pydatetime())
+    for column in overlay.columns:
+        panel.step(time, overlay[column], where='post', label=column, linewidth=1.2)
+    for axes in {ax, panel}:
+        axes.grid(True)
+        axes.xaxis_date()
+    panel.legend(fontsize=8)
+    ax.set_title(f'{function} Timeframes')
+    if panel is not ax or prices is None:
+        panel.set_ylabel(function)
+    panel.set_xlabel('Time')
+    panel.xaxis.set_major_locator(plt.MaxNLocator(8))
+    return fig
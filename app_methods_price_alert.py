@@ -28,16 +28,29 @@ Methods:
         Checks if the current cryptocurrency price is lower than the specified threshold and schedules
          recurring checks if needed.
 
+    signal_alert(self, function, interval="daily", **params):
+        Starts monitoring the crossover and threshold signals of an indicator on the stock (e.g., RSI crossing
+         30 or 70) and sends an alert for every new crossing.
+
+    check_stock_signal(self, interval):
+        Advances the indicator and its signals by the bars added since the last check, sends the new crossings
+         oldest first, and schedules the next check even if this one failed.
+
+    stop(self):
+        Cancels the scheduled check, so no further alerts are sent.
+
     send_alert(self, current_price):
         Sends an email alert containing information about the price alert trigger to the specified recipient.
 
 Usage:
     Create an instance of the AlertSystem class and call the alert() method to start monitoring price alerts.
+    The checks run on daemon timers, so they end with the application or when stop() is called.
     Customize the SMTP_HOST, PORT, EMAIL, and PASSWORD attributes for your email configuration.
 """
 
 from datetime import datetime
 import logging
+import pandas as pd
 import smtplib
 import threading
 from email.message import EmailMessage
@@ -45,6 +58,9 @@ from emailo_config import SMTP_HOST, PORT, EMAIL, PASSWORD
 from string import Template
 from app_api_stock_methods import ApiStocksMethods
 from app_api_crypto_methods import ApiCryptoMethods
+from app_indicator_engine import LocalIndicators
+from app_indicator_signals import SIGNALS, SignalMonitor
+from app_indicator_stream import StreamingSignalInputs, save_state, load_state
 
 
 logger = logging.getLogger(__name__)
@@ -56,6 +72,8 @@ file_handler.setFormatter(formatter)
 
 logger.setLevel(logging.INFO)
 
+CHECK_SECONDS = 300
+
 
 class AlertSystem:
     def __init__(self, name, email, price, stock=None, crypto=None):
@@ -70,6 +88,31 @@ class AlertSystem:
         self.crypto = crypto
         self.stock_methods = ApiStocksMethods()
         self.crypto_methods = ApiCryptoMethods()
+        self.indicators = LocalIndicators()
+        self.timer = None
+        self.stopped = False
+        self.lock = threading.Lock()
+        self.signal_inputs = None
+        self.monitor = None
+        self.pending = []
+
+    def _schedule(self, function, *args):
+        with self.lock:
+            if self.stopped:
+                return
+            self.timer = threading.Timer(CHECK_SECONDS, function, args=args)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def stop(self):
+        """
+        Stop monitoring. The scheduled check is cancelled, a check that is running finishes without scheduling
+        another one.
+        """
+        with self.lock:
+            self.stopped = True
+            if self.timer is not None:
+                self.timer.cancel()
 
     def alert(self):
         try:
@@ -106,7 +149,7 @@ class AlertSystem:
         stock_kaina = kaina.iloc[0]['close']
         verte = float(price)
         if verte > float(stock_kaina):
-            threading.Timer(300, self.check_stock_price_higher, args=(email, price, name, stock, siandien)).start()
+            self._schedule(self.check_stock_price_higher, email, price, name, stock, siandien)
         elif verte <= float(stock_kaina):
             self.send_alert(stock_kaina)
 
@@ -115,7 +158,7 @@ class AlertSystem:
         stock_kaina = kaina.iloc[0]['close']
         verte = float(price)
         if verte < float(stock_kaina):
-            threading.Timer(300, self.check_stock_price_lower, args=(email, price, name, stock, siandien)).start()
+            self._schedule(self.check_stock_price_lower, email, price, name, stock, siandien)
         elif verte >= float(stock_kaina):
             self.send_alert(stock_kaina)
 
@@ -126,7 +169,7 @@ class AlertSystem:
         crypto_kaina = kaina.iloc[0]['close']
         verte = float(price)
         if verte > float(crypto_kaina):
-            threading.Timer(300, self.check_crypto_price_higher, args=(email, price, name, crypto)).start()
+            self._schedule(self.check_crypto_price_higher, email, price, name, crypto)
         elif verte <= float(crypto_kaina):
             self.send_alert(crypto_kaina)
 
@@ -137,10 +180,74 @@ class AlertSystem:
         crypto_kaina = kaina.iloc[0]['close']
         verte = float(price)
         if verte < float(crypto_kaina):
-            threading.Timer(300, self.check_crypto_price_lower, args=(email, price, name, crypto)).start()
+            self._schedule(self.check_crypto_price_lower, email, price, name, crypto)
         elif verte >= float(crypto_kaina):
             self.send_alert(crypto_kaina)
 
+    def signal_alert(self, function, interval="daily", **params):
+        """
+        Start monitoring the signals of an indicator on the stock, see app_indicator_signals.SIGNALS.
+
+        The indicator and its signals are seeded once from the price history, every check then only advances them
+        by the new bars. The state of the indicator is saved in the history cache after every check, so a later
+        alert on the same series resumes from it instead of seeding again. Crossings that are already in the
+        history are not sent, only the ones of later bars.
+
+        Args:
+            function (str): RSI, STOCH, BBANDS, ADX (+DI/-DI) or AROON.
+            interval (str): The interval of the bars (default is "daily").
+            **params: The API parameters of the indicator (e.g., time_period=14).
+
+        Returns:
+            str: "Invalid Entry" if the stock or the indicator is not valid, otherwise None.
+        """
+        try:
+            if self.stock is None:
+                raise ValueError
+            prices = self.indicators.prices(self.stock, interval)
+            self.monitor = SignalMonitor(SIGNALS[function.upper()])
+            self.signal_inputs = load_state(self.stock, interval, StreamingSignalInputs(function, **params))
+            last_time = self.signal_inputs.last_time
+            if last_time is not None and pd.Timestamp(last_time) in prices.index:
+                # The signs of the stored bar, so a crossing on the first new bar is found.
+                self.monitor.update(self.signal_inputs.value, time=last_time)
+            else:
+                # Nothing stored, or a state the series does not continue (e.g. of an earlier intraday month).
+                self.signal_inputs = StreamingSignalInputs(function, **params)
+            self._advance(prices)
+            save_state(self.signal_inputs, self.stock, interval)
+            self._schedule(self.check_stock_signal, interval)
+        except (IndexError, KeyError, AttributeError, ValueError):
+            logger.exception(f"Signal alert of {function} on {self.stock} not started")
+            return "Invalid Entry"
+
+    def _advance(self, prices):
+        """
+        Feed the bars newer than the last one seen into the indicator and the signal monitor.
+        """
+        if self.signal_inputs.last_time is not None:
+            prices = prices[prices.index > pd.Timestamp(self.signal_inputs.last_time)]
+        events = []
+        for time, bar in zip(prices.index, prices.to_dict("records")):
+            events += self.monitor.update(self.signal_inputs.update(bar, time=time), time=time)
+        return events
+
+    def check_stock_signal(self, interval):
+        try:
+            self.pending += self._advance(self.indicators.prices(self.stock, interval))
+            save_state(self.signal_inputs, self.stock, interval)
+            # Every crossing since the last check is sent, oldest first. A crossing stays pending until its
+            # alert is sent, so one that failed is sent again by the next check.
+            while self.pending:
+                event = self.pending[0]
+                self.send_alert(f"{event['signal']} crossed {event['direction']} on {event['time']:%Y-%m-%d}, "
+                                f"close {event['close']}")
+                self.pending.pop(0)
+        except Exception:
+            logger.exception(f"Signal check of {self.signal_inputs.params['function']} on {self.stock} failed")
+        finally:
+            self._schedule(self.check_stock_signal, interval)
+
     def send_alert(self, current_price):
         try:
             email = EmailMessage()
@@ -23,6 +23,7 @@ Note:
 
 from app_api_stock_methods import ApiStocksMethods, datetime
 from app_api_crypto_methods import ApiCryptoMethods
+from app_api_async import run_all, run_in_thread
 import logging
 import pandas as pd
 
@@ -121,6 +122,9 @@ class Methods(ApiStocksMethods, ApiCryptoMethods):
 
         Note:
             The function calculates and compares the gain/loss of two investments based on the provided parameters.
+            Both investments are fetched concurrently on the shared thread pool of app_api_async, and the call
+            blocks until they finish, so it must not run on that pool itself: a background task yields the two
+            calculate_investment_gain_loss calls instead.
 
         Example:
             To compare the gain/loss of $1000 investments in Apple (AAPL) and
@@ -133,18 +137,18 @@ class Methods(ApiStocksMethods, ApiCryptoMethods):
             ```
         """
         if stock1 is not None and stock2 is not None:
-            pirmas = self.calculate_investment_gain_loss(amount, start_date, stock=stock1)
-            antras = self.calculate_investment_gain_loss(amount, start_date, stock=stock2)
+            pirmas, antras = run_all(run_in_thread(self.calculate_investment_gain_loss, amount, start_date, stock=stock1),
+                                     run_in_thread(self.calculate_investment_gain_loss, amount, start_date, stock=stock2))
             logger.info("Gautas akciju ivestavimo palyginimas")
             return pirmas, antras
         elif stock1 is not None and crypto1 is not None:
-            pirmas = self.calculate_investment_gain_loss(amount, start_date, stock=stock1)
-            antras = self.calculate_investment_gain_loss(amount, start_date, crypto=crypto1)
+            pirmas, antras = run_all(run_in_thread(self.calculate_investment_gain_loss, amount, start_date, stock=stock1),
+                                     run_in_thread(self.calculate_investment_gain_loss, amount, start_date, crypto=crypto1))
             logger.info("Gautas akciju ir crypto ivestavimo palyginimas")
             return pirmas, antras
         elif crypto1 is not None and crypto2 is not None:
-            pirmas = self.calculate_investment_gain_loss(amount, start_date, crypto=crypto1)
-            antras = self.calculate_investment_gain_loss(amount, start_date, crypto=crypto2)
+            pirmas, antras = run_all(run_in_thread(self.calculate_investment_gain_loss, amount, start_date, crypto=crypto1),
+                                     run_in_thread(self.calculate_investment_gain_loss, amount, start_date, crypto=crypto2))
             logger.info("Gautas crypto ivestavimo palyginimas")
             return pirmas, antras
         else:
@@ -0,0 +1,246 @@
+"""
+app_tkinter_candles.py
+
+This module draws candlestick charts with three matplotlib collections built straight from the OHLCV arrays.
+
+mplfinance validates and copies the frame, builds its own collections and styles on every call, and a full
+daily or weekly history takes seconds to plot. Here the bodies of all bars are one PolyCollection, the high-low
+wicks one LineCollection and the optional volume bars another PolyCollection. Their vertices are computed with
+vectorized NumPy in one pass over the columns, and the bars are packed into compound paths, one per color for
+the bodies and the volume and a single NaN-separated path for the wicks, so matplotlib handles three or five
+paths instead of one per bar. A new series only replaces the vertices of the same collections.
+
+Bars are placed on the matplotlib date axis at their timestamps and the bodies are 70% of the typical distance
+between two bars wide. Bars that close above their open are green, the others red, like the "yahoo" style of
+mplfinance.
+
+Classes:
+    Candles: The body, wick and volume collections of a candlestick chart.
+
+Functions:
+    candle_geometry: The vertices of the bodies, wicks and volume bars of OHLCV arrays.
+    benchmark: Compare the time to draw a candlestick chart with mplfinance.
+
+Example:
+    fig = Figure()
+    ax, ax_volume = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+    candles = Candles(ax, volume_ax=ax_volume)
+    candles.set_data(prices)
+    ax.autoscale_view()
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.dates import date2num
+from matplotlib.path import Path
+
+BODY_WIDTH = 0.7
+RECTANGLE_CODES = np.array([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], dtype=Path.code_type)
+
+
+def candle_geometry(x, opens, highs, lows, closes, volumes=None, width=None):
+    """
+    The vertices of the bodies, wicks and volume bars of OHLCV arrays.
+
+    Args:
+        x (numpy.ndarray): The positions of the bars on the x axis, increasing.
+        opens, highs, lows, closes (numpy.ndarray): The prices of the bars.
+        volumes (numpy.ndarray, optional): The volumes of the bars (default is None, no volume bars).
+        width (float, optional): The width of a body in x units (default is None, 70% of the median distance
+        between two bars).
+
+    Returns:
+        tuple: The (n, 4, 2) body rectangles, the (n, 2, 2) wick segments, the (n, 4, 2) volume bars or None, and
+        the boolean array of the bars that close below their open.
+    """
+    if width is None:
+        width = BODY_WIDTH * (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+    left, right = x - width / 2, x + width / 2
+    bottom, top = np.minimum(opens, closes), np.maximum(opens, closes)
+    bodies = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                       np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+    wicks = np.stack([np.column_stack([x, lows]), np.column_stack([x, highs])], axis=1)
+    bars = None
+    if volumes is not None:
+        zero = np.zeros(len(x))
+        bars = np.stack([np.column_stack([left, zero]), np.column_stack([left, volumes]),
+                         np.column_stack([right, volumes]), np.column_stack([right, zero])], axis=1)
+    return bodies, wicks, bars, closes < opens
+
+
+def _compound(rectangles):
+    """
+    One path of (n, 4, 2) rectangles, as the vertices and the codes of a PolyCollection.
+    """
+    closed = np.concatenate([rectangles, rectangles[:, :1]], axis=1)
+    return closed.reshape(-1, 2), np.tile(RECTANGLE_CODES, len(rectangles))
+
+
+def _separated(segments):
+    """
+    One polyline of (n, 2, 2) segments, separated by NaN vertices that break the line.
+    """
+    gaps = np.full((len(segments), 1, 2), np.nan)
+    return np.concatenate([segments, gaps], axis=1).reshape(-1, 2)
+
+
+class Candles:
+    def __init__(self, ax, volume_ax=None, up='green', down='red', wick='black'):
+        """
+        Initialize a new instance of the Candles class.
+
+        The collections are added to the axes empty, set_data() fills them.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes of the candles.
+            volume_ax (matplotlib.axes.Axes, optional): The axes of the volume bars (default is None, no volume).
+            up (str): The color of the bars that close at or above their open (default is 'green').
+            down (str): The color of the bars that close below their open (default is 'red').
+            wick (str): The color of the high-low lines (default is 'black').
+
+        Usage:
+            candles = Candles(ax, volume_ax=ax_volume)
+            candles.set_data(prices)
+        """
+        self.ax = ax
+        self.volume_ax = volume_ax
+        self.up = up
+        self.down = down
+        self.wicks = LineCollection([], colors=wick, linewidths=1)
+        self.bodies = PolyCollection([], linewidths=0.5)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+        self.volume = None
+        if volume_ax is not None:
+            self.volume = PolyCollection([], linewidths=0, alpha=0.6)
+            # The volume bars stand on the bottom of their axes.
+            self.volume.sticky_edges.y.append(0)
+            volume_ax.add_collection(self.volume)
+        self.bounds = None
+        self.volume_bounds = None
+
+    def set_data(self, prices, width=None):
+        """
+        Replace the bars of the chart.
+
+        Args:
+            prices (pandas.DataFrame): Columns open, high, low, close and, for the volume bars, volume, indexed by
+            timestamp, oldest first.
+            width (float, optional): The width of a body in days (default is None, 70% of the typical distance
+            between two bars).
+
+        Returns:
+            Candles: The candles, with bounds and volume_bounds set to the (xmin, xmax, ymin, ymax) of the data.
+        """
+        x = date2num(pd.DatetimeIndex(prices.index).to_numpy())
+        opens, highs, lows, closes = (prices[column].to_numpy(dtype="float64")
+                                      for column in ("open", "high", "low", "close"))
+        volumes = prices["volume"].to_numpy(dtype="float64") if self.volume is not None else None
+        bodies, wicks, bars, falling = candle_geometry(x, opens, highs, lows, closes, volumes, width)
+        # One compound path per color, the rising bars first.
+        groups = [(mask, color) for mask, color in ((~falling, self.up), (falling, self.down)) if mask.any()]
+        colors = [color for mask, color in groups]
+        self.wicks.set_segments([_separated(wicks)] if len(x) else [])
+        self._set_paths(self.bodies, [_compound(bodies[mask]) for mask, color in groups], colors)
+        self.bounds = self.volume_bounds = None
+        if bars is not None:
+            self._set_paths(self.volume, [_compound(bars[mask]) for mask, color in groups], colors)
+        if len(x):
+            xmin, xmax = bodies[0, 0, 0], bodies[-1, 2, 0]
+            self.bounds = (xmin, xmax, np.nanmin(lows), np.nanmax(highs))
+            if bars is not None:
+                self.volume_bounds = (xmin, xmax, 0.0, np.nanmax(volumes))
+        # Like add_collection, the data limits of the axes grow to the bars, autoscale_view() fits them.
+        for ax, bounds in ((self.ax, self.bounds), (self.volume_ax, self.volume_bounds)):
+            if bounds is not None:
+                ax.update_datalim([(bounds[0], bounds[2]), (bounds[1], bounds[3])])
+        return self
+
+    @staticmethod
+    def _set_paths(collection, paths, colors):
+        collection.set_verts_and_codes([verts for verts, codes in paths], [codes for verts, codes in paths])
+        collection.set_facecolor(colors)
+        collection.set_edgecolor(colors)
+
+    def remove(self):
+        """
+        Remove the collections from their axes.
+        """
+        for collection in (self.wicks, self.bodies, self.volume):
+            if collection is not None:
+                collection.remove()
+
+
+def _prices(bars, seed=0):
+    random = np.random.RandomState(seed)
+    close = 100 + np.cumsum(random.normal(0, 1, bars))
+    opens = close + random.normal(0, 0.5, bars)
+    return pd.DataFrame({"open": opens,
+                         "high": np.maximum(opens, close) + np.abs(random.normal(0, 0.5, bars)),
+                         "low": np.minimum(opens, close) - np.abs(random.normal(0, 0.5, bars)),
+                         "close": close,
+                         "volume": random.randint(1_000, 100_000, bars).astype("float64")},
+                        index=pd.date_range("1900-01-01", periods=bars, freq="D"))
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000), repeat=3, volume=True):
+    """
+    Compare the time to draw a candlestick chart with mplfinance, from the frame to the rendered image.
+
+    Both charts are drawn into a new Figure on the Agg canvas, with volume bars below the candles.
+
+    Args:
+        sizes (tuple): The numbers of bars (default is 1,000, 10,000 and 100,000).
+        repeat (int): The best of this many runs is reported (default is 3).
+        volume (bool): Draw the volume bars (default is True).
+
+    Returns:
+        dict: The seconds of the native and of the mplfinance chart per number of bars.
+    """
+    import mplfinance as mpf
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    def axes():
+        fig = Figure(figsize=(10, 5))
+        FigureCanvasAgg(fig)
+        if not volume:
+            return fig, fig.subplots(), None
+        ax, ax_volume = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+        return fig, ax, ax_volume
+
+    def native(prices):
+        fig, ax, ax_volume = axes()
+        Candles(ax, volume_ax=ax_volume).set_data(prices)
+        ax.xaxis_date()
+        for axis in (ax, ax_volume):
+            if axis is not None:
+                axis.autoscale_view()
+        fig.canvas.draw()
+
+    def mplfinance(prices):
+        fig, ax, ax_volume = axes()
+        mpf.plot(prices, type='candle', style='yahoo', ax=ax, volume=ax_volume if volume else False,
+                 warn_too_much_data=len(prices) + 1)
+        fig.canvas.draw()
+
+    results = {}
+    for bars in sizes:
+        prices = _prices(bars)
+        results[bars] = {}
+        for name, case in (("native", native), ("mplfinance", mplfinance)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                case(prices)
+                best = min(best, time.perf_counter() - start)
+            results[bars][name] = best
+    return results
+
+
+if __name__ == "__main__":
+    for bars, seconds in benchmark().items():
+        print(f"{bars:8d} bars  native {seconds['native']:7.3f} s  mplfinance {seconds['mplfinance']:7.3f} s  "
+              f"{seconds['mplfinance'] / seconds['native']:6.1f}x")
@@ -0,0 +1,367 @@
+"""
+app_tkinter_chart.py
+
+This module provides the chart area of the popup windows: one matplotlib Figure and one Tk canvas per frame,
+kept for the life of the window.
+
+A new chart on every submit used to create a pyplot figure and a FigureCanvasTkAgg, destroy the old canvas
+widget and never close the figure, so pyplot kept every figure alive and the memory grew with each submit. The
+panel instead creates its Figure outside pyplot, keeps its axes while the layout stays the same and keeps every
+line, candle and marker artist under a name. Drawing the same chart again only replaces the data of the
+artists (set_data, set_verts_and_codes), rescales the axes to the new data and asks the canvas for a redraw with
+draw_idle, so the redraw time and the memory of a window stay flat however often it is refreshed.
+
+The panel keeps the full data of every line, area and candle series and only hands matplotlib as many points
+as the axes have pixels: lines and areas are reduced with LTTB and candles merged into OHLC buckets. When the x
+range changes by zooming or panning, or the canvas is resized, the part of the series in view is reduced again,
+so the cost of a redraw follows the width of the window instead of the length of the series.
+
+Charts drawn by a figure function, like the timeframe overlay and the period sweep, draw into the same Figure
+after clear().
+
+Classes:
+    ChartPanel: A persistent Figure and canvas in a Tk frame, with named artists updated in place.
+
+Usage:
+    Create one panel per chart frame in the window's __init__, then draw the chart of every submit through it.
+    Artists that were not drawn since the last subplots() call are removed by draw().
+
+Example:
+    self.panel_rsi = ChartPanel(self.chart_frame_rsi, figsize=(10, 5))
+
+    ax = self.panel_rsi.subplots()
+    self.panel_rsi.line(ax, 'RSI', df['time'], df['RSI'], color='blue', label='RSI')
+    self.panel_rsi.hline(ax, '70', 70, color='grey', linestyle='--', linewidth=1)
+    ax.set_title('RSI Chart')
+    self.panel_rsi.draw()
+"""
+
+import tkinter as tk
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.dates import date2num
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from app_tkinter_candles import Candles
+from app_tkinter_downsample import CANDLE_PIXELS, LINE_PIXELS, lttb, ohlc_buckets, visible
+
+
+def _numbers(values):
+    """
+    Plot coordinates of values, dates as matplotlib date numbers, and whether they are dates.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "OM":
+        return date2num(pd.to_datetime(values).to_numpy()), True
+    return values.astype("float64"), False
+
+
+class ChartPanel:
+    def __init__(self, master, figsize=(10, 5)):
+        """
+        Initialize a new instance of the ChartPanel class.
+
+        The canvas is created and packed into the frame on the first draw, so the frame stays empty until a
+        chart is shown. A panel without a frame draws on an Agg canvas in memory for a ChartRenderer.
+
+        Args:
+            master (tkinter.Frame or None): The frame of the chart, None for a panel drawn in memory.
+            figsize (tuple): The size of the figure in inches (default is (10, 5)), the canvas fills the frame.
+
+        Usage:
+            panel = ChartPanel(chart_frame, figsize=(12, 6))
+        """
+        self.master = master
+        # A Figure created outside pyplot is not kept by pyplot and is freed with the panel.
+        self.figure = Figure(figsize=figsize)
+        self.canvas = None if master is not None else FigureCanvasAgg(self.figure)
+        self.layout = None
+        self.axes = []
+        self.artists = {}
+        self.bounds = {}
+        self.sources = {}
+        self.windows = {}
+        self.drawn = set()
+
+    def subplots(self, rows=1, height_ratios=None):
+        """
+        Start a new chart and return its axes.
+
+        The axes are kept while the layout is the same as for the previous chart, otherwise the figure is
+        cleared and new axes are created. The rows share the x axis.
+
+        Args:
+            rows (int): The number of stacked axes (default is 1).
+            height_ratios (list, optional): The relative heights of the rows (default is None, equal heights).
+
+        Returns:
+            matplotlib.axes.Axes or list: The axes for one row, a list of axes from top to bottom otherwise.
+        """
+        layout = (rows, tuple(height_ratios or ()))
+        if layout != self.layout:
+            self.clear()
+            axes = self.figure.subplots(rows, 1, sharex=True, squeeze=False,
+                                        gridspec_kw={"height_ratios": height_ratios} if height_ratios else None)
+            self.axes = list(axes[:, 0])
+            self.layout = layout
+            for ax in self.axes:
+                ax.callbacks.connect("xlim_changed", self._on_xlim)
+        self.drawn = set()
+        return self.axes[0] if rows == 1 else list(self.axes)
+
+    def clear(self):
+        """
+        Clear the figure and forget the artists, for charts drawn by a figure function.
+
+        Returns:
+            matplotlib.figure.Figure: The empty figure.
+        """
+        self.figure.clear()
+        self.layout = None
+        self.axes = []
+        self.artists.clear()
+        self.bounds.clear()
+        self.sources.clear()
+        self.windows.clear()
+        self.drawn = set()
+        return self.figure
+
+    def _key(self, ax, name):
+        # Artists are kept by the row of their axes, the axes of a figure function by identity.
+        return self.axes.index(ax) if ax in self.axes else id(ax), name
+
+    def _artist(self, ax, name):
+        entry = self.artists.get(self._key(ax, name))
+        return None if entry is None else entry[1]
+
+    def _track(self, ax, name, artist, x, y, bounds=None):
+        key = self._key(ax, name)
+        self.artists[key] = (ax, artist)
+        self.drawn.add(key)
+        if bounds is None and y is not None:
+            x = x[np.isfinite(x)]
+            y = np.asarray(y, dtype="float64")
+            y = y[np.isfinite(y)]
+            if len(y):
+                bounds = (x.min() if len(x) else np.nan, x.max() if len(x) else np.nan, y.min(), y.max())
+        self.bounds[key] = bounds
+        return artist
+
+    def _source(self, ax, name, kind, x, data, style=None):
+        # The full series of an artist, reduced again for every new x range.
+        key = self._key(ax, name)
+        self.sources[key] = (kind, ax, x, data, style)
+        self.windows.pop(key, None)
+        return key
+
+    def _window(self, key, xlim=None):
+        """
+        The index range and the number of points of a series for an x range, None if they did not change.
+        """
+        kind, ax, x, data, style = self.sources[key]
+        start, stop = (0, len(x)) if xlim is None else visible(x, *xlim)
+        pixels = int(ax.bbox.width) // (CANDLE_PIXELS if kind == "candles" else LINE_PIXELS)
+        window = (start, stop, max(pixels, 6))
+        if self.windows.get(key) == window:
+            return None
+        self.windows[key] = window
+        return window
+
+    def _show(self, key, artist, window):
+        """
+        Give an artist the reduced points of its series inside a window, and return the artist.
+        """
+        kind, ax, x, data, style = self.sources[key]
+        start, stop, points = window
+        x = x[start:stop]
+        if kind == "candles":
+            return artist.set_data(ohlc_buckets(data.iloc[start:stop], points), width=style)
+        if kind == "line":
+            keep = lttb(x, data[start:stop], points)
+            artist.set_data(x[keep], data[start:stop][keep])
+            return artist
+        # An area keeps the points of both curves and is built again, fill_between has no set_data.
+        y1, y2 = data[0][start:stop], data[1][start:stop]
+        keep = np.union1d(lttb(x, y1, points // 2), lttb(x, y2, points // 2))
+        if artist is not None:
+            artist.remove()
+        return ax.fill_between(x[keep], y1[keep], y2[keep], **style)
+
+    def _on_xlim(self, changed):
+        # Zooming or panning any row reduces the series of every row sharing its x axis.
+        for key, (ax, artist) in list(self.artists.items()):
+            if key in self.sources and ax.get_shared_x_axes().joined(ax, changed):
+                window = self._window(key, changed.get_xlim())
+                if window is not None:
+                    self.artists[key] = (ax, self._show(key, artist, window))
+
+    def _on_resize(self, event):
+        if self.axes:
+            self._on_xlim(self.axes[0])
+
+    def line(self, ax, name, x, y, **style):
+        """
+        Draw a line, or replace the data of the line drawn under the same name.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes of the line.
+            name (str): The name of the line in the panel.
+            x (array-like): The x values, numbers or dates.
+            y (array-like): The y values.
+            **style: Line2D properties (e.g., color='blue', label='RSI', linestyle='none', marker='^').
+
+        Returns:
+            matplotlib.lines.Line2D: The line.
+        """
+        x, dates = _numbers(x)
+        y = np.asarray(y, dtype="float64")
+        if len(x) > 1 and x[0] > x[-1]:
+            x, y = x[::-1], y[::-1]
+        artist = self._artist(ax, name)
+        if artist is None:
+            artist, = ax.plot([], [], **style)
+        else:
+            artist.set(**style)
+        key = self._source(ax, name, "line", x, y)
+        artist = self._show(key, artist, self._window(key))
+        if dates:
+            ax.xaxis_date()
+        return self._track(ax, name, artist, x, y)
+
+    def hline(self, ax, name, y, **style):
+        """
+        Draw a horizontal line across the axes, or move the line drawn under the same name.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes of the line.
+            name (str): The name of the line in the panel.
+            y (float): The level of the line.
+            **style: Line2D properties (e.g., color='grey', linestyle='--').
+
+        Returns:
+            matplotlib.lines.Line2D: The line.
+        """
+        artist = self._artist(ax, name)
+        if artist is None:
+            artist = ax.axhline(y, **style)
+        else:
+            artist.set_ydata([y, y])
+            artist.set(**style)
+        return self._track(ax, name, artist, np.array([]), np.array([y]))
+
+    def candles(self, ax, name, prices, up='green', down='red', wick='black', width=None, volume=None):
+        """
+        Draw OHLC candles, or replace the bars of the candles drawn under the same name.
+
+        The bars are drawn by a Candles renderer whose collections keep their place in the axes and only get new
+        vertices on every update.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes of the candles.
+            name (str): The name of the candles in the panel.
+            prices (pandas.DataFrame): Columns open, high, low, close and, for the volume bars, volume, indexed by
+            timestamp, oldest first.
+            up (str): The body color of the bars that close above their open (default is 'green').
+            down (str): The body color of the bars that close below their open (default is 'red').
+            wick (str): The color of the high-low lines (default is 'black').
+            width (float, optional): The width of the bodies in days (default is None, 70% of the typical
+            distance between two bars).
+            volume (matplotlib.axes.Axes, optional): The axes of the volume bars (default is None, no volume).
+
+        Returns:
+            Candles: The candles.
+        """
+        artist = self._artist(ax, name)
+        if artist is not None and artist.volume_ax is not volume:
+            artist.remove()
+            artist = None
+        if artist is None:
+            artist = Candles(ax, volume_ax=volume, up=up, down=down, wick=wick)
+        artist.up, artist.down = up, down
+        artist.wicks.set_color(wick)
+        key = self._source(ax, name, "candles", date2num(pd.DatetimeIndex(prices.index).to_numpy()), prices, width)
+        # The buckets keep the highest high and the lowest low, their limits are those of the full series.
+        artist = self._show(key, artist, self._window(key))
+        ax.xaxis_date()
+        if volume is not None:
+            # The volume axes only contribute their limits, the artist is kept with the candles.
+            key = self._key(volume, name)
+            self.drawn.add(key)
+            self.bounds[key] = artist.volume_bounds
+        return self._track(ax, name, artist, None, None, bounds=artist.bounds)
+
+    def fill(self, ax, name, x, y1, y2=0, **style):
+        """
+        Fill the area between two curves, replacing the area drawn under the same name.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes of the area.
+            name (str): The name of the area in the panel.
+            x (array-like): The x values, numbers or dates.
+            y1 (array-like): The first curve.
+            y2 (array-like or float): The second curve (default is 0).
+            **style: fill_between properties (e.g., color='blue', alpha=0.5, label='Area').
+
+        Returns:
+            matplotlib.collections.PolyCollection: The area.
+        """
+        x, dates = _numbers(x)
+        y1 = np.asarray(y1, dtype="float64")
+        y2 = np.broadcast_to(np.asarray(y2, dtype="float64"), y1.shape)
+        if len(x) > 1 and x[0] > x[-1]:
+            x, y1, y2 = x[::-1], y1[::-1], y2[::-1]
+        key = self._source(ax, name, "fill", x, (y1, y2), style)
+        artist = self._show(key, self._artist(ax, name), self._window(key))
+        if dates:
+            ax.xaxis_date()
+        return self._track(ax, name, artist, x, np.concatenate([y1, y2]))
+
+    def _prune(self):
+        # Artists of the previous chart that were not drawn again are removed.
+        for key in [key for key in self.artists if key not in self.drawn]:
+            ax, artist = self.artists.pop(key)
+            artist.remove()
+            self.sources.pop(key, None)
+            self.windows.pop(key, None)
+        for key in [key for key in self.bounds if key not in self.drawn]:
+            self.bounds.pop(key)
+
+    def _rescale(self):
+        for index, ax in enumerate(self.axes):
+            bounds = [self.bounds[key] for key in self.drawn if key[0] == index and self.bounds.get(key)]
+            if not bounds:
+                continue
+            bounds = np.array(bounds)
+            if np.isnan(bounds[:, 0]).all():
+                continue
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim([(np.nanmin(bounds[:, 0]), bounds[:, 2].min()),
+                               (np.nanmax(bounds[:, 1]), bounds[:, 3].max())])
+            ax.autoscale(enable=True)
+
+    def draw(self, legend=False):
+        """
+        Finish the chart: remove the artists that were not drawn again, rescale the axes to the data and redraw.
+
+        A panel drawn in memory stops before the redraw, its ChartRenderer rasterizes the figure.
+
+        Args:
+            legend (bool): Draw a legend on every axes with labeled artists (default is False).
+        """
+        self._prune()
+        self._rescale()
+        if legend:
+            for ax in self.axes:
+                handles, labels = ax.get_legend_handles_labels()
+                if handles:
+                    ax.legend()
+        if self.master is None:
+            return
+        if self.canvas is None:
+            self.canvas = FigureCanvasTkAgg(self.figure, master=self.master)
+            self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self.canvas.mpl_connect("resize_event", self._on_resize)
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
@@ -22,15 +22,16 @@ Note:
 """
 
 import tkinter as tk
-import mplfinance as mpf
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import re
 from app_mixed_methods import Methods, pd
 from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
 from app_tkinter_crypto_checks import CryptoChecks
+from app_tkinter_chart import ChartPanel
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class CryptoWeeklyPopupWindow(tk.Toplevel):
@@ -49,6 +50,7 @@ class CryptoWeeklyPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
         self.checks = CryptoChecks()
 
         # BACKGROUND
@@ -81,6 +83,7 @@ class CryptoWeeklyPopupWindow(tk.Toplevel):
         # CHART FRAME
         self.chart_frame = tk.Frame(self)
         self.chart_frame.place(x=730, y=90, width=850, height=770)
+        self.panel = ChartPanel(self.chart_frame, figsize=(10, 5))
 
         # CHECKBUTTON
         self.show_chart_var = tk.BooleanVar()
@@ -162,7 +165,6 @@ class CryptoWeeklyPopupWindow(tk.Toplevel):
         if currency.upper() == 'CURRENCY (USD, EUR, GBP, ETC...)':
             currency = "USD"
         month_pattern = r'^\d{4}-\d{2}$'
-        year_pattern = r'^\d{4}$'
         if self.show_chart_var.get():
             df['open'] = df[f'open ({currency})']
             df['high'] = df[f'high ({currency})']
@@ -172,21 +174,18 @@ class CryptoWeeklyPopupWindow(tk.Toplevel):
                      f'close ({currency})'], axis=1, inplace=True)
             df.index = pd.to_datetime(df.index)
             df_sorted = df.sort_index()
-            fig, ax = plt.subplots(figsize=(10, 5))
+            ax, ax_volume = self.panel.subplots(2, height_ratios=[3, 1])
+            self.panel.candles(ax, 'Crypto', df_sorted, volume=ax_volume)
             if re.match(month_pattern, self.entry_var2.get()):
-                mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m-%d",
-                         ax=ax)
-            elif re.match(year_pattern, self.entry_var2.get()):
-                mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m",
-                         ax=ax)
+                ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
+            else:
+                ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m"))
+            ax_volume.tick_params(axis='x', labelrotation=45)
             ax.grid(True)
-            chart_frame = self.children["!frame2"]
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            ax_volume.grid(True)
+            self.panel.draw()
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -208,19 +207,19 @@ class CryptoWeeklyPopupWindow(tk.Toplevel):
             crypto = crypto.upper()
 
             if is_valid_date is None and is_valid_currency is None:
-                df = self.method.weekly_crypto_report(crypto=crypto)
+                df = yield run_in_thread(self.method.weekly_crypto_report, crypto=crypto)
                 self.tree_view(df)
                 self.display_chart(df, currency=currency)
             elif is_valid_currency is None and is_valid_date is True:
-                df = self.method.weekly_crypto_report(crypto=crypto, date=date)
+                df = yield run_in_thread(self.method.weekly_crypto_report, crypto=crypto, date=date)
                 self.tree_view(df)
                 self.display_chart(df, currency.upper())
             elif is_valid_currency is True and is_valid_date is None:
-                df = self.method.weekly_crypto_report(crypto=crypto, currency=currency)
+                df = yield run_in_thread(self.method.weekly_crypto_report, crypto=crypto, currency=currency)
                 self.tree_view(df)
                 self.display_chart(df, currency.upper())
             elif is_valid_currency is True and is_valid_date is True:
-                df = self.method.weekly_crypto_report(crypto=crypto, currency=currency, date=date)
+                df = yield run_in_thread(self.method.weekly_crypto_report, crypto=crypto, currency=currency, date=date)
                 self.tree_view(df)
                 self.display_chart(df, currency.upper())
             elif is_valid_currency is False or is_valid_date is False:
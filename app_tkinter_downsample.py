@@ -0,0 +1,120 @@
+"""
+app_tkinter_downsample.py
+
+This module reduces a chart series to about as many points as the axes have pixels, so the cost of drawing a
+chart follows the width of the window instead of the length of the series.
+
+Twenty years of daily candles or a month of 1-minute bars are tens of thousands of points in a frame about a
+thousand pixels wide, where most of them land on the same pixel column. Lines are reduced with
+Largest-Triangle-Three-Buckets (LTTB): the series is cut into one bucket per output point and each bucket keeps
+the point that spans the largest triangle with the point kept before it and the average of the next bucket,
+which keeps the peaks and troughs that make the shape of the line. Candles are merged into buckets of
+consecutive bars with the first open, the highest high, the lowest low, the last close and the total volume, so
+every price that was reached is still on the chart.
+
+Functions:
+    lttb: The indices of the points of a line kept by Largest-Triangle-Three-Buckets.
+    ohlc_buckets: Merge consecutive OHLCV bars into a given number of buckets.
+    visible: The index range of the points of a sorted series inside an x range.
+
+Usage:
+    ChartPanel reduces every line, area and candle series to the pixel width of its axes and reduces the part
+    of the full series in view again whenever the x range of the axes changes by zooming or panning.
+
+Example:
+    keep = lttb(x, y, 1000)
+    ax.plot(x[keep], y[keep])
+    weekly = ohlc_buckets(prices, 300)
+"""
+
+import numpy as np
+import pandas as pd
+
+LINE_PIXELS = 1
+CANDLE_PIXELS = 3
+
+
+def lttb(x, y, threshold):
+    """
+    The indices of the points of a line kept by Largest-Triangle-Three-Buckets.
+
+    Points with a missing value do not take part in the selection. A line with no more finite points than the
+    threshold is kept whole, missing values included.
+
+    Args:
+        x (numpy.ndarray): The x values, increasing.
+        y (numpy.ndarray): The y values.
+        threshold (int): The number of points to keep, at least 3.
+
+    Returns:
+        numpy.ndarray: The increasing indices of the kept points, the first and the last point included.
+    """
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(finite) <= max(threshold, 3):
+        return np.arange(len(x))
+    xs, ys = x[finite], y[finite]
+    n = len(xs)
+    # Bucket i of the n - 2 inner points holds the points edges[i]:edges[i + 1].
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sum_x = np.concatenate([[0.0], np.cumsum(xs)])
+    sum_y = np.concatenate([[0.0], np.cumsum(ys)])
+    # The average point of the next bucket, the last point for the last bucket.
+    starts, stops = edges[1:], np.append(edges[2:], n)
+    avg_x = (sum_x[stops] - sum_x[starts]) / (stops - starts)
+    avg_y = (sum_y[stops] - sum_y[starts]) / (stops - starts)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((xs[a] - avg_x[i]) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (avg_y[i] - ys[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return finite[kept]
+
+
+def ohlc_buckets(prices, buckets):
+    """
+    Merge consecutive OHLCV bars into a given number of buckets.
+
+    Args:
+        prices (pandas.DataFrame): Columns open, high, low, close and optionally volume, indexed by timestamp,
+        oldest first.
+        buckets (int): The number of bars to return.
+
+    Returns:
+        pandas.DataFrame: One bar per bucket, at the timestamp of its first bar, with the first open, the highest
+        high, the lowest low, the last close and the total volume, or the prices themselves if they have no more
+        bars than buckets.
+    """
+    if len(prices) <= max(buckets, 1):
+        return prices
+    starts = np.unique(np.linspace(0, len(prices), buckets, endpoint=False).astype(np.int64))
+    lasts = np.append(starts[1:], len(prices)) - 1
+    columns = {"open": prices["open"].to_numpy(dtype="float64")[starts],
+               "high": np.maximum.reduceat(prices["high"].to_numpy(dtype="float64"), starts),
+               "low": np.minimum.reduceat(prices["low"].to_numpy(dtype="float64"), starts),
+               "close": prices["close"].to_numpy(dtype="float64")[lasts]}
+    if "volume" in prices:
+        columns["volume"] = np.add.reduceat(prices["volume"].to_numpy(dtype="float64"), starts)
+    return pd.DataFrame(columns, index=prices.index[starts])
+
+
+def visible(x, xmin, xmax):
+    """
+    The index range of the points of a sorted series inside an x range.
+
+    One point on each side of the range is included, so a line still reaches the edges of the axes.
+
+    Args:
+        x (numpy.ndarray): The x values, increasing.
+        xmin (float): The left end of the range.
+        xmax (float): The right end of the range.
+
+    Returns:
+        tuple: The start and the stop index of the points.
+    """
+    start = max(int(np.searchsorted(x, xmin, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, xmax, side="right")) + 1, len(x))
+    return start, stop
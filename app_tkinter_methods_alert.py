@@ -23,6 +23,8 @@ from tkmacosx import Button as MacButton
 from sqlalchemy.orm import sessionmaker
 from model import engine, User
 from app_methods_price_alert import AlertSystem
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 Session = sessionmaker(bind=engine)
 session = Session()
@@ -44,6 +46,7 @@ class AlertPopupWindow(tk.Toplevel):
         self.default_crypto = 'Crypto Abbreviation'
         self.default_stock = 'Stock Abbreviation'
         self.username = username
+        self.tasks = TaskRunner(self, label="label")
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/800x350background.png")
@@ -136,6 +139,7 @@ class AlertPopupWindow(tk.Toplevel):
         if self.entry_crypto_var.get() == self.default_crypto:
             self.entry_stock.config(state="normal")
 
+    @background_task
     def submited_data(self):
         try:
             email = session.query(User.email).filter_by(username=self.username).first()
@@ -149,10 +153,10 @@ class AlertPopupWindow(tk.Toplevel):
                 raise ValueError
             if crypto == self.default_crypto.upper() or crypto == "":
                 alert = AlertSystem(email=email[0], price=target, stock=stock, name=name[0])
-                alert.alert()
+                yield run_in_thread(alert.alert)
             if stock == self.default_stock.upper() or stock == "":
                 alert = AlertSystem(email=email[0], price=target, crypto=crypto, name=name[0])
-                alert.alert()
+                yield run_in_thread(alert.alert)
             self.label['fg'] = '#296108'
             self.label['text'] = "Alert is Turned ON"
         except (ValueError, IndexError, AttributeError):
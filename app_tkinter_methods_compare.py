@@ -21,6 +21,8 @@ import tkinter as tk
 from tkmacosx import Button as MacButton
 from datetime import datetime
 from app_mixed_methods import Methods
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class InvestmentsComaprePopupWindow(tk.Toplevel):
@@ -40,6 +42,7 @@ class InvestmentsComaprePopupWindow(tk.Toplevel):
         self.default_crypto2 = 'Crypto Abbreviation2'
         self.default_stock2 = 'Stock Abbreviation2'
         self.method = Methods()
+        self.tasks = TaskRunner(self, label="label_result")
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/600x600background.png")
@@ -205,6 +208,7 @@ class InvestmentsComaprePopupWindow(tk.Toplevel):
         if self.entry_crypto_var2.get() == self.default_crypto2:
             self.entry_stock1.config(state="normal")
 
+    @background_task
     def submited_data(self):
         try:
             amount = float(self.entry_sum_var.get().strip())
@@ -232,7 +236,8 @@ class InvestmentsComaprePopupWindow(tk.Toplevel):
                     return
             if (crypto1 == self.default_crypto1.upper() or crypto1 == " ") and \
                     (crypto2 == self.default_crypto2.upper() or crypto2 == " "):
-                res = self.method.investment_compare(amount=amount, start_date=date, stock1=stock1, stock2=stock2)
+                res = yield (run_in_thread(self.method.calculate_investment_gain_loss, amount, date, stock=stock1),
+                             run_in_thread(self.method.calculate_investment_gain_loss, amount, date, stock=stock2))
                 self.label_result['fg'] = '#0E82D3'
                 self.label_result['text'] = f"Investment {amount}$\n Date: {date}\n Shares: {stock1} & {stock2}:\n\n" \
                                             f"{stock1} shares count - {res[0]['akcijos']:.2f} units        " \
@@ -241,7 +246,8 @@ class InvestmentsComaprePopupWindow(tk.Toplevel):
                                             f"Current {stock2} value - {res[1]['dabartine']:.2f}$"
             elif (stock1 == self.default_stock1.upper() or stock1 == " ") and \
                     (stock2 == self.default_stock2.upper() or stock2 == " "):
-                res = self.method.investment_compare(amount=amount, start_date=date, crypto1=crypto1, crypto2=crypto2)
+                res = yield (run_in_thread(self.method.calculate_investment_gain_loss, amount, date, crypto=crypto1),
+                             run_in_thread(self.method.calculate_investment_gain_loss, amount, date, crypto=crypto2))
                 self.label_result['fg'] = '#0E82D3'
                 self.label_result['text'] = f"Investment {amount}$\n Date: {date}\n Coins: {crypto1} & {crypto2}:\n\n" \
                                             f"{crypto1} coins count - {res[0]['zetonai']:.2f} units        " \
@@ -250,7 +256,8 @@ class InvestmentsComaprePopupWindow(tk.Toplevel):
                                             f"Current {crypto2} value - {res[1]['dabartine']:.2f}$"
             elif (stock2 == self.default_stock2.upper() or stock2 == " ") and \
                     (crypto2 == self.default_crypto2.upper() or crypto2 == " "):
-                res = self.method.investment_compare(amount=amount, start_date=date, stock1=stock1, crypto1=crypto1)
+                res = yield (run_in_thread(self.method.calculate_investment_gain_loss, amount, date, stock=stock1),
+                             run_in_thread(self.method.calculate_investment_gain_loss, amount, date, crypto=crypto1))
                 self.label_result['fg'] = '#0E82D3'
                 self.label_result['text'] = f"Investment {amount}$\n Date: {date}\n " \
                                             f"Share's/Coin's: {stock1} & {crypto1}:\n\n" \
@@ -19,6 +19,8 @@ Note:
 import tkinter as tk
 from tkmacosx import Button as MacButton
 from app_mixed_methods import Methods
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class ExchangePopupWindow(tk.Toplevel):
@@ -35,6 +37,7 @@ class ExchangePopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.default_entry = 'Crypto/Currency'
         self.method = Methods()
+        self.tasks = TaskRunner(self, label="label")
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/800x350background.png")
@@ -108,6 +111,7 @@ class ExchangePopupWindow(tk.Toplevel):
         if not self.entry2_var.get():
             self.entry2_var.set('Crypto/Currency')
 
+    @background_task
     def submited_data(self):
         try:
             result = []
@@ -120,7 +124,7 @@ class ExchangePopupWindow(tk.Toplevel):
                 raise ValueError
             else:
                 if self.checkbox_state.get() == 0:
-                    info = self.method.exchange_rate(first, second)
+                    info = yield run_in_thread(self.method.exchange_rate, first, second)
                     for value in info.values():
                         for key, val in value.items():
                             bendras = key + ": " + val
@@ -131,7 +135,7 @@ class ExchangePopupWindow(tk.Toplevel):
                                          f'{result[5]}\n{result[6]}\n{result[7]}\n{result[8]}\n\n' \
                                          f'{amount} {first} = {(amount * rate):.2f} {second}'
                 elif self.checkbox_state.get() == 1:
-                    info = self.method.exchange_rate(second, first)
+                    info = yield run_in_thread(self.method.exchange_rate, second, first)
                     for value in info.values():
                         for key, val in value.items():
                             bendras = key + ": " + val
@@ -20,6 +20,8 @@ import tkinter as tk
 from tkmacosx import Button as MacButton
 from datetime import datetime
 from app_mixed_methods import Methods
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class InvestmentGLPopupWindow(tk.Toplevel):
@@ -37,6 +39,7 @@ class InvestmentGLPopupWindow(tk.Toplevel):
         self.default_crypto = 'Crypto Abbreviation'
         self.default_stock = 'Stock Abbreviation'
         self.method = Methods()
+        self.tasks = TaskRunner(self, label="label_result")
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/600x300background.png")
@@ -146,6 +149,7 @@ class InvestmentGLPopupWindow(tk.Toplevel):
         if self.entry_crypto_var.get() == self.default_crypto:
             self.entry_stock.config(state="normal")
 
+    @background_task
     def submited_data(self):
         try:
             amount = self.entry_sum_var.get()
@@ -170,8 +174,8 @@ class InvestmentGLPopupWindow(tk.Toplevel):
                     self.label_result['text'] = 'Selected day is Sunday'
                     return
             if crypto == self.default_crypto or crypto == " ":
-                skaiciavimas = self.method.calculate_investment_gain_loss(amount=float(amount),
-                                                                          start_date=date, stock=stock)
+                skaiciavimas = yield run_in_thread(self.method.calculate_investment_gain_loss, amount=float(amount),
+                                                   start_date=date, stock=stock)
                 if skaiciavimas['pel_nuo'] > 0:
                     self.label_result['fg'] = '#0E82D3'
                     self.label_result['text'] = f"Investment of {amount}$ on {date}\n" \
@@ -191,8 +195,8 @@ class InvestmentGLPopupWindow(tk.Toplevel):
                                                 f"Current shares value - {skaiciavimas['dabartine']:.2f}$\n" \
                                                 f"Same value"
             elif stock == self.default_stock or stock == " ":
-                skaiciavimas = self.method.calculate_investment_gain_loss(amount=float(amount),
-                                                                          start_date=date, crypto=crypto)
+                skaiciavimas = yield run_in_thread(self.method.calculate_investment_gain_loss, amount=float(amount),
+                                                   start_date=date, crypto=crypto)
                 if skaiciavimas['pel_nuo'] > 0:
                     self.label_result['fg'] = '#0E82D3'
                     self.label_result['text'] = f"Investment of  {amount}$ on {date}\n" \
@@ -18,6 +18,9 @@
        prepared_data(self, company):
            Prepares the stock data for making predictions.
 
+       predict_prices(self, company):
+           Predicts the stock prices of the next 30 days, runs in the background.
+
        display_future_prices(self, latest_data, predictions):
            Displays the future stock price predictions on a chart.
 
@@ -25,7 +28,8 @@
            Displays a chart of predicted stock prices.
 
        refresh_results(self):
-           Refreshes the predictions based on user input and displays the results or error messages.
+           Refreshes the predictions based on user input and displays the results or error messages without
+           blocking the window while the model runs.
 
    Note:
        This class is designed to create a GUI popup window that allows users to input a stock symbol (equity)
@@ -37,9 +41,11 @@ from tkmacosx import Button as MacButton
 import numpy as np
 import datetime
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tensorflow.keras.models import load_model
 from app_api_stocks_requests import ApiDataStocks, pd
+from app_tkinter_chart import ChartPanel
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class PredictionsPopupWindow(tk.Toplevel):
@@ -58,6 +64,7 @@ class PredictionsPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.api_data_stocks = ApiDataStocks()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -67,6 +74,7 @@ class PredictionsPopupWindow(tk.Toplevel):
         # CHART FRAME
         self.chart_frame = tk.Frame(self)
         self.chart_frame.place(x=530, y=90, width=1050, height=770)
+        self.panel = ChartPanel(self.chart_frame, figsize=(10, 5))
 
         # LABEL
         label = tk.Label(self, font=self.font, justify='center', fg='black', bg='#F1EFEF')
@@ -123,6 +131,18 @@ class PredictionsPopupWindow(tk.Toplevel):
 
         return latest_data, sequence
 
+    def predict_prices(self, company):
+        latest_data, sequence = self.prepared_data(company)
+        loaded_model = load_model('LSTM_model.h5')
+        predictions = []
+        for _ in range(30):
+            next_prediction = loaded_model.predict(np.expand_dims(sequence, axis=0))
+            predictions.append(next_prediction[0][0])
+            sequence = np.roll(sequence, shift=-1)
+            sequence[-1] = next_prediction[0][0]
+
+        return latest_data, predictions
+
     def display_future_prices(self, latest_data, predictions):
         current_date = latest_data.index[0]
         date_range = [current_date + datetime.timedelta(days=i) for i in range(1, 31)]
@@ -130,46 +150,27 @@ class PredictionsPopupWindow(tk.Toplevel):
         self.display_chart(df_future_prices)
 
     def display_chart(self, df):
-        fig, ax = plt.subplots(figsize=(10, 5))
+        ax = self.panel.subplots()
 
         current_date = datetime.datetime.now()
         date_range = [current_date + datetime.timedelta(days=i) for i in range(len(df))]
-
-        ax.plot(date_range, df['Predicted Close'], color='orange', label='Predicted Close')
-
+        self.panel.line(ax, 'Predicted Close', date_range, df['Predicted Close'], color='orange',
+                        label='Predicted Close')
         ax.grid(True)
-        ax.legend()
         ax.set_title('Predicted Prices Chart')
         ax.set_xlabel('Date')
         ax.set_ylabel('Price ($)')
-
-        ymin, ymax = ax.get_ylim()
-        ax.set_ylim(ymin - 0, ymax + 0)
         max_visible_ticks = 8
         ax.xaxis.set_major_locator(plt.MaxNLocator(max_visible_ticks))
+        self.panel.draw(legend=True)
 
-        chart_frame = self.chart_frame
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Information and Submit to See Results'
             equity = self.entry_equity_var.get().strip().upper()
-            latest_data, sequence = self.prepared_data(equity)
-            loaded_model = load_model('LSTM_model.h5')
-            predictions = []
-            for _ in range(30):
-                next_prediction = loaded_model.predict(np.expand_dims(sequence, axis=0))
-                predictions.append(next_prediction[0][0])
-                sequence = np.roll(sequence, shift=-1)
-                sequence[-1] = next_prediction[0][0]
-
+            latest_data, predictions = yield run_in_thread(self.predict_prices, equity)
             self.display_future_prices(latest_data, predictions)
         except ValueError:
             self.label_message['fg'] = "red"
@@ -0,0 +1,166 @@
+"""
+app_tkinter_render.py
+
+This module draws charts on a worker thread and shows the finished image in the Tk window.
+
+A chart drawn on a FigureCanvasTkAgg is built and rasterized on the Tk thread, and the whole window freezes
+until Agg has painted every pixel. A ChartRenderer builds the chart on a ChartPanel without a frame, whose
+Figure lives on an Agg canvas in memory, and rasterizes it on its own worker thread. The Tk thread only polls
+the worker with after() and, when the RGBA buffer of the chart is ready, copies it into a PhotoImage shown by a
+Label in the chart frame.
+
+Every submit supersedes the chart submitted before it: a chart that has not started yet is skipped, a chart
+being built is dropped before its rasterization and a finished image of an older submit is never shown. The
+charts of one renderer run one after the other on its worker, so its panel is only ever touched by one thread.
+
+Classes:
+    ChartRenderer: A chart frame whose charts are built and rasterized on a worker thread.
+
+Usage:
+    Create one renderer per chart frame in the window's __init__. A chart is a function that draws on the
+    panel it receives, like a display method, and takes everything it needs as arguments: it runs on the
+    worker and must not touch any Tk widget or variable.
+
+Example:
+    self.render_bbands = ChartRenderer(self.chart_frame_bbands, figsize=(10, 5), on_error=self.on_chart_error)
+
+    def draw_chart_rsi(panel, df):
+        ax = panel.subplots()
+        panel.line(ax, 'RSI', df['time'], df['RSI'], color='blue', label='RSI')
+        panel.draw(legend=True)
+
+    self.render_bbands.submit(draw_chart_rsi, df)
+"""
+
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image, ImageTk
+from app_tkinter_chart import ChartPanel
+
+POLL_MS = 20
+
+
+class ChartRenderer:
+    def __init__(self, master, figsize=(10, 5), on_error=None):
+        """
+        Initialize a new instance of the ChartRenderer class.
+
+        The image label is packed into the frame when the first chart is shown, so the frame stays empty until
+        then. The worker thread is stopped when the frame is destroyed.
+
+        Args:
+            master (tkinter.Frame): The frame of the chart.
+            figsize (tuple): The size of the figure in inches before the frame has a size (default is (10, 5)),
+            the chart fills the frame.
+            on_error (callable, optional): Called on the Tk thread with the exception of a chart that failed
+            (default is None, the exception is raised in the Tk callback).
+
+        Usage:
+            renderer = ChartRenderer(chart_frame, figsize=(12, 6), on_error=self.on_chart_error)
+        """
+        self.master = master
+        self.panel = ChartPanel(None, figsize=figsize)
+        self.on_error = on_error
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart")
+        self.generation = 0
+        self.pending = None
+        self.label = None
+        self.photo = None
+        self.closed = False
+        master.bind("<Destroy>", self._on_destroy, add="+")
+
+    def submit(self, chart, *args):
+        """
+        Draw a chart on the worker thread and show it when it is ready, superseding the chart submitted before.
+
+        Args:
+            chart (callable): Draws the chart on the ChartPanel passed as its first argument.
+            *args: The other arguments of the chart.
+
+        Returns:
+            int: The number of the submit.
+        """
+        self.generation += 1
+        future = self.executor.submit(self._render, self.generation, self._size(), chart, args)
+        polling = self.pending is not None
+        self.pending = (self.generation, future)
+        if not polling:
+            self.master.after(POLL_MS, self._poll)
+        return self.generation
+
+    def cancel(self):
+        """
+        Drop the chart being drawn, the chart shown stays.
+        """
+        self.generation += 1
+
+    def close(self):
+        """
+        Drop the chart being drawn and stop the worker thread.
+        """
+        self.cancel()
+        self.closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _size(self):
+        # The frame has no size before it is mapped, the figure size is used until then.
+        width, height = self.master.winfo_width(), self.master.winfo_height()
+        if width <= 1 or height <= 1:
+            width, height = self.panel.figure.get_size_inches() * self.panel.figure.dpi
+        return int(width), int(height)
+
+    def _render(self, generation, size, chart, args):
+        """
+        Build and rasterize a chart on the worker thread.
+
+        Returns:
+            PIL.Image.Image or None: The RGBA image of the chart, None if a newer submit superseded it.
+        """
+        if generation != self.generation:
+            return None
+        figure = self.panel.figure
+        figure.set_size_inches(size[0] / figure.dpi, size[1] / figure.dpi)
+        chart(self.panel, *args)
+        if generation != self.generation:
+            return None
+        self.panel.canvas.draw()
+        if generation != self.generation:
+            return None
+        # The Agg buffer is drawn over by the next chart, the image keeps a copy.
+        return Image.fromarray(np.array(self.panel.canvas.buffer_rgba()))
+
+    def _poll(self):
+        if self.closed:
+            return
+        generation, future = self.pending
+        if not future.done():
+            self.master.after(POLL_MS, self._poll)
+            return
+        self.pending = None
+        error = future.exception()
+        if generation != self.generation:
+            return
+        if error is not None:
+            if self.on_error is None:
+                raise error
+            self.on_error(error)
+            return
+        image = future.result()
+        if image is not None:
+            self._blit(image)
+
+    def _blit(self, image):
+        # The PhotoImage is reused while the size of the chart stays the same.
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(image)
+            return
+        self.photo = ImageTk.PhotoImage(image, master=self.master)
+        if self.label is None:
+            self.label = tk.Label(self.master, bd=0, highlightthickness=0)
+            self.label.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.label.configure(image=self.photo)
+
+    def _on_destroy(self, event):
+        if event.widget is self.master:
+            self.close()
@@ -32,6 +32,8 @@ from tkinter import ttk
 from tkmacosx import Button as MacButton
 from datetime import datetime
 from app_mixed_methods import Methods
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class StockDayPopupWindow(tk.Toplevel):
@@ -50,6 +52,7 @@ class StockDayPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1400x450background.png")
@@ -110,6 +113,7 @@ class StockDayPopupWindow(tk.Toplevel):
         if not self.entry_var2.get():
             self.entry_var2.set("Date (YYYY-MM-DD)")
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -145,7 +149,7 @@ class StockDayPopupWindow(tk.Toplevel):
                 self.tree.delete(*self.tree.get_children())
                 return
             else:
-                df = self.method.daily_average(company=company, month=date)
+                df = yield run_in_thread(self.method.daily_average, company=company, month=date)
                 self.tree.delete(*self.tree.get_children())
                 self.tree["columns"] = df.columns.to_list()
                 for col_name in df.columns:
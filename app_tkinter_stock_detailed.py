@@ -2,7 +2,7 @@
 This Python file defines a pop-up window for displaying detailed daily stock data using the tkinter library.
  The key components of this code include:
 
-1. Importing necessary modules such as 'tkinter' for creating the GUI, 'mplfinance' for plotting stock charts,
+1. Importing necessary modules such as 'tkinter' for creating the GUI, 'ChartPanel' for plotting stock charts,
  'matplotlib' for chart rendering, and other modules for accessing stock data and methods.
 
 2. Defining a `StockDayDetailedPopupWindow` class that represents a pop-up window for detailed daily stock data:
@@ -31,15 +31,16 @@ This code provides a user-friendly interface for retrieving and visualizing deta
 """
 
 import tkinter as tk
-import mplfinance as mpf
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import re
 from datetime import datetime
 from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
 from app_mixed_methods import Methods, pd
+from app_tkinter_chart import ChartPanel
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class StockDayDetailedPopupWindow(tk.Toplevel):
@@ -58,6 +59,7 @@ class StockDayDetailedPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -87,6 +89,7 @@ class StockDayDetailedPopupWindow(tk.Toplevel):
         # CHART FRAME
         chart_frame = tk.Frame(self)
         chart_frame.place(x=690, y=90, width=900, height=770)
+        self.panel = ChartPanel(chart_frame, figsize=(10, 5))
 
         # CHECKBUTTON
         self.show_chart_var = tk.BooleanVar()
@@ -153,26 +156,21 @@ class StockDayDetailedPopupWindow(tk.Toplevel):
 
     def display_chart(self, df):
         date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-        month_pattern = r'^\d{4}-\d{2}$'
         df.index = pd.to_datetime(df.index)
         df_sorted = df.sort_index()
-        fig, ax = plt.subplots(figsize=(10, 5))
+        ax, ax_volume = self.panel.subplots(2, height_ratios=[3, 1])
+        self.panel.candles(ax, 'Stock', df_sorted, volume=ax_volume)
         if re.match(date_pattern, self.entry_var2.get()):
-            mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%H:%M",
-                     ax=ax)
-        elif re.match(month_pattern, self.entry_var2.get()):
-            mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m-%d",
-                     ax=ax)
-
+            ax_volume.xaxis.set_major_formatter(DateFormatter("%H:%M"))
+        else:
+            ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
+        ax_volume.tick_params(axis='x', labelrotation=45)
         ax.grid(True)
-        chart_frame = self.children["!frame2"]
-        for widget in chart_frame.winfo_children():
-            widget.destroy()
-        canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        ax_volume.grid(True)
+        self.panel.draw()
         return
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -215,13 +213,14 @@ class StockDayDetailedPopupWindow(tk.Toplevel):
                 self.tree.delete(*self.tree.get_children())
                 return
             elif (date == " " or date == default_date) and (interval == " " or interval == default_interval):
-                df = self.method.daily_detailed_report(company=company.upper())
+                df = yield run_in_thread(self.method.daily_detailed_report, company=company.upper())
             elif date == " " or date == default_date:
-                df = self.method.daily_detailed_report(company=company.upper(), interval=interval)
+                df = yield run_in_thread(self.method.daily_detailed_report, company=company.upper(), interval=interval)
             elif interval == " " or interval == default_interval:
-                df = self.method.daily_detailed_report(company=company.upper(), month=date)
+                df = yield run_in_thread(self.method.daily_detailed_report, company=company.upper(), month=date)
             else:
-                df = self.method.daily_detailed_report(company=company.upper(), interval=interval, month=date)
+                df = yield run_in_thread(self.method.daily_detailed_report, company=company.upper(), interval=interval,
+                                         month=date)
             if self.show_chart_var.get():
                 if date == " " or date == default_date:
                     self.label_message['fg'] = "red"
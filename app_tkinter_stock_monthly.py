@@ -2,7 +2,7 @@
 This Python file defines a pop-up window for displaying monthly stock data using the tkinter library.
  The key components of this code include:
 
-1. Importing necessary modules such as 'tkinter' for creating the GUI, 'mplfinance' for plotting stock charts,
+1. Importing necessary modules such as 'tkinter' for creating the GUI, 'ChartPanel' for plotting stock charts,
  'matplotlib' for chart rendering, and other modules for accessing stock data and methods.
 
 2. Defining a `StockMonthlyPopupWindow` class that represents a pop-up window for monthly stock data:
@@ -34,11 +34,12 @@ import tkinter as tk
 from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
-import mplfinance as mpf
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import re
 from app_mixed_methods import Methods, pd
+from app_tkinter_chart import ChartPanel
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class StockMonthlyPopupWindow(tk.Toplevel):
@@ -57,6 +58,7 @@ class StockMonthlyPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -86,6 +88,7 @@ class StockMonthlyPopupWindow(tk.Toplevel):
         # CHART FRAME
         chart_frame = tk.Frame(self)
         chart_frame.place(x=730, y=90, width=850, height=770)
+        self.panel = ChartPanel(chart_frame, figsize=(10, 5))
 
         # CHECKBUTTON
         self.show_chart_var = tk.BooleanVar()
@@ -138,17 +141,15 @@ class StockMonthlyPopupWindow(tk.Toplevel):
         if self.show_chart_var.get():
             df.index = pd.to_datetime(df.index)
             df_sorted = df.sort_index()
-            fig, ax = plt.subplots(figsize=(10, 5))
-            mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m",
-                     ax=ax)
+            ax, ax_volume = self.panel.subplots(2, height_ratios=[3, 1])
+            self.panel.candles(ax, 'Stock', df_sorted, volume=ax_volume)
+            ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m"))
+            ax_volume.tick_params(axis='x', labelrotation=45)
             ax.grid(True)
-            chart_frame = self.children["!frame2"]
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            ax_volume.grid(True)
+            self.panel.draw()
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -163,13 +164,13 @@ class StockMonthlyPopupWindow(tk.Toplevel):
                 self.tree.delete(*self.tree.get_children())
                 return
             elif date == default_date or date == " ":
-                df = self.method.monthly_report(company=company)
+                df = yield run_in_thread(self.method.monthly_report, company=company)
             else:
                 year_pattern = r'^\d{4}$'
                 year_month_pattern = r'^\d{4}-\d{2}$'
                 if not (re.match(year_pattern, date) or re.match(year_month_pattern, date)):
                     raise ValueError
-                df = self.method.monthly_report(company=company, date=date)
+                df = yield run_in_thread(self.method.monthly_report, company=company, date=date)
             self.display_chart(df)
             self.tree.delete(*self.tree.get_children())
             self.tree["columns"] = df.columns.to_list()
@@ -30,6 +30,8 @@ from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
 from app_mixed_methods import Methods
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class StockNowPopupWindow(tk.Toplevel):
@@ -48,6 +50,7 @@ class StockNowPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1000x400background.png")
@@ -90,12 +93,13 @@ class StockNowPopupWindow(tk.Toplevel):
         if not self.entry_var.get():
             self.entry_var.set("Enter Company Abbreviation")
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
             self.label_message['text'] = 'Enter Company Abbreviation and Submit to Search'
             search = self.entry_var.get().upper()
-            result = self.method.now_data_company(search)
+            result = yield run_in_thread(self.method.now_data_company, search)
             result = result.drop('symbol', axis=1)
             df = result.drop('latestDay', axis=1)
             self.tree.delete(*self.tree.get_children())
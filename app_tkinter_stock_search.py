@@ -30,6 +30,8 @@ from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
 from app_mixed_methods import Methods, pd
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class SearchPopupWindow(tk.Toplevel):
@@ -48,6 +50,7 @@ class SearchPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1450x550background.png")
@@ -95,6 +98,7 @@ class SearchPopupWindow(tk.Toplevel):
         if not self.entry_var.get():
             self.entry_var.set("Enter Company Abbreviation")
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -106,7 +110,8 @@ class SearchPopupWindow(tk.Toplevel):
                 self.label_message['text'] = 'Invalid Company Entry'
                 self.tree.delete(*self.tree.get_children())
                 return
-            df = pd.DataFrame(self.method.search(company.upper()))
+            matches = yield run_in_thread(self.method.search, company.upper())
+            df = pd.DataFrame(matches)
             if df.empty:
                 raise KeyError
             self.tree.delete(*self.tree.get_children())
@@ -1,8 +1,8 @@
 """
-This Python file defines a pop-up window for displaying weekly stock data using the tkinter library and mplfinance
+This Python file defines a pop-up window for displaying weekly stock data using the tkinter library and ChartPanel
  for chart visualization. The key components of this code include:
 
-1. Importing necessary modules such as 'tkinter' for creating the GUI, 'mplfinance' for charting, and 'app_mixed_methods
+1. Importing necessary modules such as 'tkinter' for creating the GUI, 'ChartPanel' for charting, and 'app_mixed_methods
 ' for accessing stock data and methods.
 
 2. Defining a `StockWeeklyPopupWindow` class that represents a pop-up window for displaying weekly stock data:
@@ -10,7 +10,7 @@ This Python file defines a pop-up window for displaying weekly stock data using
    - Creates a GUI with labels, entry fields for company abbreviation and date, a submit button, and a close button.
    - Allows users to input a company abbreviation and date to retrieve and display weekly stock data.
    - Validates user inputs, including date format, and handles cases where inputs are missing or invalid.
-   - Displays a candlestick chart of the weekly stock data using mplfinance if the "Show Chart" checkbox is selected.
+   - Displays a candlestick chart of the weekly stock data using ChartPanel if the "Show Chart" checkbox is selected.
    - Populates a treeview widget with the retrieved weekly stock data.
 
 3. The code utilizes external methods and classes (e.g., `Methods`) to retrieve weekly stock data for
@@ -28,15 +28,16 @@ This code provides a user-friendly interface for retrieving and displaying weekl
  along with an interactive chart visualization.
 """
 
-import mplfinance as mpf
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_tkagg as tkagg
+from matplotlib.dates import DateFormatter
 import re
 import tkinter as tk
 from tkinter import font as tkFont
 from tkinter import ttk
 from tkmacosx import Button as MacButton
 from app_mixed_methods import Methods, pd
+from app_tkinter_chart import ChartPanel
+from app_api_async import run_in_thread
+from app_tkinter_tasks import TaskRunner, background_task
 
 
 class StockWeeklyPopupWindow(tk.Toplevel):
@@ -55,6 +56,7 @@ class StockWeeklyPopupWindow(tk.Toplevel):
         self.font = tk.font.Font(family="Helvetica", size=16)
         self.font_label = tk.font.Font(family="Helvetica", size=18)
         self.method = Methods()
+        self.tasks = TaskRunner(self)
 
         # BACKGROUND
         self.background_image = tk.PhotoImage(file="background/1600x880background.png")
@@ -84,6 +86,7 @@ class StockWeeklyPopupWindow(tk.Toplevel):
         # CHART FRAME
         chart_frame = tk.Frame(self)
         chart_frame.place(x=730, y=90, width=850, height=770)
+        self.panel = ChartPanel(chart_frame, figsize=(10, 5))
 
         # CHECKBUTTON
         self.show_chart_var = tk.BooleanVar()
@@ -137,25 +140,21 @@ class StockWeeklyPopupWindow(tk.Toplevel):
         if self.show_chart_var.get():
             df.index = pd.to_datetime(df.index)
             df_sorted = df.sort_index()
-            fig, ax = plt.subplots(figsize=(10, 5))
+            ax, ax_volume = self.panel.subplots(2, height_ratios=[3, 1])
+            self.panel.candles(ax, 'Stock', df_sorted, volume=ax_volume)
             if re.match(month_pattern, self.entry_var2.get()):
-                mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m-%d",
-                         ax=ax)
+                ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
             elif self.entry_var2.get() == " " or self.entry_var2.get() == "Date (YYYY or YYYY-MM)" or \
                     self.entry_var2.get() == "":
-                mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y",
-                         ax=ax)
+                ax_volume.xaxis.set_major_formatter(DateFormatter("%Y"))
             else:
-                mpf.plot(df_sorted, type='candle', style='yahoo', xrotation=45, datetime_format="%Y-%m",
-                         ax=ax)
+                ax_volume.xaxis.set_major_formatter(DateFormatter("%Y-%m"))
+            ax_volume.tick_params(axis='x', labelrotation=45)
             ax.grid(True)
-            chart_frame = self.children["!frame2"]
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            canvas = tkagg.FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            ax_volume.grid(True)
+            self.panel.draw()
 
+    @background_task
     def refresh_results(self):
         try:
             self.label_message['fg'] = "#0E82D3"
@@ -170,13 +169,13 @@ class StockWeeklyPopupWindow(tk.Toplevel):
                 self.tree.delete(*self.tree.get_children())
                 return
             elif date == default_date or date == " ":
-                df = self.method.weekly_report(company=company)
+                df = yield run_in_thread(self.method.weekly_report, company=company)
             else:
                 year_pattern = r'^\d{4}$'
                 year_month_pattern = r'^\d{4}-\d{2}$'
                 if not (re.match(year_pattern, date) or re.match(year_month_pattern, date)):
                     raise ValueError
-                df = self.method.weekly_report(company=company, date=date)
+                df = yield run_in_thread(self.method.weekly_report, company=company, date=date)
             self.display_chart(df)
             self.tree.delete(*self.tree.get_children())
             rows = df.values.tolist()
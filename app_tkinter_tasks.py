@@ -0,0 +1,275 @@
+"""
+app_tkinter_tasks.py
+
+This module runs the network, pandas and model work of the popup windows in the background, so the Tk event
+loop keeps running while a window waits for its data.
+
+A handler like refresh_results becomes a generator decorated with @background_task. It runs on the Tk thread
+and yields the coroutines it waits for instead of calling them: a blocking call wrapped in run_in_thread(), a
+method of an AsyncApiData, or a tuple of coroutines that run concurrently. The window's TaskRunner runs them on
+a shared asyncio event loop in a background thread, whose calls share the thread pool and keep-alive
+connections of app_api_async with every other window, polls them with after() and resumes the handler on the
+Tk thread with their results. An exception is raised inside the handler at its yield, so its own except
+clauses report it in label_message as before; an exception the handler does not catch is reported there too.
+
+While a handler waits, label_message shows a loading message with the number of finished calls, the cursor of
+the window is a watch, and the label is restored when the results arrive. A new submit of the same handler
+cancels the one still running, and destroying the window cancels all of its tasks.
+
+Classes:
+    TaskRunner: The background tasks of one window.
+
+Functions:
+    background_task: Decorate a handler generator so calling it starts it on the window's TaskRunner.
+    event_loop: The asyncio event loop of the background tasks, started on first use.
+
+Usage:
+    Create `self.tasks = TaskRunner(self)` in the window's __init__, decorate the handlers and turn every
+    blocking call into a yield. Everything between two yields runs on the Tk thread and may use the widgets.
+
+Example:
+    @background_task
+    def refresh_results(self):
+        try:
+            company = self.entry_var.get().strip()
+            df = yield run_in_thread(self.method.weekly_report, company=company)
+            self.tree_view(df)
+        except KeyError:
+            self.label_message['text'] = 'No Data Found'
+"""
+
+import asyncio
+import inspect
+import functools
+import threading
+from app_api_async import gather
+
+POLL_MS = 30
+LOADING_COLOR = "#0E82D3"
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def event_loop():
+    """
+    The asyncio event loop of the background tasks, running in its own daemon thread from the first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared event loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="tk-tasks", daemon=True).start()
+    return _loop
+
+
+async def _wait(wait):
+    """
+    Run the coroutines of a wait concurrently, counting every finished one in its progress.
+    """
+    async def counted(coroutine):
+        result = await coroutine
+        wait["done"] += 1
+        return result
+
+    wait["task"] = asyncio.current_task()
+    try:
+        if wait["cancelled"]:
+            return None
+        return await gather(*(counted(coroutine) for coroutine in wait["coroutines"]))
+    finally:
+        # A wait cancelled before it ran its coroutines closes them, so they are not reported as never awaited.
+        for coroutine in wait["coroutines"]:
+            if inspect.iscoroutine(coroutine) and inspect.getcoroutinestate(coroutine) == inspect.CORO_CREATED:
+                coroutine.close()
+
+
+def _cancel(wait):
+    """
+    Cancel a wait on the event loop, before or while it runs.
+    """
+    wait["cancelled"] = True
+    if wait["task"] is not None:
+        wait["task"].cancel()
+
+
+def background_task(handler):
+    """
+    Decorate a handler generator, so calling the handler starts it on the TaskRunner of its window.
+
+    Args:
+        handler (callable): A method of the window that yields the coroutines it waits for.
+
+    Returns:
+        callable: The method that starts the handler and returns at once.
+    """
+    @functools.wraps(handler)
+    def start(self, *args, **kwargs):
+        return self.tasks.start(handler(self, *args, **kwargs), key=handler.__name__)
+    return start
+
+
+class TaskRunner:
+    def __init__(self, window, label="label_message"):
+        """
+        Initialize a new instance of the TaskRunner class.
+
+        Args:
+            window (tkinter.Toplevel): The window of the tasks, they are cancelled when it is destroyed.
+            label (str): The attribute of the window holding the label of the loading and error messages
+            (default is 'label_message').
+
+        Usage:
+            self.tasks = TaskRunner(self)
+            self.tasks = TaskRunner(self, label="label_result")
+        """
+        self.window = window
+        self.label = label
+        self.running = {}
+        self.saved = None
+        self.polling = False
+        self.closed = False
+        window.bind("<Destroy>", self._on_destroy, add="+")
+
+    def start(self, steps, key=None):
+        """
+        Start a handler generator, cancelling the running one under the same key.
+
+        Args:
+            steps (generator): The handler, which yields a coroutine or a tuple of coroutines whenever it waits.
+            key (str, optional): The name of the handler (default is None).
+        """
+        if self.closed or steps is None:
+            return
+        self.cancel(key)
+        self.running[key] = {"steps": steps, "future": None, "wait": None, "single": True}
+        self._advance(key)
+
+    def cancel(self, key=None):
+        """
+        Cancel the running task under a key.
+
+        Args:
+            key (str, optional): The name of the handler (default is None).
+        """
+        task = self.running.pop(key, None)
+        if task is None:
+            return
+        self._stop(task)
+        self._loading()
+
+    def cancel_all(self):
+        """
+        Cancel every running task of the window.
+        """
+        for key in list(self.running):
+            self.cancel(key)
+
+    def _advance(self, key, result=None, error=None):
+        """
+        Resume a handler on the Tk thread until it waits again or returns.
+        """
+        task = self.running[key]
+        try:
+            if error is not None:
+                waiting = task["steps"].throw(error)
+            else:
+                waiting = task["steps"].send(result)
+        except StopIteration:
+            self._finish(key)
+            return
+        except Exception as unhandled:
+            self._finish(key)
+            self._report(unhandled)
+            return
+        task["single"] = not isinstance(waiting, (tuple, list))
+        coroutines = [waiting] if task["single"] else list(waiting)
+        task["wait"] = {"coroutines": coroutines, "done": 0, "task": None, "cancelled": False}
+        task["future"] = asyncio.run_coroutine_threadsafe(_wait(task["wait"]), event_loop())
+        self._loading()
+        if not self.polling:
+            self.polling = True
+            self.window.after(POLL_MS, self._poll)
+
+    def _finish(self, key):
+        self.running.pop(key, None)
+        self._loading()
+
+    @staticmethod
+    def _stop(task):
+        """
+        Stop waiting for the calls of a task and close its handler.
+
+        The calls that are still queued on the thread pool are dropped, a blocking call that already runs
+        finishes in its thread and its result is discarded.
+        """
+        if task["future"] is not None:
+            event_loop().call_soon_threadsafe(_cancel, task["wait"])
+        task["steps"].close()
+
+    def _poll(self):
+        self.polling = False
+        if self.closed:
+            return
+        for key, task in list(self.running.items()):
+            # An earlier handler of this pass may have cancelled or restarted the task, or closed the window.
+            if self.closed or self.running.get(key) is not task:
+                continue
+            future = task["future"]
+            if future is None or not future.done():
+                continue
+            task["future"] = None
+            # The label is restored before the handler runs, so the messages it writes are kept.
+            self._loading(restore=True)
+            if future.exception() is not None:
+                self._advance(key, error=future.exception())
+            else:
+                results = future.result()
+                self._advance(key, result=results[0] if task["single"] else results)
+        self._loading()
+        if any(task["future"] is not None for task in self.running.values()) and not self.polling:
+            self.polling = True
+            self.window.after(POLL_MS, self._poll)
+
+    def _label(self):
+        return getattr(self.window, self.label, None)
+
+    def _loading(self, restore=False):
+        """
+        Show the loading state while a task waits, restore the label and the cursor otherwise.
+        """
+        label = self._label()
+        waiting = [task for task in self.running.values() if task["future"] is not None]
+        if waiting and not restore:
+            if self.saved is None:
+                self.saved = (label['text'], label['fg']) if label is not None else ()
+                self.window.config(cursor="watch")
+            if label is not None:
+                done = sum(task["wait"]["done"] for task in waiting)
+                total = sum(len(task["wait"]["coroutines"]) for task in waiting)
+                label['fg'] = LOADING_COLOR
+                label['text'] = f'Loading... {done}/{total}' if total > 1 else 'Loading...'
+            return
+        if self.saved is not None:
+            if label is not None:
+                label['text'], label['fg'] = self.saved
+            self.window.config(cursor="")
+            self.saved = None
+
+    def _report(self, error):
+        label = self._label()
+        if label is None:
+            raise error
+        message = str(error).splitlines()[0] if str(error) else type(error).__name__
+        label['fg'] = "red"
+        label['text'] = f'Request Failed\n{message[:80]}'
+
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self.closed = True
+            for task in self.running.values():
+                self._stop(task)
+            self.running.clear()